@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, status
 
+from ....core.responses import ORJSONResponse
 from ....schemas import bounty_schema, response_schema
-from ....services import bounty_service
+from ....services import bounty_service, bulk_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,12 +21,12 @@ async def get_all_bounties(gameId: str):
     Fetches a list of all available bounties in a game with basic metadata.
     """
     bounties = await bounty_service.get_all_bounties(gameId)
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message=f"All bounties from game {gameId} retrieved successfully",
         data=bounties,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.get('/{gameId}/{bountyId}', status_code=status.HTTP_200_OK)
 async def get_bounty(gameId: str, bountyId: str):
@@ -33,17 +34,19 @@ async def get_bounty(gameId: str, bountyId: str):
     Fetches a list of all available bounties in a game with basic metadata.
     """
     bounties = await bounty_service.get_bounty(gameId, bountyId)
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message=f"Bounty {bountyId} from game {gameId} retrieved successfully",
         data=bounties,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.post('/{gameId}/', status_code=status.HTTP_201_CREATED)
 async def create_bounty(gameId: str, request: bounty_schema.BountyModel):
     """
     Create a new bounty entry.
+
+    Answers 400 when the game already has a bounty with this name.
     """
     bounty_detail = await bounty_service.create_bounty(gameId, request)
     return response_schema.ResponseModel(
@@ -53,10 +56,30 @@ async def create_bounty(gameId: str, request: bounty_schema.BountyModel):
         timestamp=datetime.now().isoformat()
     )
 
+@router.post('/{gameId}/bulk', status_code=status.HTTP_200_OK, openapi_extra=bulk_service.openapi_body(bounty_schema.BulkBountyModel))
+async def bulk_upsert_bounties(gameId: str, request: Request):
+    """
+    Create or update many bounties of a game at once, matched on their name.
+
+    The body is a JSON array of bounties, or NDJSON (`Content-Type: application/x-ndjson`,
+    one bounty per line). Each item gets its own result, at the same index.
+    """
+    items = await bulk_service.read_items(request)
+    result = await bounty_service.bulk_upsert_bounties(gameId, items)
+    return response_schema.ResponseModel(
+        status="success",
+        message=f"{result.created} bounties created, {result.updated} updated, {result.failed} failed",
+        data=result,
+        timestamp=datetime.now().isoformat()
+    )
+
 @router.put('/{gameId}/{bountyId}/', status_code=status.HTTP_200_OK)
-async def update_bounty(gameId: str, bountyId: str, request: bounty_schema.BountyModel):
+async def update_bounty(gameId: str, bountyId: str, request: bounty_schema.UpdateBountyModel):
     """
     Update an existing bounty entry.
+    Only the fields sent in the body are changed.
+
+    Answers 400 when renaming it to the name of another bounty of the game.
     """
     updated_bounty = await bounty_service.update_bounty(gameId, bountyId, request)
     return response_schema.ResponseModel(
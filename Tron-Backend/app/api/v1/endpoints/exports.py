@@ -0,0 +1,72 @@
+import logging
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ....services import export_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def verify_export_key(x_api_key: Optional[str] = Header(None)):
+    """
+    Require the `X-API-Key` header to match EXPORT_API_KEY.
+
+    The exports dump users and orders whole, so without EXPORT_API_KEY they are refused.
+    """
+    export_key = os.getenv("EXPORT_API_KEY")
+    if not export_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Exports are disabled: EXPORT_API_KEY is not set."
+        )
+    if not secrets.compare_digest(x_api_key or "", export_key):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key."
+        )
+
+router = APIRouter(
+    prefix = '/exports',
+    tags=['exports'],
+    dependencies=[Depends(verify_export_key)]
+)
+
+def export(name: str) -> StreamingResponse:
+    collection, serialize = export_service.EXPORTS[name]
+    return StreamingResponse(
+        export_service.stream_ndjson(collection, serialize),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{name}.ndjson"'}
+    )
+
+@router.get('/games', status_code=status.HTTP_200_OK)
+async def export_games():
+    """
+    Streams every game as NDJSON, one game per line.
+    """
+    return export("games")
+
+@router.get('/users', status_code=status.HTTP_200_OK)
+async def export_users():
+    """
+    Streams every user as NDJSON, one user per line.
+    """
+    return export("users")
+
+@router.get('/orders', status_code=status.HTTP_200_OK)
+async def export_orders():
+    """
+    Streams every order as NDJSON, one order per line.
+    """
+    return export("orders")
+
+@router.get('/verified-purchases', status_code=status.HTTP_200_OK)
+async def export_verified_purchases():
+    """
+    Streams every verified purchase as NDJSON, one purchase per line.
+    """
+    return export("verified-purchases")
\ No newline at end of file
@@ -1,10 +1,12 @@
 import logging
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Request, status
 
+from ....core.responses import ORJSONResponse
 from ....schemas import game_schema, response_schema
-from ....services import game_service 
+from ....services import bounty_service, bulk_service, game_service 
 
 
 logging.basicConfig(level=logging.INFO)
@@ -16,17 +18,25 @@ router = APIRouter(
 )
 
 @router.get('/', status_code=status.HTTP_200_OK)
-async def get_all_games(): 
+async def get_all_games(
+    limit: int = Query(game_service.DEFAULT_PAGE_SIZE, ge=1, le=game_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+): 
     """
-    Fetches a list of all available games with basic metadata.
+    Fetches a page of available games with basic metadata.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page, and
+    `fields` (e.g. `title,price,images`) to only return the listed game fields.
     """
-    game_data = await game_service.get_all_games()
-    return response_schema.ResponseModel(
+    game_data, next_cursor = await game_service.get_all_games(limit, cursor, fields)
+    return ORJSONResponse(response_schema.PaginatedResponseModel(
         status="success",
         message="Game retrieved successfully",
         data=game_data,
+        next_cursor=next_cursor,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.get('/{gameId}', status_code=status.HTTP_200_OK)
 async def get_game(gameId: str): 
@@ -34,12 +44,25 @@ async def get_game(gameId: str):
     Retrieves detailed information about a specific game by its ID.
     """
     game_data = await game_service.get_game(gameId)
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message="Game retrieved successfully",
         data=game_data,
         timestamp=datetime.now().isoformat()
-    )
+    ))
+
+@router.get('/{gameId}/rewards', status_code=status.HTTP_200_OK)
+async def get_game_rewards(gameId: str):
+    """
+    Retrieves every bounty of a game with its NFT rewards nested, in one request.
+    """
+    rewards = await bounty_service.get_game_rewards(gameId)
+    return ORJSONResponse(response_schema.ResponseModel(
+        status="success",
+        message="Game rewards retrieved successfully",
+        data=rewards,
+        timestamp=datetime.now().isoformat()
+    ))
 
 @router.post('/', status_code=status.HTTP_201_CREATED)
 async def create_game(request: game_schema.GameModel):
@@ -54,10 +77,28 @@ async def create_game(request: game_schema.GameModel):
         timestamp=datetime.now().isoformat()
     )
 
+@router.post('/bulk', status_code=status.HTTP_200_OK, openapi_extra=bulk_service.openapi_body(game_schema.BulkGameModel))
+async def bulk_upsert_games(request: Request):
+    """
+    Creates or updates many games at once, matched on their `id`.
+
+    The body is a JSON array of games, or NDJSON (`Content-Type: application/x-ndjson`,
+    one game per line). Each item gets its own result, at the same index.
+    """
+    items = await bulk_service.read_items(request)
+    result = await game_service.bulk_upsert_games(items)
+    return response_schema.ResponseModel(
+        status="success",
+        message=f"{result.created} games created, {result.updated} updated, {result.failed} failed",
+        data=result,
+        timestamp=datetime.now().isoformat()
+    )
+
 @router.put('/{gameId}', status_code=status.HTTP_202_ACCEPTED)
-async def update_game(gameId: str, request: game_schema.GameModel):
+async def update_game(gameId: str, request: game_schema.UpdateGameModel):
     """
     Updates the details of an existing game.
+    Only the fields sent in the body are changed.
     """
     updated_game = await game_service.update_game(gameId, request)
     
@@ -1,44 +1,123 @@
 import logging
+import os
+import secrets
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 
+from ....core.responses import ORJSONResponse
 from ....schemas import response_schema, nft_schema
-from ....services import nft_service
+from ....services import bulk_service, mint_service, nft_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def verify_admin_key(x_api_key: Optional[str] = Header(None)):
+    """
+    Require the `X-API-Key` header to match ADMIN_API_KEY.
+
+    Mints are paid for with the server's key, so without ADMIN_API_KEY they are refused.
+    """
+    admin_key = os.getenv("ADMIN_API_KEY")
+    if not admin_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Minting is disabled: ADMIN_API_KEY is not set."
+        )
+    if not secrets.compare_digest(x_api_key or "", admin_key):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key."
+        )
+
 router = APIRouter(
     prefix = '/nfts',
     tags=['nfts']
 )
 
+# Declared before '/{gameId}/{bountyId}', which would otherwise match '/owned/{address}', '/mint/{job_id}' and '/{tokenId}/owner'.
+@router.get('/owned/{address}', status_code=status.HTTP_200_OK)
+async def get_owned_nfts(address: str):
+    """Fetch the tokenIds of the NFTs owned by a wallet address"""
+    owned_nfts = await nft_service.get_owned_nfts(address)
+    return ORJSONResponse(response_schema.ResponseModel(
+        status="success",
+        message="Retrieve Owned NFTs successfully",
+        data=owned_nfts,
+        timestamp=datetime.now().isoformat()
+    ))
+
+@router.post('/mint', status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(verify_admin_key)])
+async def mint_nft(request: nft_schema.CreateMint):
+    """
+    Queues a mint of an NFT reward to each of the given wallets (interacts with blockchain).
+
+    Requires the `X-API-Key` header to match ADMIN_API_KEY; answers 503 when it is not set.
+
+    Mints are signed and broadcast in the background; poll `GET /nfts/mint/{job_id}`
+    with a returned handle for the outcome: a job is `Minted` once its transaction
+    succeeded on chain, and retried (or `Failed`) if it reverted.
+    """
+    mint_jobs = await mint_service.enqueue(request)
+    return response_schema.ResponseModel(
+        status="success",
+        message="Minting Reward accepted",
+        data=mint_jobs,
+        timestamp=datetime.now().isoformat()
+    )
+
+@router.get('/mint/{job_id}', status_code=status.HTTP_200_OK)
+async def get_mint_job(job_id: str):
+    """Fetch the status of a queued NFT mint"""
+    mint_job = await mint_service.get_job(job_id)
+    return response_schema.ResponseModel(
+        status="success",
+        message=f"Mint job {mint_job.status.lower()}",
+        data=mint_job,
+        timestamp=datetime.now().isoformat()
+    )
+
+@router.get('/{tokenId}/owner', status_code=status.HTTP_200_OK)
+async def get_nft_owner(tokenId: int):
+    """Fetch an NFT Owner's Address from nft tokenId on Blockchain"""
+    address = await nft_service.get_nft_owner(tokenId)
+    return response_schema.ResponseModel(
+        status="success",
+        message="Retrieve Owner's Address successfully",
+        data=address,
+        timestamp=datetime.now().isoformat()
+    )
+
 @router.get('/{gameId}/{bountyId}', status_code = status.HTTP_200_OK)
 async def get_all_nfts(gameId: str, bountyId: str):
     """Fetch all NFTs reward from specified bounty and game in Database"""
     list_nfts = await nft_service.get_all_nfts(gameId, bountyId)
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message="Retrieve All NFTs successfully",
         data=list_nfts,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.get('/{gameId}/{bountyId}/{nftId}', status_code = status.HTTP_200_OK)
 async def get_nft(gameId: str, bountyId: str, nftId: str):
     """Fetch a NFT reward from specified nft, bounty, game in Database"""
     nft = await nft_service.get_nft(gameId, bountyId, nftId)
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message="Retrieve NFT successfully",
         data=nft,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.post('/{gameId}/{bountyId}', status_code = status.HTTP_201_CREATED)
 async def create_nfts(gameId: str, bountyId: str, request: nft_schema.NFTModel):
-    """Create a new NFT entry."""
+    """
+    Create a new NFT entry.
+
+    Answers 400 when the bounty already has an NFT with this name.
+    """
     nft_detail = await nft_service.create_nft(gameId, bountyId, request)
     return response_schema.ResponseModel(
         status="success",
@@ -47,10 +126,30 @@ async def create_nfts(gameId: str, bountyId: str, request: nft_schema.NFTModel):
         timestamp=datetime.now().isoformat()
     )
 
+@router.post('/{gameId}/{bountyId}/bulk', status_code=status.HTTP_200_OK, openapi_extra=bulk_service.openapi_body(nft_schema.BulkNFTModel))
+async def bulk_upsert_nfts(gameId: str, bountyId: str, request: Request):
+    """
+    Create or update many NFT rewards of a bounty at once, matched on their name.
+
+    The body is a JSON array of NFTs, or NDJSON (`Content-Type: application/x-ndjson`,
+    one NFT per line). Each item gets its own result, at the same index.
+    """
+    items = await bulk_service.read_items(request)
+    result = await nft_service.bulk_upsert_nfts(gameId, bountyId, items)
+    return response_schema.ResponseModel(
+        status="success",
+        message=f"{result.created} NFTs created, {result.updated} updated, {result.failed} failed",
+        data=result,
+        timestamp=datetime.now().isoformat()
+    )
+
 @router.put('/{gameId}/{bountyId}/{nftId}/', status_code=status.HTTP_200_OK)
-async def update_nft(gameId: str, bountyId: str, nftId: str, request: nft_schema.NFTModel):
+async def update_nft(gameId: str, bountyId: str, nftId: str, request: nft_schema.UpdateNFTModel):
     """
     Update an existing NFT entry.
+    Only the fields sent in the body are changed.
+
+    Answers 400 when renaming it to the name of another NFT of the bounty.
     """
     updated_nft = await nft_service.update_nft(gameId, bountyId, nftId, request)
     return response_schema.ResponseModel(
@@ -74,26 +173,13 @@ async def delete_nft(gameId: str, bountyId: str, nftId: str):
     )
 
 
-@router.get('/{tokenId}/owner', status_code=status.HTTP_200_OK)
-async def get_nft_owner(tokenId: int):
-    """Fetch an NFT Owner's Address from nft tokenId on Blockchain"""
-    address = await nft_service.get_nft_owner(tokenId)
-    return response_schema.ResponseModel(
+@router.post('/owners', status_code=status.HTTP_200_OK)
+async def get_nft_owners(request: nft_schema.NFTOwnersRequest):
+    """Fetch the Owner's Addresses of many NFTs at once from their tokenIds on Blockchain"""
+    owners = await nft_service.get_nft_owners(request)
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
-        message="Retrieve Owner's Address successfully",
-        data=address,
+        message="Retrieve Owners' Addresses successfully",
+        data=owners,
         timestamp=datetime.now().isoformat()
-    )
-
-# @router.get('/mint', status_code=status.HTTP_200_OK)
-# async def mint_nft(user_wallet: str, game_id: str):
-#     """Mints an NFT after a player wins a game (interacts with blockchain)."""
-
-#     nft_data = await nft_service.mint_nft(user_wallet, game_id)
-    
-    # return response_schema.ResponseModel(
-    #     status="success",
-    #     message="Minting Reward successfully",
-    #     data=nft_data,
-    #     timestamp=datetime.now().isoformat()
-    # )
\ No newline at end of file
+    ))
@@ -4,6 +4,7 @@ from ....services import orderitem_service
 from ....schemas.orderitem_schema import CreateOrderItem, CreateOrderItemCollection
 from ....schemas.response_schema import ResponseModel
 from datetime import datetime
+from typing import List, Union
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -15,8 +16,15 @@ router = APIRouter(
 )
 
 @router.post('/items/price', status_code=status.HTTP_200_OK)
-async def get_price(request: CreateOrderItem): 
-    price = await orderitem_service.get_price(request)
+async def get_price(request: Union[CreateOrderItem, List[CreateOrderItem]]): 
+    """
+    Quote one order item, or a list of them in a single lookup. Items of a list
+    that cannot be priced are reported in `errors` instead of failing the quote.
+    """
+    if isinstance(request, list):
+        price = await orderitem_service.get_prices(request)
+    else:
+        price = await orderitem_service.get_price(request)
 
     return ResponseModel(
         status="success",
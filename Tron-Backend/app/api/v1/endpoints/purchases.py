@@ -4,7 +4,7 @@ from datetime import datetime
 from fastapi import APIRouter, status
 
 from ....schemas import response_schema, purchase_schema
-from ....services import purchase_service 
+from ....services import verification_service
 
 
 logging.basicConfig(level=logging.INFO)
@@ -15,15 +15,31 @@ router = APIRouter(
     tags=['purchases']
 )
 
-@router.post('/', status_code=status.HTTP_200_OK)
+@router.post('/', status_code=status.HTTP_202_ACCEPTED)
 async def purchase(request: purchase_schema.CreatePurchase): 
     """
-    Fetches a list of all available games with basic metadata.
+    Queues a purchase for on-chain verification of its transaction.
+
+    The purchase is recorded once the transaction is confirmed; poll
+    `GET /purchases/{verification_id}` with the returned handle for the outcome.
+    """
+    verification = await verification_service.submit(request)
+    return response_schema.ResponseModel(
+        status="success",
+        message="Purchase accepted, waiting for transaction confirmation",
+        data=verification,
+        timestamp=datetime.now()
+    )
+
+@router.get('/{verification_id}', status_code=status.HTTP_200_OK)
+async def get_purchase_verification(verification_id: str): 
+    """
+    Fetches the verification status of a queued purchase.
     """
-    game_data = await purchase_service.purchase(request)
+    verification = await verification_service.get_verification(verification_id)
     return response_schema.ResponseModel(
         status="success",
-        message="Purchase successfully",
-        data=game_data,
+        message=f"Purchase verification {verification.status.lower()}",
+        data=verification,
         timestamp=datetime.now()
     )
\ No newline at end of file
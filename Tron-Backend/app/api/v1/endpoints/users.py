@@ -1,42 +1,58 @@
+from ....core.responses import ORJSONResponse
 from ....schemas import user_schema, response_schema
 from ....services import user_service
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
 from datetime import datetime
+from typing import Optional
 
 router = APIRouter(
     prefix = '/users',
     tags=['users']
 )
 
-@router.get('/{userId}/purchases')
-def get_purchased_games(userId: str):
+@router.get('/{userId}/purchases', status_code=status.HTTP_200_OK)
+async def get_purchased_games(
+    userId: str,
+    limit: int = Query(user_service.DEFAULT_PAGE_SIZE, ge=1, le=user_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
     """
-    Fetches the list of games purchased by a specific user.
+    Fetches a page of the games purchased by a specific user, with their catalog
+    details and the user's NFTs from each game.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
     """
-    purchased_games = user_service.get_purchased_games(userId)
+    purchased_games, next_cursor = await user_service.get_purchased_games(userId, limit, cursor)
 
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.PaginatedResponseModel(
         status="success",
-        message="successfully register an account",
+        message="Purchased games retrieved successfully",
         data=purchased_games,
+        next_cursor=next_cursor,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
-@router.get('/{userId}/nfts')
-def get_purchased_nfts(userId: str):
-    """
-    Fetches the list of nfts purchased by a specific user.
+@router.get('/{userId}/nfts', status_code=status.HTTP_200_OK)
+async def get_purchased_nfts(
+    userId: str,
+    limit: int = Query(user_service.DEFAULT_PAGE_SIZE, ge=1, le=user_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
     """
+    Fetches a page of the nfts owned by a specific user.
 
-    purchased_nfts = user_service.get_purchased_nfts(userId) 
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    """
+    purchased_nfts, next_cursor = await user_service.get_purchased_nfts(userId, limit, cursor)
 
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.PaginatedResponseModel(
         status="success",
-        message="successfully register an account",
+        message="NFTs retrieved successfully",
         data=purchased_nfts,
+        next_cursor=next_cursor,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 
 @router.post('/register', status_code=status.HTTP_201_CREATED)
 async def register(request: user_schema.UserCreate):
@@ -52,12 +68,19 @@ async def register(request: user_schema.UserCreate):
         timestamp=datetime.now().isoformat()
     )
 
-@router.get('/login')
-def login(userId: str):
+@router.post('/login', status_code=status.HTTP_200_OK)
+async def login(request: user_schema.UserLogin):
     """
     login
     """
-    return user_service.login(userId)
+    user_data = await user_service.login(request)
+
+    return response_schema.ResponseModel(
+        status="success",
+        message="successfully logged in",
+        data=user_data,
+        timestamp=datetime.now().isoformat()
+    )
 
 ###WILLDELETELATER###
 ###WILLDELETELATER###
@@ -66,12 +89,12 @@ def login(userId: str):
 async def all_user():
     all_user = await user_service.all_user()
 
-    return response_schema.ResponseModel(
+    return ORJSONResponse(response_schema.ResponseModel(
         status="success",
         message="successfully register an account",
         data=all_user,
         timestamp=datetime.now().isoformat()
-    )
+    ))
 ###WILLDELETELATER###
 ###WILLDELETELATER###
 ###WILLDELETELATER###
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import games, bounties, users, nfts, orderitem, purchases
+from .endpoints import games, bounties, users, nfts, orderitem, purchases, exports
 
 router = APIRouter(
     prefix='/v1',
@@ -11,4 +11,5 @@ router.include_router(games.router)
 router.include_router(bounties.router)
 router.include_router(nfts.router)
 router.include_router(orderitem.router)
-router.include_router(purchases.router)
\ No newline at end of file
+router.include_router(purchases.router)
+router.include_router(exports.router)
\ No newline at end of file
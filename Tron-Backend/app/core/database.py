@@ -1,29 +1,117 @@
 import os
 import urllib.parse
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
 from dotenv import load_dotenv
+from pymongo.errors import DuplicateKeyError
+
+from .monitoring import command_monitor, pool_monitor
 
 # Load environment variables from a .env file if needed
 load_dotenv()
 
-# MongoDB connection string (use environment variable for security)
-# MONGODB_URL = os.environ.get("MongoDB_connection_string") # mine say it error rfc sth. idk
-username = urllib.parse.quote_plus(os.getenv("MONGODB_USERNAME"))
-password = urllib.parse.quote_plus(os.getenv("MONGODB_PASSWORD"))
-MONGODB_URL = 'mongodb+srv://%s:%s@trondb.dcxup.mongodb.net' % (username, password)
+DATABASE_NAME = "tron"
+
+# Client options read from the environment; unset ones keep the driver defaults.
+# Size the pool per worker, e.g. MONGODB_MAX_POOL_SIZE ~ a few times the worker's CPUs.
+CLIENT_OPTIONS_FROM_ENV = {
+    "maxPoolSize": ("MONGODB_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGODB_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGODB_MAX_IDLE_TIME_MS", int),
+    "waitQueueTimeoutMS": ("MONGODB_WAIT_QUEUE_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGODB_SERVER_SELECTION_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGODB_CONNECT_TIMEOUT_MS", int),
+    # Upper bound of every operation; the driver sends the remaining budget as maxTimeMS.
+    "timeoutMS": ("MONGODB_TIMEOUT_MS", int),
+    # e.g. "zstd,snappy" (needs the zstandard / python-snappy packages).
+    "compressors": ("MONGODB_COMPRESSORS", str),
+}
+
+_client: Optional[AsyncIOMotorClient] = None
+
+def get_mongodb_url() -> str:
+    """Build the MongoDB connection string from the environment."""
+    # MONGODB_URL = os.environ.get("MongoDB_connection_string") # mine say it error rfc sth. idk
+    username = urllib.parse.quote_plus(os.getenv("MONGODB_USERNAME"))
+    password = urllib.parse.quote_plus(os.getenv("MONGODB_PASSWORD"))
+    return 'mongodb+srv://%s:%s@trondb.dcxup.mongodb.net' % (username, password)
+
+def get_client_options() -> Dict[str, Any]:
+    """Collect the MongoDB client options set in the environment."""
+    options = {}
+    for option, (env_name, cast) in CLIENT_OPTIONS_FROM_ENV.items():
+        value = os.getenv(env_name)
+        if value:
+            options[option] = cast(value)
+    return options
+
+def get_client() -> AsyncIOMotorClient:
+    """
+    Return the MongoDB client, creating it on first use.
+
+    Creating the client resolves the ``mongodb+srv`` DNS records, so it is deferred
+    until the app lifespan (or the first query) instead of happening at import time.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            get_mongodb_url(),
+            event_listeners=[pool_monitor, command_monitor],
+            **get_client_options(),
+        )
+    return _client
+
+def get_database() -> AsyncIOMotorDatabase:
+    """Return the application database."""
+    return get_client().get_database(DATABASE_NAME)
+
+def close_client():
+    """Close the MongoDB client and its connection pool, if it was ever created."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def duplicate_key_field(error: DuplicateKeyError) -> str:
+    """Return the name of the field whose unique index rejected the write."""
+    key_pattern = (error.details or {}).get("keyPattern") or {}
+    return next(iter(key_pattern), "")
+
+class LazyCollection:
+    """
+    Stand-in for a Motor collection that is resolved against the client on first use.
+
+    Lets services keep importing ``game_collection`` and friends at module level
+    without importing this module opening a connection.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._client = None
+        self._collection = None
 
-# Create a MongoDB client
-client = AsyncIOMotorClient(MONGODB_URL)
+    def get_collection(self) -> AsyncIOMotorCollection:
+        client = get_client()
+        if self._collection is None or self._client is not client:
+            self._client = client
+            self._collection = client.get_database(DATABASE_NAME).get_collection(self.name)
+        return self._collection
 
-# Access the specific database
-db = client.get_database("tron")
+    def __getattr__(self, attribute):
+        return getattr(self.get_collection(), attribute)
 
 # Collections
-game_collection = db.get_collection("game")
-bounty_collection = db.get_collection("bounty")
-nft_collection = db.get_collection("nft")
-user_collection = db.get_collection("user")
-orderitem_collection = db.get_collection("orderitem")
-order_collection = db.get_collection("order")
-verifiedpurchase_collection = db.get_collection("verifiedpurchase")
+game_collection = LazyCollection("game")
+bounty_collection = LazyCollection("bounty")
+nft_collection = LazyCollection("nft")
+user_collection = LazyCollection("user")
+orderitem_collection = LazyCollection("orderitem")
+order_collection = LazyCollection("order")
+verifiedpurchase_collection = LazyCollection("verifiedpurchase")
+purchaseverification_collection = LazyCollection("purchaseverification")
+mintjob_collection = LazyCollection("mintjob")
 
+# Materialized NFT owners and the checkpoint of the Transfer event indexer
+nft_ownership_collection = LazyCollection("nft_ownership")
+indexer_checkpoint_collection = LazyCollection("indexer_checkpoint")
@@ -0,0 +1,244 @@
+"""
+Declarative registry of the MongoDB indexes the services rely on.
+
+``ensure_indexes`` is run from the app lifespan and is idempotent: creating an index
+that already exists with the same spec is a no-op on the server. Startup fails when a
+unique index cannot be created, since the services rely on them instead of checking
+for duplicates first, except for the BEST_EFFORT ones. ``collscan_report``
+explains every registered query shape (QUERY_SHAPES, kept by hand) and lists the ones
+still answered by a collection scan; run it with ``python -m app.core.indexes``.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from . import database
+
+logger = logging.getLogger(__name__)
+
+# Only enforce uniqueness on documents that actually carry the field, older documents
+# may have it missing or null.
+def _has_string(field: str) -> Dict[str, Any]:
+    return {field: {"$type": "string"}}
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "game": [
+        IndexModel([("title", ASCENDING)], name="title_unique", unique=True, partialFilterExpression=_has_string("title")),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True, partialFilterExpression=_has_string("id")),
+    ],
+    "bounty": [
+        IndexModel([("gameId", ASCENDING)], name="gameId"),
+        # Key of the bulk upserts (see bounty_service.bulk_upsert_bounties), best effort.
+        IndexModel(
+            [("gameId", ASCENDING), ("name", ASCENDING)],
+            name="gameId_name_unique",
+            unique=True,
+            partialFilterExpression=_has_string("name"),
+        ),
+    ],
+    "nft": [
+        IndexModel([("gameId", ASCENDING), ("bountyId", ASCENDING)], name="gameId_bountyId"),
+        # Key of the bulk upserts (see nft_service.bulk_upsert_nfts), best effort.
+        IndexModel(
+            [("gameId", ASCENDING), ("bountyId", ASCENDING), ("name", ASCENDING)],
+            name="gameId_bountyId_name_unique",
+            unique=True,
+            partialFilterExpression=_has_string("name"),
+        ),
+    ],
+    "user": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True, partialFilterExpression=_has_string("email")),
+        IndexModel(
+            [("username", ASCENDING)], name="username_unique", unique=True, partialFilterExpression=_has_string("username")
+        ),
+    ],
+    "orderitem": [
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("OrderItemCollection.game_id", ASCENDING)],
+            name="user_id_status_game_id",
+        ),
+    ],
+    "verifiedpurchase": [
+        IndexModel(
+            [("transaction_id", ASCENDING)],
+            name="transaction_id_unique",
+            unique=True,
+            partialFilterExpression=_has_string("transaction_id"),
+        ),
+    ],
+    "purchaseverification": [
+        IndexModel([("status", ASCENDING), ("updatedAt", ASCENDING)], name="status_updatedAt"),
+    ],
+    "mintjob": [
+        IndexModel([("status", ASCENDING), ("nextAttemptAt", ASCENDING)], name="status_nextAttemptAt"),
+        IndexModel([("status", ASCENDING), ("updatedAt", ASCENDING)], name="status_updatedAt"),
+    ],
+    "nft_ownership": [
+        IndexModel([("owner", ASCENDING), ("_id", ASCENDING)], name="owner_tokenId"),
+    ],
+}
+
+# Unique indexes created separately, whose failure is logged instead of failing startup:
+# databases may already hold bounties or NFTs sharing a name. Without them, concurrent
+# bulk upserts of the same name may create two documents, nothing else changes.
+BEST_EFFORT = {
+    ("bounty", "gameId_name_unique"),
+    ("nft", "gameId_bountyId_name_unique"),
+}
+
+# Filter shapes issued by app/services, with placeholder values, used by collscan_report.
+# Kept by hand: tests/test_indexes.py fails when a service issues a filter on a set of
+# top-level fields that has no entry here, so add the new shape along with the query.
+_ID = ObjectId("000000000000000000000000")
+_EPOCH = datetime(1970, 1, 1)
+
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"collection": "game", "filter": {"title": "title"}},
+    {"collection": "game", "filter": {"id": "id"}},
+    {"collection": "game", "filter": {"_id": {"$in": [_ID]}}},
+    {"collection": "bounty", "filter": {"gameId": "gameId"}},
+    {"collection": "bounty", "filter": {"gameId": "gameId", "name": "name"}},
+    {"collection": "bounty", "filter": {"gameId": "gameId", "_id": _ID}},
+    {"collection": "nft", "filter": {"gameId": "gameId", "bountyId": "bountyId"}},
+    {"collection": "nft", "filter": {"gameId": "gameId", "bountyId": "bountyId", "name": "name"}},
+    {"collection": "nft", "filter": {"gameId": "gameId", "bountyId": "bountyId", "_id": _ID}},
+    {"collection": "user", "filter": {"_id": _ID}},
+    {"collection": "user", "filter": {"_id": _ID, "password": "password"}},
+    {"collection": "user", "filter": {"email": "user@example.com"}},
+    {"collection": "user", "filter": {"username": "username"}},
+    {
+        "collection": "orderitem",
+        "filter": {
+            "user_id": "user_id",
+            "status": {"$in": ["Pending", "Processing"]},
+            "OrderItemCollection.game_id": {"$in": ["game_id"]},
+        },
+    },
+    {"collection": "orderitem", "filter": {"_id": _ID}},
+    {"collection": "orderitem", "filter": {"_id": _ID, "user_id": "user_id"}},
+    {"collection": "orderitem", "filter": {"_id": _ID, "user_id": "user_id", "status": {"$ne": "Completed"}}},
+    {"collection": "orderitem", "filter": {"_id": _ID, "status": "Completed", "transaction": "transaction"}},
+    {"collection": "verifiedpurchase", "filter": {"_id": _ID}},
+    {"collection": "verifiedpurchase", "filter": {"transaction_id": "transaction_id"}},
+    {"collection": "purchaseverification", "filter": {"_id": _ID}},
+    {"collection": "purchaseverification", "filter": {"_id": _ID, "status": {"$in": ["Pending", "Verifying"]}}},
+    {"collection": "purchaseverification", "filter": {"status": {"$in": ["Pending", "Verifying"]}, "updatedAt": {"$lt": _EPOCH}}},
+    {"collection": "mintjob", "filter": {"_id": _ID}},
+    {"collection": "mintjob", "filter": {"_id": {"$in": [_ID]}, "claim": "claim"}},
+    {"collection": "mintjob", "filter": {"_id": {"$in": [_ID]}, "status": "Pending"}},
+    {"collection": "mintjob", "filter": {"status": "Pending", "nextAttemptAt": {"$lte": _EPOCH}}},
+    {"collection": "mintjob", "filter": {"status": "Signed", "updatedAt": {"$lt": _EPOCH}}},
+    {"collection": "mintjob", "filter": {"status": "Broadcast"}},
+    {"collection": "nft_ownership", "filter": {"_id": {"$in": [1]}}},
+    {"collection": "nft_ownership", "filter": {"owner": "owner"}},
+    {"collection": "indexer_checkpoint", "filter": {"_id": "nft_transfer_indexer"}},
+    {"collection": "indexer_checkpoint", "filter": {"_id": "nft_transfer_indexer", "leaseOwner": "owner"}},
+    {
+        "collection": "indexer_checkpoint",
+        "filter": {"_id": "nft_transfer_indexer", "$or": [{"leaseOwner": "owner"}, {"leaseUntil": {"$lt": _EPOCH}}]},
+    },
+    {
+        "collection": "indexer_checkpoint",
+        "filter": {"_id": "nft_transfer_indexer", "leaseOwner": "owner", "blockNumber": {"$not": {"$gte": 0}}},
+    },
+]
+
+
+async def ensure_indexes():
+    """
+    Create every registered index that does not exist yet, one collection at a time in parallel.
+
+    Raises:
+        RuntimeError: If a unique index is missing and could not be created (e.g. the
+            collection already holds duplicates), listing every such index.
+    """
+    db = database.get_database()
+
+    async def ensure(collection_name: str, indexes: List[IndexModel]) -> List[str]:
+        collection = db.get_collection(collection_name)
+        best_effort = [index for index in indexes if (collection_name, index.document["name"]) in BEST_EFFORT]
+        indexes = [index for index in indexes if index not in best_effort]
+        for index in best_effort:
+            try:
+                await collection.create_indexes([index])
+            except PyMongoError as e:
+                logger.warning(f"Could not create index '{collection_name}.{index.document['name']}', serving without it: {str(e)}")
+
+        try:
+            names = await collection.create_indexes(indexes)
+            logger.info(f"Indexes ensured on '{collection_name}': {', '.join(names)}")
+            return []
+        except PyMongoError as e:
+            # A conflicting spec or duplicate data must be fixed by hand.
+            logger.error(f"Could not ensure indexes on '{collection_name}': {str(e)}")
+
+        unique_names = [index.document["name"] for index in indexes if index.document.get("unique")]
+        if not unique_names:
+            # Only slower queries without the others: keep serving.
+            return []
+        try:
+            existing = await collection.index_information()
+        except PyMongoError:
+            existing = {}
+        return [f"{collection_name}.{name}" for name in unique_names if name not in existing]
+
+    missing = [
+        name
+        for names in await asyncio.gather(*(ensure(name, indexes) for name, indexes in INDEXES.items()))
+        for name in names
+    ]
+    if missing:
+        raise RuntimeError(f"Unique indexes could not be created: {', '.join(missing)}. Remove the duplicates and restart.")
+
+
+def _stages(plan: Dict[str, Any]):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def collscan_report() -> List[Dict[str, Any]]:
+    """
+    Explain every registered query shape.
+
+    Returns:
+        list[dict]: The shapes whose winning plan still contains a COLLSCAN stage.
+    """
+    db = database.get_database()
+    collscans = []
+    for shape in QUERY_SHAPES:
+        explain = await db.command(
+            "explain",
+            {"find": shape["collection"], "filter": shape["filter"]},
+            verbosity="queryPlanner",
+        )
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_stages(winning_plan)):
+            collscans.append(shape)
+    return collscans
+
+
+async def _main():
+    try:
+        await ensure_indexes()
+        collscans = await collscan_report()
+        if collscans:
+            for shape in collscans:
+                print(f"COLLSCAN  {shape['collection']}  {shape['filter']}")
+        else:
+            print("Every registered query shape uses an index.")
+    finally:
+        database.close_client()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
@@ -0,0 +1,233 @@
+import os
+import secrets
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Header, HTTPException, status
+
+load_dotenv()
+
+ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_S: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+SIZE_BUCKETS_BYTES: List[float] = [100, 1000, 10000, 100000, 1000000, 10000000]
+
+# Requests no route matched (404s, scans) share one label instead of one per path.
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Tuple[str, ...]
+
+
+class Histogram:
+    """Bucket counts, sum and count of observations, per label set."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.series: Dict[Labels, List] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+
+class HTTPMetrics:
+    """
+    Request counters of this worker, updated by MetricsMiddleware.
+
+    The event loop is single threaded, so the counters need no locking. Each worker
+    process keeps its own and /metrics answers with the counters of whichever worker
+    served the scrape, so run one worker per port and scrape every port as its own
+    target: behind a shared port, successive scrapes would mix workers and the
+    counters would jump back and forth.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests: Dict[Labels, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS_S)
+        self.response_size = Histogram(SIZE_BUCKETS_BYTES)
+
+    def record(self, method: str, route: str, status_code: int, duration: float, size: int):
+        key = (method, route, str(status_code))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.latency.observe((method, route), duration)
+        self.response_size.observe((method, route), size)
+
+
+http_metrics = HTTPMetrics()
+
+# Callables returning ``(name, stats dict)``, rendered as gauges after the HTTP metrics.
+_stats_sources: List[Callable[[], Tuple[str, Dict[str, Any]]]] = []
+# Callables appending their own metrics to the rendered lines.
+_collectors: List[Callable[[List[str]], None]] = []
+
+
+def verify_metrics_key(x_api_key: Optional[str] = Header(None), authorization: Optional[str] = Header(None)):
+    """
+    Require METRICS_API_KEY, when it is set, as the `X-API-Key` header or as a bearer
+    token (what Prometheus sends with ``authorization: {credentials: ...}``).
+    """
+    metrics_key = os.getenv("METRICS_API_KEY")
+    if not metrics_key:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    bearer = token if scheme.lower() == "bearer" else ""
+    if not (secrets.compare_digest(x_api_key or "", metrics_key) or secrets.compare_digest(bearer, metrics_key)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key."
+        )
+
+
+def register_stats(name: str, stats: Callable[[], Dict[str, Any]]):
+    """
+    Export a component's ``stats()`` on /metrics as ``mintyplay_<name>_<key>`` gauges.
+
+    Nested dicts (e.g. counters per namespace) become one series per item, labelled ``key``.
+    """
+    _stats_sources.append(lambda: (name, stats()))
+
+
+def register_collector(collect: Callable[[List[str]], None]):
+    """Export metrics rendered by ``collect(lines)`` (see render_histogram) on /metrics."""
+    _collectors.append(collect)
+
+
+def route_template(scope) -> str:
+    """Return the templated path of the route that served a request, e.g. ``/v1/games/{gameId}``."""
+    # The router stores the matched route in the (shared) scope.
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # A route of an included router may only know its path below the router's
+    # prefix: recover the prefix from the request path.
+    try:
+        filled = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if filled != path and path.endswith(filled):
+        return path[:len(path) - len(filled)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by its route template (e.g.
+    ``/v1/games/{gameId}``), so the series do not grow with the IDs in the paths.
+
+    A plain ASGI middleware rather than a ``BaseHTTPMiddleware``: it only wraps
+    ``send`` to read the status and count the body bytes, it does not buffer or copy
+    the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        http_metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            http_metrics.in_flight -= 1
+            http_metrics.record(scope["method"], route_template(scope), response["status"], duration, response["size"])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_counter(lines: List[str], name: str, help_text: str, counts: Dict[Labels, int], label_names: Tuple[str, ...]):
+    """Append a counter, one series per label set of ``counts``, to ``lines`` in the Prometheus text format."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, count in counts.items():
+        lines.append(f"{name}{_labels(label_names, labels)} {count}")
+
+
+def render_histogram(lines: List[str], name: str, help_text: str, histogram: Histogram, label_names: Tuple[str, ...]):
+    """Append ``histogram`` to ``lines`` in the Prometheus text format."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = [*map(_format_number, histogram.buckets), "+Inf"]
+    for labels, (buckets, total, count) in histogram.series.items():
+        cumulative = 0
+        for bound, bucket in zip(bounds, buckets):
+            cumulative += bucket
+            lines.append(f"{name}_bucket{_labels((*label_names, 'le'), (*labels, bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {_format_number(total)}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {count}")
+
+
+def _render_stats(lines: List[str], name: str, stats: Dict[str, Any]):
+    for key, value in stats.items():
+        metric = f"mintyplay_{name}_{key}"
+        if isinstance(value, dict):
+            series = [(item, count) for item, count in value.items() if isinstance(count, (int, float))]
+            if series:
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{_labels(('key',), (item,))} {_format_number(count)}" for item, count in series)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_format_number(value)}")
+
+
+def render() -> str:
+    """Render every metric of this worker in the Prometheus text exposition format."""
+    lines: List[str] = [
+        "# HELP http_requests_in_flight Requests being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {http_metrics.in_flight}",
+    ]
+    render_counter(
+        lines, "http_requests_total", "Requests served, by route template and status code.",
+        http_metrics.requests, ("method", "route", "status"),
+    )
+    render_histogram(
+        lines, "http_request_duration_seconds", "Time to serve a request, by route template.",
+        http_metrics.latency, ("method", "route"),
+    )
+    render_histogram(
+        lines, "http_response_size_bytes", "Response body size, by route template.",
+        http_metrics.response_size, ("method", "route"),
+    )
+
+    for collect in _collectors:
+        collect(lines)
+    for source in _stats_sources:
+        name, stats = source()
+        _render_stats(lines, name, stats)
+    return "\n".join(lines) + "\n"
\ No newline at end of file
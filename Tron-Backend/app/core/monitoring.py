@@ -0,0 +1,301 @@
+import logging
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+from . import metrics
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Checkouts slower than this are logged, they mean the pool is too small for the load.
+SLOW_CHECKOUT_MS = float(os.getenv("MONGODB_SLOW_CHECKOUT_MS", "100"))
+
+# Commands slower than this are logged with the shape of their filter.
+SLOW_COMMAND_MS = float(os.getenv("MONGODB_SLOW_COMMAND_MS", "100"))
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is unbounded.
+CHECKOUT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Records how long requests wait to check a connection out of the Motor pool.
+
+    Pymongo calls the listener synchronously from the driver's threads, so every
+    callback only updates counters.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.failed_checkouts = 0
+        self.checked_out = 0
+        self.open_connections = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.wait_ms_buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def _record_wait(self, duration):
+        if duration is None:
+            return
+        wait_ms = duration * 1000
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+        self.wait_ms_buckets[bisect_left(CHECKOUT_BUCKETS_MS, wait_ms)] += 1
+        if wait_ms >= SLOW_CHECKOUT_MS:
+            logger.warning(f"Waited {wait_ms:.1f} ms for a MongoDB connection, consider a larger MONGODB_MAX_POOL_SIZE.")
+
+    def connection_checked_out(self, event):
+        self.checkouts += 1
+        self.checked_out += 1
+        self._record_wait(event.duration)
+
+    def connection_check_out_failed(self, event):
+        self.failed_checkouts += 1
+        self._record_wait(event.duration)
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_closed(self, event):
+        self.open_connections -= 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the pool usage and checkout wait counters."""
+        return {
+            "checkouts": self.checkouts,
+            "failed_checkouts": self.failed_checkouts,
+            "checked_out": self.checked_out,
+            "open_connections": self.open_connections,
+            "wait_ms_total": self.wait_ms_total,
+            "wait_ms_max": self.wait_ms_max,
+            "wait_ms_buckets": dict(zip([*map(str, CHECKOUT_BUCKETS_MS), "+Inf"], self.wait_ms_buckets)),
+        }
+
+
+pool_monitor = PoolMonitor()
+
+
+# Label of the commands issued outside of a request (background workers, startup).
+BACKGROUND_ROUTE = "<background>"
+
+# Where each command keeps its filter: the field of the command, or of its first statement.
+FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query", "findAndModify": "query"}
+STATEMENT_FILTERS = {"update": ("updates", "q"), "delete": ("deletes", "q")}
+
+
+class RequestCommands:
+    """The MongoDB commands of one request, counted while it is served."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._route: Optional[str] = None
+        self.count = 0
+        self.duration_ms = 0.0
+
+    @property
+    def route(self) -> str:
+        # Resolved on the first command: routing has happened by the time the endpoint queries.
+        if self._route is None:
+            self._route = metrics.route_template(self.scope)
+        return self._route
+
+
+current_request: ContextVar[Optional[RequestCommands]] = ContextVar("current_request", default=None)
+
+
+def filter_shape(value: Any) -> Any:
+    """Replace the values of a filter with ``?``, keeping its fields and operators."""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Lists of clauses ($and / $or) keep their shape, lists of values ($in) collapse.
+        shapes = [filter_shape(item) for item in value if isinstance(item, dict)]
+        return shapes or "?"
+    return "?"
+
+
+def command_filter(command_name: str, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the filter of a query or write command, if it has one."""
+    if command_name in FILTER_FIELDS:
+        return command.get(FILTER_FIELDS[command_name])
+    if command_name in STATEMENT_FILTERS:
+        field, key = STATEMENT_FILTERS[command_name]
+        statements = command.get(field) or [{}]
+        return statements[0].get(key)
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or [{}]
+        return pipeline[0].get("$match")
+    return None
+
+
+def opens_tailing_cursor(command_name: str, command: Dict[str, Any]) -> bool:
+    """Return whether a command opens a cursor whose getMores wait for new data (change streams, tailable finds)."""
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or [{}]
+        return "$changeStream" in pipeline[0]
+    return command_name == "find" and bool(command.get("tailable")) and bool(command.get("awaitData"))
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Attributes every MongoDB command to the request that issued it.
+
+    Motor runs the driver on a thread pool but copies the caller's context to it,
+    so ``current_request`` (set by ServerTimingMiddleware) is visible from these
+    callbacks. Counts and durations are kept per route, collection and command,
+    and commands slower than MONGODB_SLOW_COMMAND_MS are logged.
+
+    The getMores of change streams and tailable cursors block until the server's
+    await time runs out when there is nothing new, so they are only counted: their
+    duration is neither timed nor logged as slow.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Collection, filter and tailing cursor of every command in flight.
+        self._started: Dict[Tuple[Any, int], Tuple[str, Optional[Dict[str, Any]], Optional[int]]] = {}
+        # Ids of the open change stream and tailable cursors.
+        self._tailing_cursors = set()
+        self.commands: Dict[Tuple[str, str, str], int] = {}
+        self.failures: Dict[Tuple[str, str, str], int] = {}
+        self.duration = metrics.Histogram(metrics.LATENCY_BUCKETS_S)
+
+    def started(self, event):
+        command = event.command
+        collection = command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        if not isinstance(collection, str):
+            collection = "-"
+        with self._lock:
+            # The id of the tailing cursor a getMore reads, or 0 for a command opening one.
+            if event.command_name == "getMore":
+                tailing_cursor = command.get("getMore") if command.get("getMore") in self._tailing_cursors else None
+            else:
+                tailing_cursor = 0 if opens_tailing_cursor(event.command_name, command) else None
+            self._started[(event.connection_id, event.request_id)] = (
+                collection, command_filter(event.command_name, command), tailing_cursor
+            )
+
+    def _track_cursor(self, event, tailing_cursor: Optional[int], failed: bool):
+        """Remember the ids of the tailing cursors while they are open (called with the lock held)."""
+        reply = {} if failed else event.reply
+        if event.command_name == "killCursors":
+            self._tailing_cursors.difference_update(reply.get("cursorsKilled") or [])
+        elif tailing_cursor is not None:
+            # The server returns the id 0 once a cursor is exhausted or closed.
+            cursor_id = (reply.get("cursor") or {}).get("id")
+            if cursor_id:
+                self._tailing_cursors.add(cursor_id)
+            else:
+                self._tailing_cursors.discard(tailing_cursor)
+
+    def _finished(self, event, failed: bool):
+        with self._lock:
+            collection, query, tailing_cursor = self._started.pop((event.connection_id, event.request_id), ("-", None, None))
+            self._track_cursor(event, tailing_cursor, failed)
+        duration_ms = event.duration_micros / 1000
+        request = current_request.get()
+        route = request.route if request is not None else BACKGROUND_ROUTE
+
+        key = (route, collection, event.command_name)
+        # How long a getMore on a tailing cursor takes is the server's await time, not its cost.
+        awaited = event.command_name == "getMore" and tailing_cursor is not None
+        with self._lock:
+            if request is not None:
+                request.count += 1
+                request.duration_ms += duration_ms
+            self.commands[key] = self.commands.get(key, 0) + 1
+            if failed:
+                self.failures[key] = self.failures.get(key, 0) + 1
+            if not awaited:
+                self.duration.observe(key, duration_ms / 1000)
+
+        if duration_ms >= SLOW_COMMAND_MS and not awaited:
+            logger.warning(
+                f"Slow MongoDB {event.command_name} on '{collection}' took {duration_ms:.1f} ms "
+                f"({route}), filter: {filter_shape(query) if query is not None else None}"
+            )
+
+    def succeeded(self, event):
+        self._finished(event, failed=False)
+
+    def failed(self, event):
+        self._finished(event, failed=True)
+
+    def collect(self, lines: List[str]):
+        """Append the command metrics to the /metrics output."""
+        labels = ("route", "collection", "command")
+        with self._lock:
+            metrics.render_counter(
+                lines, "mongodb_commands_total", "MongoDB commands, by route, collection and command.",
+                self.commands, labels,
+            )
+            metrics.render_counter(
+                lines, "mongodb_command_failures_total", "Failed MongoDB commands, by route, collection and command.",
+                self.failures, labels,
+            )
+            metrics.render_histogram(
+                lines, "mongodb_command_duration_seconds", "MongoDB command round trip time, by route, collection and command.",
+                self.duration, labels,
+            )
+
+
+command_monitor = CommandMonitor()
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware exposing the request's MongoDB time to the client, e.g.
+    ``Server-Timing: db;dur=12.4;desc="5 commands"``, and making the request
+    available to CommandMonitor.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestCommands(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={request.duration_ms:.1f};desc="{request.count} commands"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        token = current_request.set(request)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
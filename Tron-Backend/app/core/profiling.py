@@ -0,0 +1,131 @@
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Profiling is only wired in when a secret is set; without it requests are untouched.
+SECRET = os.getenv("PROFILE_SECRET")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+HEADER = b"x-profile"
+# Longest validity accepted for a token, so a leaked one does not work forever.
+MAX_TOKEN_SECONDS = 24 * 3600
+
+
+def sign(expires: int, secret: Optional[str] = None) -> str:
+    """
+    Return an ``X-Profile`` token valid until ``expires`` (a Unix timestamp).
+
+    Args:
+        expires (int): Unix time after which the token is refused.
+        secret (str | None): The signing secret, PROFILE_SECRET by default.
+
+    Returns:
+        str: ``<expires>.<HMAC-SHA256 of expires>``.
+    """
+    signature = hmac.new((secret or SECRET).encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def verify(token: str) -> bool:
+    """Return whether an ``X-Profile`` token is correctly signed and not expired."""
+    expires, _, _ = token.partition(".")
+    # Not str.isdigit(), which accepts digits int() refuses (e.g. superscripts).
+    if not re.fullmatch(r"[0-9]+", expires):
+        return False
+    now = time.time()
+    if not now < int(expires) <= now + MAX_TOKEN_SECONDS:
+        return False
+    return hmac.compare_digest(sign(int(expires)), token)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand, with cProfile.
+
+    A request carrying a valid ``X-Profile`` token (see ``sign``) is profiled and its
+    stats are written to PROFILE_DIR as a ``.prof`` file (open it with snakeviz,
+    ``python -m pstats`` or convert it to a flame graph); the response names the file
+    in ``X-Profile-File``. Every other request only pays for the header lookup.
+
+    The profile covers the event loop thread while the request is served, so
+    requests running concurrently on the worker show up in it too; one request is
+    profiled at a time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = next((value for name, value in scope["headers"] if name == HEADER), None)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not verify(token.decode("latin-1")):
+            logger.warning(f"Refused profiling {scope['method']} {scope['path']}: invalid or expired X-Profile token.")
+            await self.app(scope, receive, send)
+            return
+
+        if self._busy:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-status", b"busy"))
+            return
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{scope['method']}-{slug[:80]}.prof"
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-file", filename.encode()))
+        finally:
+            profiler.disable()
+            self._busy = False
+            path = os.path.join(PROFILE_DIR, filename)
+            try:
+                await asyncio.to_thread(self._dump, profiler, path)
+            except OSError as e:
+                # Failing to save the profile must not replace the request's own outcome.
+                logger.error(f"Could not write the profile of {scope['method']} {scope['path']} to {path}: {str(e)}")
+            else:
+                logger.info(f"Profiled {scope['method']} {scope['path']} to {path}")
+
+    @staticmethod
+    def _dump(profiler: cProfile.Profile, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (name, value)]
+            await send(message)
+        return send_wrapper
+
+
+if __name__ == "__main__":
+    # python -m app.core.profiling [seconds]: print an X-Profile token valid for that long.
+    if not SECRET:
+        sys.exit("PROFILE_SECRET is not set.")
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    print(sign(int(time.time()) + min(seconds, MAX_TOKEN_SECONDS)))
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(value: Any) -> Any:
+    # Pydantic models are encoded from their field values directly, without a
+    # model_dump pass; orjson then handles datetimes, lists and dicts natively.
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` to JSON bytes with orjson."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson, the app's default response class.
+
+    Endpoints returning a model still go through FastAPI's ``jsonable_encoder``
+    before it is encoded. Returned directly from an endpoint, the content skips
+    that pass, which is where most of the time of large responses goes; models
+    built by the ``serialize_trusted`` helpers are then encoded as they are.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
\ No newline at end of file
@@ -1,11 +1,50 @@
 import os
+from typing import Optional
+
 from dotenv import load_dotenv
 
 from tronpy import Tron
-# from tronpy.keys import PrivateKey
+from tronpy.contract import Contract
+from tronpy.keys import PrivateKey
 
 load_dotenv()
 
-client = Tron(network='nile')
-contract = client.get_contract(os.getenv("CONTRACT_ADDRESS"))
-# PRIVATE_KEY = PrivateKey(bytes.fromhex(os.getenv("PRIVATE_KEY_STRING")))
\ No newline at end of file
+TRON_NETWORK = os.getenv("TRON_NETWORK", "nile")
+
+_client: Optional[Tron] = None
+_contract: Optional[Contract] = None
+_private_key: Optional[PrivateKey] = None
+
+def get_client() -> Tron:
+    """Return the Tron client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = Tron(network=TRON_NETWORK)
+    return _client
+
+def get_contract() -> Contract:
+    """
+    Return the NFT contract, fetching its ABI from the node on first use.
+
+    This is a blocking network call; call it through ``asyncio.to_thread`` from
+    coroutines (the app lifespan does so once at startup to warm it up).
+    """
+    global _contract
+    if _contract is None:
+        _contract = get_client().get_contract(os.getenv("CONTRACT_ADDRESS"))
+    return _contract
+
+def close_client():
+    """Close the HTTP session of the Tron client, if it was ever created."""
+    global _client, _contract
+    if _client is not None:
+        _client.provider.sess.close()
+    _client = None
+    _contract = None
+
+def get_private_key() -> Optional[PrivateKey]:
+    """Return the key signing the contract's mint transactions, or None if PRIVATE_KEY_STRING is not set."""
+    global _private_key
+    if _private_key is None and os.getenv("PRIVATE_KEY_STRING"):
+        _private_key = PrivateKey(bytes.fromhex(os.getenv("PRIVATE_KEY_STRING")))
+    return _private_key
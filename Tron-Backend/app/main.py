@@ -3,15 +3,23 @@
 # pip install -r requirements.txt
 # uvicorn app.main:app --reload
 
+import asyncio
 import logging
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from .api.v1 import v1
-from .core.database import client
+from .core import database, indexes, metrics, profiling, tron
+from .core.monitoring import ServerTimingMiddleware, command_monitor, pool_monitor
+from .core.responses import ORJSONResponse
+from .services import cache_invalidation_service, mint_service, nft_indexer_service, password_service, verification_service
+from .services.cache_service import game_cache
+from .services.nft_service import owner_cache
+from .services.singleflight_service import flight
 
 # Load environment variables from .env file securely
 load_dotenv()
@@ -20,6 +28,54 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def warm_up():
+    """
+    Ensure the registered indexes exist, which also opens the first pooled connections
+    and loads the index metadata, so the first requests after a deploy do not pay for
+    the connection handshakes. A unique index that cannot be created fails startup.
+    """
+    await indexes.ensure_indexes()
+
+    try:
+        # Fetching the contract ABI is blocking network I/O, keep it off the event loop.
+        await asyncio.to_thread(tron.get_contract)
+    except Exception as e:
+        # Not fatal: the contract is fetched again on first use.
+        logger.warning(f"Could not load the NFT contract at startup: {str(e)}")
+
+@asynccontextmanager
+async def startup_event(app: FastAPI):
+    """
+    Application lifespan. Creates the MongoDB and Tron clients, checks the database
+    is reachable and warms up connections on startup, then stops background tasks
+    and closes the client pools on shutdown.
+    """
+    try:
+        await database.get_client().admin.command("ping")
+        logger.info("Successfully connected to the database.")
+    except Exception as e:
+        logger.error(f"Error connecting to the database: {str(e)}")
+        raise RuntimeError("Failed to connect to the database.")
+
+    await warm_up()
+
+    # Keep this worker's caches in sync with writes made by every other worker.
+    cache_invalidation_service.start()
+    verification_service.start()
+    nft_indexer_service.start()
+    mint_service.start()
+
+    yield
+
+    await mint_service.stop()
+    await nft_indexer_service.stop()
+    await verification_service.stop()
+    await cache_invalidation_service.stop()
+    password_service.shutdown()
+    database.close_client()
+    tron.close_client()
+    logger.info("Closed database and Tron clients.")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Mintyplay API",
@@ -28,7 +84,10 @@ app = FastAPI(
     contact={
         "name": "",
     },
-    license_info={}
+    license_info={},
+    lifespan=startup_event,
+    # Responses are encoded with orjson, which handles datetimes and ObjectIds natively.
+    default_response_class=ORJSONResponse,
 )
 
 origins = [
@@ -46,20 +105,6 @@ origins = [
 app.include_router(v1.router)
 
 
-@asynccontextmanager
-async def startup_event():
-    """
-    Event triggered on application startup. Use this for initializing resources like
-    database connections, logging systems, or checking service health status.
-    """
-    try:
-        # Example: Checking MongoDB connection at startup
-        await client.admin.command("ping")
-        logger.info("Successfully connected to the database.")
-    except Exception as e:
-        logger.error(f"Error connecting to the database: {str(e)}")
-        raise RuntimeError("Failed to connect to the database.")
-
 @app.get("/", summary="Root Endpoint", tags=["Root"])
 def root():
     """
@@ -70,6 +115,22 @@ def root():
     """
     return {"details": "This is the root. Check /docs for interactive documentation."}
 
+metrics.register_collector(command_monitor.collect)
+metrics.register_stats("mongodb_pool", pool_monitor.stats)
+metrics.register_stats("game_cache", game_cache.stats)
+metrics.register_stats("owner_cache", owner_cache.stats)
+metrics.register_stats("transaction_cache", verification_service.transaction_cache.stats)
+metrics.register_stats("singleflight", flight.stats)
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(metrics.verify_metrics_key)])
+def get_metrics():
+    """
+    Request, MongoDB command, pool and cache metrics of this worker, in the Prometheus text format.
+
+    Only the worker answering is reported: scrape one worker per port (see HTTPMetrics).
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -78,3 +139,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Attributes MongoDB commands to the request and reports their time in Server-Timing.
+app.add_middleware(ServerTimingMiddleware)
+
+if profiling.SECRET:
+    # Profiles the requests carrying a signed X-Profile header; absent otherwise.
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+if metrics.ENABLED:
+    # Added last so it wraps every other middleware and times the whole request.
+    app.add_middleware(metrics.MetricsMiddleware)
@@ -0,0 +1,10 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Documents read back from our own database were validated when they were written:
+# the ``serialize_trusted`` helpers build their response models without validating
+# them again. Set TRUSTED_READS=false to validate every document read.
+TRUSTED_READS = os.getenv("TRUSTED_READS", "true").lower() in ("1", "true", "yes")
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 
 from ..schemas import bounty_schema
+from . import TRUSTED_READS
 
 def serialize(bounty_detail: Dict[str, Any]) -> bounty_schema.ResponseBountyModel:
     """
@@ -19,4 +20,22 @@ def serialize(bounty_detail: Dict[str, Any]) -> bounty_schema.ResponseBountyMode
         description = bounty_detail["description"],
         createdAt = bounty_detail["createdAt"],
         updatedAt = bounty_detail["updatedAt"],
+    )
+
+def serialize_trusted(bounty_detail: Dict[str, Any]) -> bounty_schema.ResponseBountyModel:
+    """
+    Build a ResponseBountyModel from a MongoDB document without validating it again.
+
+    Falls back to ``serialize`` when TRUSTED_READS is off.
+    """
+    if not TRUSTED_READS:
+        return serialize(bounty_detail)
+
+    return bounty_schema.ResponseBountyModel.model_construct(
+        gameId=bounty_detail["gameId"],
+        bountyId=str(bounty_detail["_id"]),
+        name=bounty_detail["name"],
+        description=bounty_detail["description"],
+        createdAt=bounty_detail["createdAt"],
+        updatedAt=bounty_detail["updatedAt"],
     )
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 
 from ..schemas import game_schema
+from . import TRUSTED_READS
 
 def serialize(game_detail: Dict[str, Any]) -> game_schema.ResponseGameModel:
     """
@@ -28,4 +29,42 @@ def serialize(game_detail: Dict[str, Any]) -> game_schema.ResponseGameModel:
         createdAt=game_detail.get("createdAt"),
         updatedAt=game_detail.get("updatedAt"),
         reviews=game_detail.get("reviews", [])  # Default to an empty list if key is missing
+    )
+
+def _construct_all(model, values):
+    return [model.model_construct(**value) for value in values] if values is not None else None
+
+def serialize_trusted(game_detail: Dict[str, Any]) -> game_schema.ResponseGameModel:
+    """
+    Build a ResponseGameModel from a MongoDB document without validating it again.
+
+    Falls back to ``serialize`` when TRUSTED_READS is off.
+
+    Args:
+        game_detail (dict): The MongoDB document representing the game, as stored by this API.
+
+    Returns:
+        ResponseGameModel: A Pydantic model instance of the game data.
+    """
+    if not TRUSTED_READS:
+        return serialize(game_detail)
+
+    system_requirements = game_detail.get("systemRequirements")
+    developer_data = game_detail.get("developerData")
+    return game_schema.ResponseGameModel.model_construct(
+        game_id=str(game_detail["_id"]),
+        id=game_detail["id"],
+        title=game_detail.get("title"),
+        price=game_detail.get("price"),
+        genre=game_detail.get("genre"),
+        description=game_detail.get("description"),
+        nftRewards=_construct_all(game_schema.Reward, game_detail.get("nftRewards", [])),
+        images=game_detail.get("images", []),
+        tags=game_detail.get("tags", []),
+        rating=game_detail.get("rating"),
+        systemRequirements=game_schema.SystemRequirements.model_construct(**system_requirements) if system_requirements else None,
+        developerData=game_schema.DeveloperData.model_construct(**developer_data) if developer_data else None,
+        createdAt=game_detail.get("createdAt"),
+        updatedAt=game_detail.get("updatedAt"),
+        reviews=_construct_all(game_schema.Review, game_detail.get("reviews", [])),
     )
\ No newline at end of file
@@ -0,0 +1,29 @@
+from typing import Dict, Any
+
+from ..schemas import nft_schema
+
+def serialize(mintjob_detail: Dict[str, Any]) -> nft_schema.ResponseMintJob:
+    """
+    Serialize a MongoDB document into a ResponseMintJob instance.
+
+    Args:
+        mintjob_detail (dict): The MongoDB document representing the mint job.
+
+    Returns:
+        ResponseMintJob: A Pydantic model instance of the mint job data.
+    """
+    return nft_schema.ResponseMintJob(
+        job_id=str(mintjob_detail["_id"]),
+        gameId=mintjob_detail["gameId"],
+        bountyId=mintjob_detail["bountyId"],
+        nftId=mintjob_detail["nftId"],
+        uri=mintjob_detail.get("uri"),
+        wallet=mintjob_detail["wallet"],
+        status=mintjob_detail["status"],
+        attempts=mintjob_detail.get("attempts", 0),
+        transaction_id=mintjob_detail.get("transaction_id"),
+        detail=mintjob_detail.get("detail"),
+        nextAttemptAt=mintjob_detail.get("nextAttemptAt"),
+        createdAt=mintjob_detail.get("createdAt"),
+        updatedAt=mintjob_detail.get("updatedAt"),
+    )
\ No newline at end of file
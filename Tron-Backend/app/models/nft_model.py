@@ -1,6 +1,7 @@
 from typing import Dict, Any
 
 from ..schemas import nft_schema
+from . import TRUSTED_READS
 
 def serialize(nft_detail: Dict[str, Any]) -> nft_schema.ResponseNFTModel:
     """
@@ -21,4 +22,24 @@ def serialize(nft_detail: Dict[str, Any]) -> nft_schema.ResponseNFTModel:
         uri=nft_detail["uri"],
         createdAt=nft_detail["createdAt"],
         updatedAt=nft_detail["updatedAt"],
+    )
+
+def serialize_trusted(nft_detail: Dict[str, Any]) -> nft_schema.ResponseNFTModel:
+    """
+    Build a ResponseNFTModel from a MongoDB document without validating it again.
+
+    Falls back to ``serialize`` when TRUSTED_READS is off.
+    """
+    if not TRUSTED_READS:
+        return serialize(nft_detail)
+
+    return nft_schema.ResponseNFTModel.model_construct(
+        gameId=nft_detail["gameId"],
+        bountyId=nft_detail["bountyId"],
+        nftId=str(nft_detail["_id"]),
+        name=nft_detail["name"],
+        description=nft_detail["description"],
+        uri=nft_detail["uri"],
+        createdAt=nft_detail["createdAt"],
+        updatedAt=nft_detail["updatedAt"],
     )
\ No newline at end of file
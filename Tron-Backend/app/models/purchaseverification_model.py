@@ -0,0 +1,26 @@
+from typing import Dict, Any
+
+from ..schemas import purchase_schema
+
+def serialize(verification_detail: Dict[str, Any]) -> purchase_schema.ResponsePurchaseVerification:
+    """
+    Serialize a MongoDB document into a ResponsePurchaseVerification instance.
+
+    Args:
+        verification_detail (dict): The MongoDB document representing the purchase verification.
+
+    Returns:
+        ResponsePurchaseVerification: A Pydantic model instance of the verification data.
+    """
+    return purchase_schema.ResponsePurchaseVerification(
+        verification_id=str(verification_detail["_id"]),
+        user_id=verification_detail["user_id"],
+        order_id=verification_detail["order_id"],
+        transaction_id=verification_detail["transaction_id"],
+        status=verification_detail["status"],
+        attempts=verification_detail.get("attempts", 0),
+        detail=verification_detail.get("detail"),
+        verifiedpurchase_id=verification_detail.get("verifiedpurchase_id"),
+        createdAt=verification_detail.get("createdAt"),
+        updatedAt=verification_detail.get("updatedAt"),
+    )
\ No newline at end of file
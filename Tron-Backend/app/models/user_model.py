@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 from ..schemas import user_schema
+from . import TRUSTED_READS, game_model
 
 def serialize(user_detail: Dict) -> user_schema.UserResponse:
     games = []
@@ -34,6 +35,7 @@ def serialize(user_detail: Dict) -> user_schema.UserResponse:
         user_id=str(user_detail["_id"]),
         username=user_detail["username"],
         email=user_detail["email"],
+        wallet_address=user_detail.get("wallet_address"),
         bio=user_detail.get("bio", None),
         nfts=nfts,
         achievements=achievements,
@@ -41,3 +43,55 @@ def serialize(user_detail: Dict) -> user_schema.UserResponse:
         date_joined=str(user_detail["date_joined"]),
         games=games
     )
+
+def serialize_trusted(user_detail: Dict) -> user_schema.UserResponse:
+    """
+    Build a UserResponse from a MongoDB document without validating it again.
+
+    Falls back to ``serialize`` when TRUSTED_READS is off.
+    """
+    if not TRUSTED_READS:
+        return serialize(user_detail)
+
+    return user_schema.UserResponse.model_construct(
+        user_id=str(user_detail["_id"]),
+        username=user_detail["username"],
+        email=user_detail["email"],
+        wallet_address=user_detail.get("wallet_address"),
+        bio=user_detail.get("bio", None),
+        nfts=[user_schema.NFT.model_construct(**nft) for nft in user_detail.get("nfts") or []],
+        achievements=[user_schema.Achievement.model_construct(**achievement) for achievement in user_detail.get("achievements") or []],
+        is_active=user_detail["is_active"],
+        date_joined=user_detail["date_joined"],
+        games=[game_id for game_id in user_detail.get("games") or [] if isinstance(game_id, str)]
+    )
+
+def serialize_nfts(nfts: List[Dict]) -> user_schema.ResponseUserNFTCollection:
+    """
+    Build a ResponseUserNFTCollection from a user's ``nfts`` entries.
+
+    The entries are validated again only when TRUSTED_READS is off.
+    """
+    if not TRUSTED_READS:
+        return user_schema.ResponseUserNFTCollection(nfts=[user_schema.NFT(**nft) for nft in nfts])
+
+    return user_schema.ResponseUserNFTCollection.model_construct(
+        nfts=[user_schema.NFT.model_construct(**nft) for nft in nfts]
+    )
+
+def serialize_library_game(game_detail: Dict) -> user_schema.ResponseLibraryGameModel:
+    """
+    Build a ResponseLibraryGameModel from a game document carrying the user's NFTs
+    from it in ``nfts`` (see user_service.get_purchased_games).
+    """
+    game = game_model.serialize_trusted(game_detail)
+    if not TRUSTED_READS:
+        return user_schema.ResponseLibraryGameModel(
+            **dict(game),
+            nfts=[user_schema.NFT(**nft) for nft in game_detail.get("nfts") or []]
+        )
+
+    return user_schema.ResponseLibraryGameModel.model_construct(
+        **dict(game),
+        nfts=[user_schema.NFT.model_construct(**nft) for nft in game_detail.get("nfts") or []]
+    )
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import Dict, Any
+
+from ..schemas import verifiedpurchase_schema
+
+def serialize(verifiedpurchase_detail: Dict[str, Any]) -> verifiedpurchase_schema.RespondVerifiedPurchase:
+    """
+    Serialize a MongoDB document into a RespondVerifiedPurchase instance.
+
+    Args:
+        verifiedpurchase_detail (dict): The MongoDB document representing the verified purchase.
+
+    Returns:
+        RespondVerifiedPurchase: A Pydantic model instance of the verified purchase data.
+    """
+    return verifiedpurchase_schema.RespondVerifiedPurchase(
+        verifiedpurchase_id=str(verifiedpurchase_detail["_id"]),
+        order_data=verifiedpurchase_detail.get("order_data"),
+        purchase_time=verifiedpurchase_detail.get("purchase_time"),
+        verification_status=verifiedpurchase_detail.get("verification_status"),
+        verification_method=verifiedpurchase_detail.get("verification_method"),
+        verified_by=verifiedpurchase_detail.get("verified_by"),
+        verified_time=verifiedpurchase_detail.get("verified_time"),
+        transaction_id=verifiedpurchase_detail.get("transaction_id"),
+    )
\ No newline at end of file
@@ -2,11 +2,23 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
 
+from .nft_schema import ResponseNFTModel
+
 class BountyModel(BaseModel):
     gameId: str
     name: str
     description: str
 
+class UpdateBountyModel(BaseModel):
+    # Every field may be left out, but not sent as null.
+    gameId: str = None
+    name: str = None
+    description: str = None
+
+class BulkBountyModel(BaseModel):
+    name: str
+    description: str
+
 class CreateBountyModel(BountyModel):
     createdAt: Optional[datetime]
     updatedAt: Optional[datetime]
@@ -22,4 +34,11 @@ class ResponseCreateBountyModel(BaseModel):
     updatedAt: Optional[datetime]
 
 class ResponseBountyModelCollection(BaseModel):
-    bounties: List[ResponseBountyModel]
\ No newline at end of file
+    bounties: List[ResponseBountyModel]
+
+class ResponseBountyRewardModel(ResponseBountyModel):
+    nfts: List[ResponseNFTModel]
+
+class ResponseGameRewardCollection(BaseModel):
+    gameId: str
+    bounties: List[ResponseBountyRewardModel]
\ No newline at end of file
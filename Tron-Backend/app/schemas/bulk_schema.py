@@ -0,0 +1,14 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+class ResponseBulkWrite(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
\ No newline at end of file
@@ -37,6 +37,13 @@ class GameModel(BaseModel):
     systemRequirements: Optional[SystemRequirements] = None
     developerData: Optional[DeveloperData] = None
 
+class UpdateGameModel(GameModel):
+    id: Optional[str] = None
+
+class BulkGameModel(GameModel):
+    # Bulk writes upsert on the game's id.
+    id: str
+
 class CreateGameModel(GameModel):
     createdAt: Optional[datetime]
     updatedAt: Optional[datetime]
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class NFTModel(BaseModel):
     gameId: str
@@ -9,6 +9,19 @@ class NFTModel(BaseModel):
     description: Optional[str] = None
     uri: Optional[str] = None
 
+class UpdateNFTModel(BaseModel):
+    # Every field may be left out; gameId, bountyId and name cannot be sent as null.
+    gameId: str = None
+    bountyId: str = None
+    name: str = None
+    description: Optional[str] = None
+    uri: Optional[str] = None
+
+class BulkNFTModel(BaseModel):
+    name: str
+    description: Optional[str] = None
+    uri: Optional[str] = None
+
 class CreateNFTModel(NFTModel):
     createdAt: Optional[datetime]
     updatedAt: Optional[datetime]
@@ -24,4 +37,47 @@ class ResponseCreateNFTModel(BaseModel):
     updatedAt: Optional[datetime]
 
 class ResponseNFTModelCollection(BaseModel):
-    nfts: List[ResponseNFTModel]
\ No newline at end of file
+    nfts: List[ResponseNFTModel]
+
+class NFTOwnersRequest(BaseModel):
+    tokenIds: List[int] = Field(..., min_length=1, max_length=100)
+
+class NFTOwner(BaseModel):
+    tokenId: int
+    owner: Optional[str] = None
+    error: Optional[str] = None
+
+class ResponseNFTOwnerCollection(BaseModel):
+    blockNumber: Optional[int] = None
+    owners: List[NFTOwner]
+
+class ResponseOwnedNFTCollection(BaseModel):
+    owner: str
+    blockNumber: Optional[int] = None
+    tokenIds: List[int]
+
+class CreateMint(BaseModel):
+    gameId: str
+    bountyId: str
+    nftId: str
+    wallets: List[str] = Field(..., min_length=1, max_length=1000)
+
+class DatabaseMintJob(BaseModel):
+    gameId: str
+    bountyId: str
+    nftId: str
+    uri: Optional[str] = None
+    wallet: str
+    status: str
+    attempts: int = 0
+    transaction_id: Optional[str] = None
+    detail: Optional[str] = None
+    nextAttemptAt: Optional[datetime] = None
+    createdAt: Optional[datetime]
+    updatedAt: Optional[datetime]
+
+class ResponseMintJob(DatabaseMintJob):
+    job_id: str
+
+class ResponseMintJobCollection(BaseModel):
+    jobs: List[ResponseMintJob]
\ No newline at end of file
@@ -12,6 +12,15 @@ class CreateOrderItem(BaseOrderItem):
 class RespondOrderItemCreate(BaseOrderItem):
     price: float
 
+class OrderItemPriceError(BaseModel):
+    game_id: str
+    status_code: int
+    detail: str
+
+class ResponseOrderItemPriceCollection(BaseModel):
+    items: List[RespondOrderItemCreate]
+    errors: List[OrderItemPriceError]
+
 class CreateOrderItemCollection(BaseModel):
     user_id: Optional[str] = None
     OrderItemCollection: Optional[List[CreateOrderItem]] = None
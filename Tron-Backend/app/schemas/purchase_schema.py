@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 class BasePurchase(BaseModel):
     user_id: str
@@ -8,3 +9,14 @@ class BasePurchase(BaseModel):
 
 class CreatePurchase(BasePurchase):
     pass
+
+class DatabasePurchaseVerification(BasePurchase):
+    status: str
+    attempts: int = 0
+    detail: Optional[str] = None
+    verifiedpurchase_id: Optional[str] = None
+    createdAt: Optional[datetime]
+    updatedAt: Optional[datetime]
+
+class ResponsePurchaseVerification(DatabasePurchaseVerification):
+    verification_id: str
@@ -8,4 +8,5 @@ class ResponseModel(BaseModel):
     data: Optional[Any] = None
     timestamp: datetime = None
 
-
+class PaginatedResponseModel(ResponseModel):
+    next_cursor: Optional[str] = None
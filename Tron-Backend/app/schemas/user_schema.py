@@ -2,7 +2,7 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 from .orderitem_schema import ResponseCreateOrderItemCollection
-from .game_schema import GameModelCollection
+from .game_schema import GameModelCollection, ResponseGameModel
 
 class UserBase(BaseModel):
     """
@@ -11,6 +11,8 @@ class UserBase(BaseModel):
     username: str
     email: EmailStr
     password: str
+    # TRON wallet the user pays from, checked against the sender of purchase transactions.
+    wallet_address: Optional[str] = None
 
 
 class UserCreate(UserBase):
@@ -19,6 +21,13 @@ class UserCreate(UserBase):
     """
     pass
 
+class UserLogin(BaseModel):
+    """
+    Schema for logging a user in.
+    """
+    email: EmailStr
+    password: str
+
 class NFT(BaseModel):
     id: int
     name: str
@@ -50,10 +59,22 @@ class UserResponse(BaseModel):
     user_id: str
     username: str
     email: EmailStr
+    wallet_address: Optional[str] = None
     bio: Optional[str] = None
     nfts: Optional[List[NFT]] = []
     achievements: Optional[List[Achievement]] = []
     is_active: bool
     date_joined: datetime
     games: Optional[List[str]]
-    
+
+class ResponseLibraryGameModel(ResponseGameModel):
+    """
+    A purchased game with the user's NFTs from it.
+    """
+    nfts: Optional[List[NFT]] = []
+
+class ResponseLibraryCollection(BaseModel):
+    games: List[ResponseLibraryGameModel]
+
+class ResponseUserNFTCollection(BaseModel):
+    nfts: List[NFT]
@@ -10,6 +10,7 @@ class DatabaseVerifiedPurchase(BaseModel):
     verification_method: Optional[str] = "Automated"
     verified_by: Optional[str]
     verified_time: Optional[datetime]
+    transaction_id: Optional[str] = None
 
 class RespondVerifiedPurchase(DatabaseVerifiedPurchase):
     verifiedpurchase_id: str
\ No newline at end of file
@@ -1,20 +1,31 @@
+import os
+from typing import Any, List, Optional
 from bson import ObjectId
 from datetime import datetime
 
+from dotenv import load_dotenv
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from ..core.database import bounty_collection
 from ..schemas import bounty_schema
-from ..models import bounty_model
+from ..models import bounty_model, nft_model
+from . import bulk_service, cache_invalidation_service
+from .cache_service import game_cache
+from .singleflight_service import flight
+
+load_dotenv()
+
+# Serve the bounty -> NFT reward tree of a game from game_cache.
+REWARDS_CACHE_ENABLED = os.getenv("GAME_REWARDS_CACHE", "true").lower() in ("1", "true", "yes")
 
 async def get_all_bounties(gameId: str):
     """
     Fetches a list of all available bounties in a game with basic metadata.
     """
-    query = {"gameId": gameId}
-    cursor = bounty_collection.find(query)
-    
-    bounties_list = [bounty_model.serialize(bounty) async for bounty in cursor]
+    bounties_list = await flight.do(("bounties", gameId), lambda: _load_bounties(gameId))
     
     if bounties_list:
         return bounty_schema.ResponseBountyModelCollection(
@@ -26,6 +37,78 @@ async def get_all_bounties(gameId: str):
             detail="No bounties found for the specified game."
         )
 
+async def _load_bounties(gameId: str):
+    """Query and serialize every bounty of a game (shared by concurrent callers)."""
+    query = {"gameId": gameId}
+    cursor = bounty_collection.find(query)
+    return [bounty_model.serialize_trusted(bounty) async for bounty in cursor]
+
+async def get_game_rewards(gameId: str):
+    """
+    Fetches every bounty of a game together with its NFT rewards.
+
+    One aggregation joins the bounties with their NFTs, instead of one NFT query
+    per bounty.
+    """
+    cache_key = ("rewards", gameId)
+    if REWARDS_CACHE_ENABLED:
+        cached = game_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    generation = game_cache.generation(cache_key)
+
+    bounties_list = await flight.do(cache_key, lambda: _load_rewards(gameId))
+    if not bounties_list:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No bounties found for the specified game."
+        )
+
+    rewards = bounty_schema.ResponseGameRewardCollection(
+        gameId=gameId,
+        bounties=bounties_list
+    )
+    if REWARDS_CACHE_ENABLED:
+        game_cache.set(cache_key, rewards, generation=generation)
+    return rewards
+
+async def _load_rewards(gameId: str):
+    """Query and serialize the bounties of a game with their NFTs (shared by concurrent callers)."""
+    pipeline = [
+        {"$match": {"gameId": gameId}},
+        {"$lookup": {
+            "from": "nft",
+            # NFTs reference their bounty by the string form of its _id.
+            "let": {"bountyId": {"$toString": "$_id"}},
+            "pipeline": [
+                {"$match": {"gameId": gameId, "$expr": {"$eq": ["$bountyId", "$$bountyId"]}}},
+            ],
+            "as": "nfts",
+        }},
+    ]
+    cursor = bounty_collection.aggregate(pipeline)
+    return [
+        bounty_schema.ResponseBountyRewardModel.model_construct(
+            **dict(bounty_model.serialize_trusted(bounty)),
+            nfts=[nft_model.serialize_trusted(nft) for nft in bounty["nfts"]]
+        )
+        async for bounty in cursor
+    ]
+
+def invalidate_rewards_cache(document_id: Optional[str] = None):
+    """
+    Drop every cached reward tree.
+
+    Change events of deleted bounties and NFTs only carry their ``_id``, not the game
+    they belonged to, so the whole namespace is dropped.
+    """
+    game_cache.invalidate_namespace("rewards")
+    flight.forget_namespace("rewards")
+    flight.forget_namespace("bounties")
+
+# A reward tree is stale as soon as one of its bounties or NFTs changes, in any worker.
+cache_invalidation_service.register_invalidator("bounty", invalidate_rewards_cache)
+cache_invalidation_service.register_invalidator("nft", invalidate_rewards_cache)
 
 async def get_bounty(gameId: str, bountyId: str):
     """
@@ -37,10 +120,8 @@ async def get_bounty(gameId: str, bountyId: str):
     }
     bounty = await bounty_collection.find_one(query)
 
-    print(bounty)
-    
     if bounty:
-        return bounty_model.serialize(bounty)
+        return bounty_model.serialize_trusted(bounty)
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,12 +145,18 @@ async def create_bounty(gameId: str, request: bounty_schema.BountyModel):
 
     try:
         result = await bounty_collection.insert_one(bounty_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bounty named '{request.name}' already exists in game {gameId}."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while creating the bounty: {str(e)}"
         )
 
+    invalidate_rewards_cache()
     bounty_id = str(result.inserted_id)
 
     return bounty_schema.ResponseCreateBountyModel(
@@ -78,33 +165,73 @@ async def create_bounty(gameId: str, request: bounty_schema.BountyModel):
         updatedAt=create_bounty_data.updatedAt
     )
 
-async def update_bounty(gameId: str, bountyId: str, request: bounty_schema.BountyModel):
+_bulk_bounties_adapter = TypeAdapter(List[bounty_schema.BulkBountyModel])
+
+async def bulk_upsert_bounties(gameId: str, items: List[Any]):
+    """
+    Service function to create or update many bounties of a game at once, matched on their name.
+
+    Args:
+        gameId (str): The unique ID of the game the bounties belong to.
+        items (list): The raw bounty objects of the request.
+
+    Returns:
+        ResponseBulkWrite: The created/updated/failed counts and one result per item.
+    """
+    valid, invalid = bulk_service.validate_items(_bulk_bounties_adapter, items)
+    current_time = datetime.now()
+    upserts = [
+        (
+            index,
+            {"gameId": gameId, "name": bounty.name},
+            {
+                "$set": {**bounty.model_dump(), "updatedAt": current_time},
+                "$setOnInsert": {"createdAt": current_time},
+            },
+        )
+        for index, bounty in valid
+    ]
+    result = await bulk_service.bulk_upsert(bounty_collection, upserts, ["gameId", "name"], invalid)
+    invalidate_rewards_cache()
+    return result
+
+async def update_bounty(gameId: str, bountyId: str, request: bounty_schema.UpdateBountyModel):
     """
     Service function to update an existing bounty's data in the database.
 
+    Only the fields present in the request are changed, and the updated bounty is
+    returned by the update itself instead of a second read.
+
     Args:
         gameId (str): The unique ID of the game the bounty belongs to.
         bountyId (str): The unique ID of the bounty to update.
-        request (BountyModel): The new bounty data to update.
+        request (UpdateBountyModel): The bounty fields to update.
 
     Returns:
         dict: The newly updated bounty data.
     """
-    bounty_dict = request.model_dump()
+    bounty_dict = request.model_dump(exclude_unset=True)
     bounty_dict["updatedAt"] = datetime.now()
-    update_result = await bounty_collection.update_one(
-        {"gameId": gameId, "_id": ObjectId(bountyId)},
-        {"$set": bounty_dict}
-    )
+    try:
+        updated_bounty = await bounty_collection.find_one_and_update(
+            {"gameId": gameId, "_id": ObjectId(bountyId)},
+            {"$set": bounty_dict},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bounty named '{bounty_dict.get('name')}' already exists in game {gameId}."
+        )
 
-    if update_result.matched_count == 0:
+    if updated_bounty is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bounty with ID {bountyId} not found in game {gameId}."
         )
 
-    updated_bounty = await get_bounty(gameId, bountyId)
-    return updated_bounty
+    invalidate_rewards_cache()
+    return bounty_model.serialize(updated_bounty)
 
 
 async def delete_bounty(gameId: str, bountyId: str):
@@ -128,5 +255,6 @@ async def delete_bounty(gameId: str, bountyId: str):
             detail=f"Bounty with ID {bountyId} not found in game {gameId}."
         )
 
+    invalidate_rewards_cache()
     return {"message": "Bounty successfully deleted."}
 
@@ -0,0 +1,180 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple, Type
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..schemas.bulk_schema import BulkItemResult, ResponseBulkWrite
+
+load_dotenv()
+
+MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+CREATED = "created"
+UPDATED = "updated"
+INVALID = "invalid"
+ERROR = "error"
+
+# Write error code of a unique index violation.
+DUPLICATE_KEY = 11000
+
+def openapi_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Describe the raw request body read by a bulk endpoint, for the API docs."""
+    schema = {"type": "array", "items": model.model_json_schema()}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": schema},
+                "application/x-ndjson": {"schema": {"type": "string", "description": "One JSON object per line"}},
+            },
+        }
+    }
+
+
+async def read_items(request: Request) -> List[Any]:
+    """
+    Read the raw items of a bulk request: a JSON array, or NDJSON (one object per line).
+
+    Raises:
+        HTTPException: 400 if the body cannot be parsed or holds more than BULK_MAX_ITEMS items.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type in NDJSON_MEDIA_TYPES:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body or b"[]")
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid request body: {str(e)}"
+        )
+
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array or NDJSON body."
+        )
+    if len(items) > MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ITEMS} items can be written per request, got {len(items)}."
+        )
+    return items
+
+
+def validate_items(adapter: TypeAdapter, items: List[Any]) -> Tuple[List[Tuple[int, BaseModel]], List[BulkItemResult]]:
+    """
+    Validate every item with one pass of ``adapter`` (a ``TypeAdapter(List[Model])``).
+
+    Returns:
+        tuple: The ``(index, model)`` pairs of the valid items, and one result per invalid item.
+    """
+    try:
+        return list(enumerate(adapter.validate_python(items))), []
+    except ValidationError as e:
+        details: Dict[int, List[str]] = {}
+        for error in e.errors():
+            index = error["loc"][0]
+            field = ".".join(str(part) for part in error["loc"][1:])
+            details.setdefault(index, []).append(f"{field}: {error['msg']}" if field else error["msg"])
+
+    # Only when some items are invalid: validate the remaining ones again, together.
+    valid_indexes = [index for index in range(len(items)) if index not in details]
+    valid = adapter.validate_python([items[index] for index in valid_indexes])
+    invalid = [
+        BulkItemResult(index=index, status=INVALID, detail="; ".join(messages))
+        for index, messages in sorted(details.items())
+    ]
+    return list(zip(valid_indexes, valid)), invalid
+
+
+async def _bulk_write(collection, operations: List[UpdateOne]) -> Tuple[Dict[int, Any], Dict[int, Dict[str, Any]]]:
+    """Run ``operations`` unordered; return the upserted IDs and the write errors, by position."""
+    try:
+        write_result = await collection.bulk_write(operations, ordered=False)
+        return write_result.upserted_ids or {}, {}
+    except BulkWriteError as e:
+        upserted_ids = {upsert["index"]: upsert["_id"] for upsert in e.details.get("upserted", [])}
+        errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+        return upserted_ids, errors
+
+
+async def bulk_upsert(
+    collection,
+    upserts: List[Tuple[int, Dict[str, Any], Dict[str, Any]]],
+    key_fields: List[str],
+    invalid: List[BulkItemResult] = (),
+) -> ResponseBulkWrite:
+    """
+    Run upserts with unordered ``bulk_write`` calls of at most BULK_CHUNK_SIZE operations.
+
+    An item failing does not stop the others. Upserts that lost an insert race on the
+    unique index of ``key_fields`` (the same key sent twice, or written concurrently)
+    are retried once, which then updates the document the other write created. The
+    IDs of updated documents, which ``bulk_write`` does not return, are read back with
+    one query per chunk on ``key_fields``.
+
+    Args:
+        collection: The collection to write to.
+        upserts (list): ``(index, filter, update)`` triples, ``index`` being the item's position in the request.
+        key_fields (list): The fields each upsert filter matches on.
+        invalid (list): Results of the items rejected before writing.
+
+    Returns:
+        ResponseBulkWrite: The counts and one result per requested item, in request order.
+    """
+    results: List[BulkItemResult] = list(invalid)
+
+    for start in range(0, len(upserts), CHUNK_SIZE):
+        chunk = upserts[start:start + CHUNK_SIZE]
+        operations = [UpdateOne(query, update, upsert=True) for _, query, update in chunk]
+        upserted_ids, errors = await _bulk_write(collection, operations)
+
+        duplicates = [position for position, error in errors.items() if error.get("code") == DUPLICATE_KEY]
+        if duplicates:
+            retried_ids, retry_errors = await _bulk_write(collection, [operations[position] for position in duplicates])
+            for retry, position in enumerate(duplicates):
+                if retry in retry_errors:
+                    errors[position] = retry_errors[retry]
+                    continue
+                del errors[position]
+                if retry in retried_ids:
+                    upserted_ids[position] = retried_ids[retry]
+
+        updated = [position for position in range(len(chunk)) if position not in upserted_ids and position not in errors]
+        updated_ids = {}
+        if updated:
+            filters = [chunk[position][1] for position in updated]
+            cursor = collection.find({"$or": filters}, {field: 1 for field in key_fields})
+            updated_ids = {
+                tuple(document.get(field) for field in key_fields): document["_id"]
+                async for document in cursor
+            }
+
+        for position, (index, query, _) in enumerate(chunk):
+            if position in errors:
+                results.append(BulkItemResult(index=index, status=ERROR, detail=errors[position].get("errmsg", "Write failed.")))
+            elif position in upserted_ids:
+                results.append(BulkItemResult(index=index, status=CREATED, id=str(upserted_ids[position])))
+            else:
+                key = tuple(query.get(field) for field in key_fields)
+                document_id = updated_ids.get(key)
+                results.append(BulkItemResult(index=index, status=UPDATED, id=str(document_id) if document_id else None))
+
+    results.sort(key=lambda result: result.index)
+    return ResponseBulkWrite(
+        created=sum(1 for result in results if result.status == CREATED),
+        updated=sum(1 for result in results if result.status == UPDATED),
+        failed=sum(1 for result in results if result.status in (INVALID, ERROR)),
+        results=results,
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, List, Optional
+
+from dotenv import load_dotenv
+from pymongo.errors import OperationFailure, PyMongoError
+
+from ..core import database
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Collections whose change streams are watched, as named in core/database.py.
+WATCHED_COLLECTIONS = [
+    name.strip()
+    for name in os.getenv("CACHE_INVALIDATION_COLLECTIONS", "game,bounty,nft").split(",")
+    if name.strip()
+]
+ENABLED = os.getenv("CACHE_INVALIDATION_WATCHER", "true").lower() in ("1", "true", "yes")
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+# ChangeStreamHistoryLost / InvalidResumeToken: the last token can no longer be resumed.
+UNRESUMABLE_ERROR_CODES = {260, 280, 286}
+
+# Invalidators receive the changed document's id, or None when the whole collection
+# must be treated as changed (drop, rename, or a resume token that fell off the oplog).
+Invalidator = Callable[[Optional[str]], None]
+_invalidators: DefaultDict[str, List[Invalidator]] = defaultdict(list)
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def register_invalidator(collection_name: str, invalidator: Invalidator):
+    """
+    Register a function evicting this worker's cached entries for ``collection_name``.
+
+    Services owning a cache call this at import time; the watcher then calls it for
+    every change on the collection, no matter which worker made the write.
+    """
+    _invalidators[collection_name].append(invalidator)
+
+
+def _invalidate(collection_name: str, document_id: Optional[str]):
+    for invalidator in _invalidators[collection_name]:
+        try:
+            invalidator(document_id)
+        except Exception as e:
+            logger.error(f"Cache invalidator for {collection_name} failed: {str(e)}")
+
+
+async def watch_collection(collection_name: str):
+    """
+    Follow the change stream of ``collection_name`` and evict the changed keys.
+
+    The resume token is only kept in memory: the caches are per process, so a
+    reconnect resumes where the stream left off, while a stream opened without a
+    token (at start, or after the token was lost) first flushes the collection's
+    cache, since nothing guarantees what was cached before the stream opened.
+    """
+    collection = database.get_database().get_collection(collection_name)
+    resume_token = None
+    retry_delay = 1.0
+
+    while True:
+        try:
+            async with collection.watch(resume_after=resume_token) as stream:
+                retry_delay = 1.0
+                if resume_token is None:
+                    _invalidate(collection_name, None)
+                logger.info(f"Watching change stream of '{collection_name}'.")
+                async for change in stream:
+                    operation = change.get("operationType")
+                    if operation in ("drop", "rename", "dropDatabase", "invalidate"):
+                        _invalidate(collection_name, None)
+                    else:
+                        document_id = change.get("documentKey", {}).get("_id")
+                        _invalidate(collection_name, str(document_id) if document_id is not None else None)
+
+                    resume_token = stream.resume_token
+        except OperationFailure as e:
+            if e.code in UNRESUMABLE_ERROR_CODES:
+                # Events were missed: reopening without a token flushes the cache.
+                logger.warning(f"Change stream of '{collection_name}' cannot resume, flushing its cache.")
+                resume_token = None
+                continue
+            logger.error(f"Change stream of '{collection_name}' failed: {str(e)}")
+        except PyMongoError as e:
+            logger.error(f"Change stream of '{collection_name}' failed: {str(e)}")
+
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY_SECONDS)
+
+
+def start():
+    """Start one watcher task per watched collection (called from the app lifespan)."""
+    if not ENABLED:
+        logger.info("Cache invalidation watcher is disabled.")
+        return
+
+    for collection_name in WATCHED_COLLECTIONS:
+        if not _invalidators[collection_name]:
+            logger.info(f"No cache registered for '{collection_name}', not watching it.")
+            continue
+        if collection_name not in _tasks:
+            _tasks[collection_name] = asyncio.create_task(watch_collection(collection_name))
+
+
+async def stop():
+    """Cancel the watcher tasks."""
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
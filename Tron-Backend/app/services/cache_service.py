@@ -0,0 +1,110 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_MISSING = object()
+
+def _namespace(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else key
+
+class TTLCache:
+    """
+    Bounded in-process cache with a per-key time to live and LRU eviction.
+
+    Every method is synchronous and never awaits, so a single instance can be
+    shared by all coroutines running on the worker's event loop without a lock.
+    Keys are tuples whose first item is a namespace (e.g. ``("game", gameId)``),
+    which lets write paths drop a whole group of keys at once.
+
+    A read that started before an invalidation must not store what it read after
+    it: read ``generation(key)`` before querying and pass it to ``set``, which
+    skips the value if the key's namespace was invalidated meanwhile.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Invalidation counters: per namespace, and of the whole cache (bumped by clear).
+        self._generations: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing or expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self, key: Hashable) -> Tuple[int, int]:
+        """Return the invalidation generation of ``key``'s namespace, to pass to ``set``."""
+        return self._epoch, self._generations.get(_namespace(key), 0)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[Tuple[int, int]] = None):
+        """
+        Store ``value`` under ``key`` for ``ttl`` seconds (the cache default if None).
+
+        If ``generation`` (see ``generation``) is given and the namespace has been
+        invalidated since, the value is stale and is not stored.
+        """
+        if generation is not None and generation != self.generation(key):
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single key."""
+        self._bump(_namespace(key))
+        self._data.pop(key, None)
+
+    def invalidate_namespace(self, namespace: str):
+        """Drop every key whose first item is ``namespace``."""
+        self._bump(namespace)
+        for key in [key for key in self._data if isinstance(key, tuple) and key and key[0] == namespace]:
+            del self._data[key]
+
+    def clear(self):
+        """Drop every key."""
+        self._epoch += 1
+        self._data.clear()
+
+    def _bump(self, namespace: Hashable):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss counters and current size of the cache."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Games only change through game_service's write paths, which invalidate this cache.
+game_cache = TTLCache(
+    maxsize=int(os.getenv("GAME_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("GAME_CACHE_TTL_SECONDS", "60")),
+)
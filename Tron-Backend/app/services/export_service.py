@@ -0,0 +1,64 @@
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from ..core.responses import dumps
+from ..core.database import (
+    game_collection,
+    orderitem_collection,
+    user_collection,
+    verifiedpurchase_collection,
+)
+from ..models import game_model, user_model, verifiedpurchase_model
+from .purchase_service import build_order_data
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Documents fetched per getMore; memory stays bounded by one batch whatever the collection size.
+BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Serialized rows sent to the client per chunk.
+ROWS_PER_CHUNK = 100
+
+Serializer = Callable[[Dict[str, Any]], BaseModel]
+
+# The exportable collections and the serializer of their documents.
+EXPORTS: Dict[str, tuple] = {
+    "games": (game_collection, game_model.serialize_trusted),
+    "users": (user_collection, user_model.serialize_trusted),
+    "orders": (orderitem_collection, build_order_data),
+    "verified-purchases": (verifiedpurchase_collection, verifiedpurchase_model.serialize),
+}
+
+
+async def stream_ndjson(collection, serialize: Serializer) -> AsyncIterator[bytes]:
+    """
+    Yield every document of ``collection`` as NDJSON, one serialized document per line.
+
+    The Motor cursor is read ``EXPORT_BATCH_SIZE`` documents at a time and rows are sent
+    as soon as ROWS_PER_CHUNK of them are serialized, so neither the documents nor
+    the response body are ever held in memory as a whole.
+    """
+    cursor = collection.find({}).sort("_id", 1).batch_size(BATCH_SIZE)
+    rows = []
+    exported = 0
+    try:
+        async for document in cursor:
+            rows.append(dumps(serialize(document)))
+            if len(rows) >= ROWS_PER_CHUNK:
+                exported += len(rows)
+                yield b"\n".join(rows) + b"\n"
+                rows.clear()
+        if rows:
+            exported += len(rows)
+            yield b"\n".join(rows) + b"\n"
+    except Exception as e:
+        # The status line is already sent: the client sees a truncated body.
+        logger.error(f"Export of '{collection.name}' failed after {exported} documents: {str(e)}")
+        raise
+    finally:
+        await cursor.close()
@@ -1,38 +1,105 @@
 import logging
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from ..schemas import game_schema
-from ..core.database import game_collection
-from ..models.game_model import serialize
+from ..core.database import duplicate_key_field, game_collection
+from ..models.game_model import serialize, serialize_trusted
+from . import bulk_service, cache_invalidation_service
+from .cache_service import game_cache
+from .singleflight_service import flight
 
 logger = logging.getLogger(__name__)
 
-async def get_all_games():
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Fields a client may request through ``fields=``; ``_id`` and ``id`` are always returned.
+PROJECTABLE_FIELDS = set(game_schema.ResponseGameModel.model_fields) - {"game_id", "id"}
+
+def build_projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
     """
-    Service function to retrieve all game data from the database.
-    
+    Build a MongoDB projection from a comma separated ``fields`` query value.
+
     Args:
-        None
+        fields (str | None): Comma separated list of game fields, e.g. ``"title,price"``.
 
     Returns:
-        list[dict]: Game data if found.
+        dict | None: The projection to pass to MongoDB, or None for the full document.
     """
-    query = {}
-    cursor = game_collection.find(query)  
-    if cursor:
-        games_list = [serialize(game) async for game in cursor]
-        return game_schema.GameModelCollection(
-            games = games_list
-        ) 
-    
-    else:
+    if not fields:
+        return None
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - PROJECTABLE_FIELDS
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="An error occurred while retrieving all game data."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown game fields: {', '.join(sorted(unknown))}."
         )
+
+    projection = {field: 1 for field in requested}
+    projection["id"] = 1
+    return projection
+
+async def get_all_games(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """
+    Service function to retrieve one page of game data from the database.
+
+    Games are paginated by ``_id`` (keyset pagination), so every page costs a single
+    indexed range scan no matter how deep the client pages.
+
+    Args:
+        limit (int): Maximum number of games to return, capped at MAX_PAGE_SIZE.
+        cursor (str | None): The ``next_cursor`` returned by the previous page.
+        fields (str | None): Comma separated list of fields to return for every game.
+
+    Returns:
+        tuple: The page of games and the cursor of the next page (None on the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cache_key = ("games", limit, cursor, fields)
+    cached = game_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = game_cache.generation(cache_key)
+
+    projection = build_projection(fields)
+
+    query = {}
+    if cursor:
+        try:
+            query["_id"] = {"$gt": ObjectId(cursor)}
+        except InvalidId:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid cursor: {cursor}"
+            )
+
+    # Fetch one extra document to know whether another page exists.
+    documents = await game_collection.find(query, projection).sort("_id", 1).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = str(documents[-1]["_id"])
+
+    games = game_schema.GameModelCollection(
+        games = [serialize_trusted(game) for game in documents]
+    )
+    if projection:
+        include = set(projection) | {"game_id"}
+        games = games.model_dump(include={"games": {"__all__": include}})
+
+    game_cache.set(cache_key, (games, next_cursor), generation=generation)
+    return games, next_cursor
     
 async def get_game(gameId: str):
     """
@@ -44,8 +111,15 @@ async def get_game(gameId: str):
     Returns:
         dict: Game data if found.
     """
+    cache_key = ("game", gameId)
+    cached = game_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    # Read before the query: a write landing meanwhile makes the result unfit for caching.
+    generation = game_cache.generation(cache_key)
+
     query = {"_id": ObjectId(gameId)}
-    result = await game_collection.find_one(query)
+    result = await flight.do(cache_key, lambda: game_collection.find_one(query))
 
     if result is None:
         raise HTTPException(
@@ -53,7 +127,25 @@ async def get_game(gameId: str):
                 detail= f"Game with ID {gameId} not found."
             )
     else: 
-        return serialize(result)
+        game = serialize_trusted(result)
+        game_cache.set(cache_key, game, generation=generation)
+        return game
+
+def invalidate_game_cache(gameId: Optional[str] = None):
+    """
+    Drop cached catalog pages, and the cached detail of ``gameId`` if given.
+
+    Called by every write path so reads never serve a game older than the last write
+    made through this worker. Reads of the game already in flight are not joined by
+    later callers nor cached.
+    """
+    game_cache.invalidate_namespace("games")
+    if gameId is not None:
+        game_cache.invalidate(("game", gameId))
+        flight.forget(("game", gameId))
+
+# Evict games changed by other workers too, via the game collection's change stream.
+cache_invalidation_service.register_invalidator("game", invalidate_game_cache)
 
 async def create_game(request: game_schema.GameModel):
     """
@@ -65,14 +157,8 @@ async def create_game(request: game_schema.GameModel):
     Returns:
         dict: The newly created game data.
     """
-    existing_game = await game_collection.find_one({'title': request.title})
-    existing_id = await game_collection.find_one({'title': request.id})
-    if existing_game or existing_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"A game with the title '{request.title}' or A game with the id '{request.existing_id} already exists."
-        )
-    
+    # Title and id uniqueness is enforced by unique indexes (see core/indexes.py),
+    # so creating a game is a single insert instead of two lookups followed by an insert.
     current_time = datetime.now()
     create_game_data = game_schema.CreateGameModel(
         id = request.id,
@@ -91,7 +177,14 @@ async def create_game(request: game_schema.GameModel):
     )
     game_dict = create_game_data.model_dump()
 
-    result = await game_collection.insert_one(game_dict)
+    try:
+        result = await game_collection.insert_one(game_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A game with the title '{request.title}' or A game with the id '{request.id}' already exists."
+        )
+    invalidate_game_cache()
 
     if result:
     
@@ -110,33 +203,81 @@ async def create_game(request: game_schema.GameModel):
             detail="An error occurred while creating the game."
         )
 
-async def update_game(gameId: str, request: game_schema.GameModel):
+_bulk_games_adapter = TypeAdapter(List[game_schema.BulkGameModel])
+
+async def bulk_upsert_games(items: List[Any]):
+    """
+    Service function to create or update many games at once, matched on their ``id``.
+
+    Items are validated together, then written with unordered bulk writes, so one
+    invalid or conflicting game does not stop the others. Updates only change the
+    fields sent, like ``update_game``.
+
+    Args:
+        items (list): The raw game objects of the request.
+
+    Returns:
+        ResponseBulkWrite: The created/updated/failed counts and one result per item.
+    """
+    valid, invalid = bulk_service.validate_items(_bulk_games_adapter, items)
+    current_time = datetime.now()
+    upserts = [
+        (
+            index,
+            {"id": game.id},
+            {
+                "$set": {**game.model_dump(exclude_unset=True), "updatedAt": current_time},
+                "$setOnInsert": {"createdAt": current_time, "reviews": []},
+            },
+        )
+        for index, game in valid
+    ]
+    result = await bulk_service.bulk_upsert(game_collection, upserts, ["id"], invalid)
+
+    invalidate_game_cache()
+    for item in result.results:
+        if item.status == bulk_service.UPDATED and item.id:
+            invalidate_game_cache(item.id)
+    return result
+
+async def update_game(gameId: str, request: game_schema.UpdateGameModel):
     """
     Service function to update an existing game's data in the database.
 
+    Only the fields present in the request are changed, and the updated game is
+    returned by the update itself instead of a second read.
+
     Args:
         gameId (str): The unique ID of the game to update.
-        request (GameModel): The new game data to update.
+        request (UpdateGameModel): The game fields to update.
 
     Returns:
         dict: The newly updated game data.
     """
-    game_dict = request.model_dump()
+    game_dict = request.model_dump(exclude_unset=True)
     game_dict["updatedAt"] = datetime.now()
 
-    update_result = await game_collection.update_one(
-        {"_id": ObjectId(gameId)},
-        {"$set": game_dict}
-    )
+    try:
+        updated_game = await game_collection.find_one_and_update(
+            {"_id": ObjectId(gameId)},
+            {"$set": game_dict},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError as e:
+        field = duplicate_key_field(e) or "title"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A game with the {field} '{game_dict.get(field)}' already exists."
+        )
+    invalidate_game_cache(gameId)
 
-    if update_result.matched_count == 0:
+    if updated_game is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Game with ID {gameId} not found."
         )
 
-    updated_game = await get_game(gameId) 
-    return updated_game
+    return serialize(updated_game)
 
 async def delete_game(gameId: str):
     """
@@ -152,6 +293,7 @@ async def delete_game(gameId: str):
 
     # Attempt to delete the game
     delete_result = await game_collection.delete_one(query)
+    invalidate_game_cache(gameId)
 
     # Check if the game was deleted (deleted_count > 0 means it was deleted)
     if delete_result.deleted_count == 0:
@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pymongo import UpdateOne
+from tronpy.exceptions import TransactionNotFound
+from tronpy.keys import is_address
+from tronpy.tron import Transaction
+
+from ..core import tron
+from ..core.database import mintjob_collection
+from ..schemas import nft_schema
+from ..models.mintjob_model import serialize
+from . import nft_service
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Tron transactions carry a reference block instead of an account nonce, so the mints
+# signed by one key do not have to be broadcast in order and can go out concurrently.
+CONCURRENCY = int(os.getenv("NFT_MINT_CONCURRENCY", "8"))
+BATCH_SIZE = int(os.getenv("NFT_MINT_BATCH_SIZE", "50"))
+MAX_ATTEMPTS = int(os.getenv("NFT_MINT_MAX_ATTEMPTS", "5"))
+# Maximum TRX (in sun) a mint may burn for energy.
+FEE_LIMIT = int(os.getenv("NFT_MINT_FEE_LIMIT", "100000000"))
+MINT_FUNCTION = os.getenv("NFT_MINT_FUNCTION", "mintNFT")
+POLL_SECONDS = 5.0
+RETRY_DELAY_SECONDS = 10.0
+RECOVER_INTERVAL_SECONDS = 30.0
+# Jobs claimed by a worker that stopped before signing them are released after this long.
+STALE_AFTER_SECONDS = 300
+# Signed transactions expire 60 seconds after they are built; past this, an unconfirmed
+# one can no longer land on chain and its job is safe to retry.
+SIGNED_EXPIRED_AFTER_SECONDS = 120
+
+PENDING = "Pending"
+PROCESSING = "Processing"
+SIGNED = "Signed"
+# Accepted by the node, waiting for its receipt.
+BROADCAST = "Broadcast"
+MINTED = "Minted"
+FAILED = "Failed"
+
+# Receipt result of a contract call that went through.
+SUCCESS = "SUCCESS"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_wakeup: Optional[asyncio.Event] = None
+_tasks: List[asyncio.Task] = []
+
+
+async def enqueue(request: nft_schema.CreateMint) -> nft_schema.ResponseMintJobCollection:
+    """
+    Queue one mint of the NFT reward for every wallet and return the job handles.
+
+    The mints are signed and broadcast by the mint workers; poll ``get_job`` with a
+    returned ``job_id`` for its outcome.
+    """
+    invalid_wallets = [wallet for wallet in request.wallets if not is_address(wallet)]
+    if invalid_wallets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid wallet addresses: {', '.join(invalid_wallets)}",
+        )
+
+    nft = await nft_service.get_nft(request.gameId, request.bountyId, request.nftId)
+
+    current_time = datetime.now()
+    jobs = [
+        nft_schema.DatabaseMintJob(
+            gameId=request.gameId,
+            bountyId=request.bountyId,
+            nftId=request.nftId,
+            uri=nft.uri,
+            wallet=wallet,
+            status=PENDING,
+            nextAttemptAt=current_time,
+            createdAt=current_time,
+            updatedAt=current_time,
+        ).model_dump()
+        for wallet in dict.fromkeys(request.wallets)
+    ]
+    # insert_many sets the generated _id on every job dict.
+    await mintjob_collection.insert_many(jobs)
+
+    if _wakeup is None:
+        logger.warning("Mint workers are not running, the NFTs will be minted after a restart.")
+    else:
+        _wakeup.set()
+
+    return nft_schema.ResponseMintJobCollection(jobs=[serialize(job) for job in jobs])
+
+
+async def get_job(job_id: str) -> nft_schema.ResponseMintJob:
+    """Return the current status of a queued mint."""
+    try:
+        query = {"_id": ObjectId(job_id)}
+    except InvalidId:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid mint job ID: {job_id}",
+        )
+
+    job = await mintjob_collection.find_one(query)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Mint job with ID {job_id} not found.",
+        )
+    return serialize(job)
+
+
+def build_transaction(job: Dict) -> Transaction:
+    """Build and sign the mint transaction of a job (blocking, runs on the mint thread pool)."""
+    private_key = tron.get_private_key()
+    mint = getattr(tron.get_contract().functions, MINT_FUNCTION)
+    return (
+        mint(job["wallet"], job["uri"])
+        .with_owner(private_key.public_key.to_base58check_address())
+        .fee_limit(FEE_LIMIT)
+        .build()
+        .sign(private_key)
+    )
+
+
+def broadcast_transaction(transaction: Transaction) -> str:
+    """Broadcast a signed transaction and return its ID (blocking)."""
+    return transaction.broadcast()["txid"]
+
+
+def get_receipt_result(transaction_id: str) -> Optional[str]:
+    """
+    Return the receipt result of a transaction (blocking), e.g. ``SUCCESS``,
+    ``REVERT`` or ``OUT_OF_ENERGY``; None while it is not in a block.
+    """
+    try:
+        info = tron.get_client().get_transaction_info(transaction_id)
+    except TransactionNotFound:
+        return None
+    if info.get("blockNumber") is None:
+        return None
+    result = (info.get("receipt") or {}).get("result")
+    if result is None:
+        # Calls without a receipt result only report failures at the top level.
+        return "FAILED" if info.get("result") == "FAILED" else SUCCESS
+    return result
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+def _retry_or_fail(job: Dict, detail: str) -> Dict:
+    now = datetime.now()
+    if job.get("attempts", 0) >= MAX_ATTEMPTS:
+        return {"status": FAILED, "detail": detail, "updatedAt": now}
+    return {
+        "status": PENDING,
+        "detail": detail,
+        "transaction_id": None,
+        "nextAttemptAt": now + timedelta(seconds=RETRY_DELAY_SECONDS * job.get("attempts", 1)),
+        "updatedAt": now,
+    }
+
+
+async def _write_results(updates: List[UpdateOne]):
+    if updates:
+        await mintjob_collection.bulk_write(updates, ordered=False)
+
+
+async def claim_jobs(limit: int) -> List[Dict]:
+    """
+    Claim up to ``limit`` due jobs for this worker.
+
+    Two round trips for the whole batch: the update only moves jobs still Pending,
+    so a job raced for by another worker ends up claimed by exactly one of them.
+    """
+    now = datetime.now()
+    cursor = mintjob_collection.find(
+        {"status": PENDING, "nextAttemptAt": {"$lte": now}}, {"_id": 1}
+    ).sort("nextAttemptAt", 1).limit(limit)
+    ids = [job["_id"] async for job in cursor]
+    if not ids:
+        return []
+
+    claim = uuid.uuid4().hex
+    await mintjob_collection.update_many(
+        {"_id": {"$in": ids}, "status": PENDING},
+        {"$set": {"status": PROCESSING, "claim": claim, "updatedAt": now}, "$inc": {"attempts": 1}},
+    )
+    return await mintjob_collection.find({"_id": {"$in": ids}, "claim": claim}).to_list(None)
+
+
+async def process_batch(jobs: List[Dict]):
+    """
+    Sign and broadcast a batch of claimed jobs.
+
+    Transaction IDs are stored (one bulk write) before anything is broadcast, so a
+    worker dying mid-batch never leads to a second mint of the same job; the results
+    are then stored with one more bulk write.
+
+    Every write matches the job's claim (or its transaction ID), and only the jobs
+    read back Signed with this batch's transaction are broadcast: a worker stalled
+    past STALE_AFTER_SECONDS, whose jobs were released and claimed again by another
+    worker, does not overwrite them nor mint them a second time.
+    """
+    transactions = await asyncio.gather(*(_run(build_transaction, job) for job in jobs), return_exceptions=True)
+
+    signed_updates, results, built = [], [], []
+    for job, transaction in zip(jobs, transactions):
+        claimed = {"_id": job["_id"], "claim": job["claim"], "status": PROCESSING}
+        if isinstance(transaction, Exception):
+            results.append(UpdateOne(claimed, {"$set": _retry_or_fail(job, str(transaction))}))
+            continue
+        signed_updates.append(UpdateOne(
+            claimed,
+            {"$set": {"status": SIGNED, "transaction_id": transaction.txid, "updatedAt": datetime.now()}},
+        ))
+        built.append((job, transaction))
+    await _write_results(signed_updates)
+
+    signed = []
+    if built:
+        cursor = mintjob_collection.find(
+            {"_id": {"$in": [job["_id"] for job, _ in built]}, "status": SIGNED}, {"transaction_id": 1}
+        )
+        stored = {job["_id"]: job["transaction_id"] async for job in cursor}
+        signed = [(job, transaction) for job, transaction in built if stored.get(job["_id"]) == transaction.txid]
+        if len(signed) < len(built):
+            logger.warning(f"{len(built) - len(signed)} mint jobs were claimed again by another worker, not broadcasting them.")
+
+    broadcasts = await asyncio.gather(
+        *(_run(broadcast_transaction, transaction) for _, transaction in signed), return_exceptions=True
+    )
+    for (job, transaction), result in zip(signed, broadcasts):
+        if isinstance(result, Exception):
+            # The node may have accepted it anyway: leave the job Signed, recovery checks
+            # the chain once the transaction has expired.
+            results.append(UpdateOne(
+                {"_id": job["_id"], "status": SIGNED, "transaction_id": transaction.txid},
+                {"$set": {"detail": str(result)}},
+            ))
+        else:
+            results.append(UpdateOne(
+                {"_id": job["_id"], "status": SIGNED, "transaction_id": transaction.txid},
+                {"$set": {"status": BROADCAST, "transaction_id": result, "detail": None, "updatedAt": datetime.now()}},
+            ))
+    await _write_results(results)
+    logger.info(f"Processed {len(jobs)} mint jobs, {sum(1 for r in broadcasts if not isinstance(r, Exception))} broadcast.")
+
+
+async def settle_jobs(jobs: List[Dict], expired: bool):
+    """
+    Move jobs with a transaction to Minted, or back to a retry (or Failed), from their receipts.
+
+    A transaction without a receipt is left alone unless ``expired``, in which case it
+    can no longer land on chain and its job is retried.
+    """
+    now = datetime.now()
+    receipts = await asyncio.gather(
+        *(_run(get_receipt_result, job["transaction_id"]) for job in jobs), return_exceptions=True
+    )
+    updates = []
+    for job, receipt in zip(jobs, receipts):
+        if isinstance(receipt, Exception):
+            continue
+        # Matching on the status and transaction ID keeps a concurrent settlement from applying twice.
+        query = {"_id": job["_id"], "status": job["status"], "transaction_id": job["transaction_id"]}
+        if receipt == SUCCESS:
+            updates.append(UpdateOne(query, {"$set": {"status": MINTED, "detail": None, "updatedAt": now}}))
+        elif receipt is not None:
+            updates.append(UpdateOne(query, {"$set": _retry_or_fail(job, f"Mint transaction failed on chain: {receipt}.")}))
+        elif expired:
+            updates.append(UpdateOne(query, {"$set": _retry_or_fail(job, "Transaction expired before reaching the chain.")}))
+    await _write_results(updates)
+
+
+async def recover_jobs():
+    """Release jobs abandoned by stopped workers and settle broadcast and expired signed transactions."""
+    now = datetime.now()
+    await mintjob_collection.update_many(
+        {"status": PROCESSING, "updatedAt": {"$lt": now - timedelta(seconds=STALE_AFTER_SECONDS)}},
+        {"$set": {"status": PENDING, "nextAttemptAt": now, "updatedAt": now}},
+    )
+
+    expired_before = now - timedelta(seconds=SIGNED_EXPIRED_AFTER_SECONDS)
+    # A signed transaction whose broadcast failed may still have been accepted: only
+    # settle it once it has expired, when the chain has the final word.
+    signed = await mintjob_collection.find(
+        {"status": SIGNED, "updatedAt": {"$lt": expired_before}}
+    ).limit(BATCH_SIZE).to_list(None)
+    if signed:
+        await settle_jobs(signed, expired=True)
+
+    broadcast = await mintjob_collection.find({"status": BROADCAST}).sort("updatedAt", 1).limit(BATCH_SIZE).to_list(None)
+    for expired in (True, False):
+        jobs = [job for job in broadcast if (job["updatedAt"] < expired_before) == expired]
+        if jobs:
+            await settle_jobs(jobs, expired=expired)
+
+
+async def _dispatcher():
+    while True:
+        _wakeup.clear()
+        try:
+            jobs = await claim_jobs(BATCH_SIZE)
+            if jobs:
+                await process_batch(jobs)
+                continue
+        except Exception as e:
+            logger.error(f"Mint dispatch failed: {str(e)}")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _recoverer():
+    while True:
+        try:
+            await recover_jobs()
+        except Exception as e:
+            logger.error(f"Could not recover mint jobs: {str(e)}")
+        await asyncio.sleep(RECOVER_INTERVAL_SECONDS)
+
+
+def start():
+    """Start the mint workers (called from the app lifespan)."""
+    global _executor, _wakeup
+    if _wakeup is not None:
+        return
+    if tron.get_private_key() is None:
+        logger.warning("PRIVATE_KEY_STRING is not set, queued NFT mints will not be processed.")
+        return
+
+    _wakeup = asyncio.Event()
+    # tronpy's client is synchronous; at most CONCURRENCY mint calls are in flight.
+    _executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="tron-mint")
+    _tasks.append(asyncio.create_task(_dispatcher()))
+    _tasks.append(asyncio.create_task(_recoverer()))
+
+
+async def stop():
+    """Stop the workers; unfinished jobs are recovered on the next start."""
+    global _executor, _wakeup
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _wakeup = None
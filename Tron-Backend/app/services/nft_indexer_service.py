@@ -0,0 +1,294 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from tronpy.keys import to_base58check_address
+
+from ..core import tron
+from ..core.database import indexer_checkpoint_collection, nft_ownership_collection
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("NFT_INDEXER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Block the NFT contract was deployed at; without it (and without a checkpoint) indexing starts at the head.
+START_BLOCK = os.getenv("NFT_INDEXER_START_BLOCK")
+BATCH_BLOCKS = int(os.getenv("NFT_INDEXER_BATCH_BLOCKS", "100"))
+# Only index solidified blocks, so indexed ownership is never rolled back.
+CONFIRMATIONS = int(os.getenv("NFT_INDEXER_CONFIRMATIONS", "19"))
+POLL_SECONDS = 3.0
+LEASE_SECONDS = 30
+# Largest page of the contract events API.
+EVENTS_PAGE_SIZE = 200
+
+CHECKPOINT_ID = "nft_transfer_indexer"
+
+_task: Optional[asyncio.Task] = None
+_lease_owner = uuid.uuid4().hex
+
+
+class NodeTransferSource:
+    """
+    Reads the NFT contract's Transfer events from the contract events API of the
+    node's TronGrid endpoint (``/v1/contracts/<address>/events``).
+
+    The API filters by block timestamp rather than number: a range is read from the
+    timestamp of its first block, in ascending order, until an event past its last
+    block shows up.
+    """
+
+    def __init__(self, contract_address: Optional[str] = None):
+        self.contract_address = to_base58check_address(contract_address or os.getenv("CONTRACT_ADDRESS"))
+
+    def latest_block(self) -> int:
+        return tron.get_client().get_latest_block_number()
+
+    def get_events(self, params: Dict) -> Dict:
+        """Return one page of the contract's events."""
+        provider = tron.get_client().provider
+        response = provider.sess.get(
+            urljoin(provider.endpoint_uri, f"v1/contracts/{self.contract_address}/events"),
+            params=params,
+            timeout=provider.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_transfers(self, start_block: int, end_block: int) -> List[Dict]:
+        """Return the Transfer events of blocks ``start_block`` to ``end_block`` (inclusive), in chain order."""
+        start_block_header = tron.get_client().get_block(start_block)["block_header"]["raw_data"]
+        params = {
+            "event_name": "Transfer",
+            "only_confirmed": "true",
+            "order_by": "block_timestamp,asc",
+            "min_block_timestamp": start_block_header["timestamp"],
+            "limit": EVENTS_PAGE_SIZE,
+        }
+        transfers = []
+        while True:
+            page = self.get_events(params)
+            for event in page.get("data", []):
+                block_number = event["block_number"]
+                if block_number > end_block:
+                    return transfers
+                if block_number < start_block:
+                    continue
+                # Arguments are keyed by position as well as by the ABI's parameter names.
+                result = event["result"]
+                transfers.append({
+                    "tokenId": int(result["2"]),
+                    "from": to_base58check_address(result["0"]),
+                    "to": to_base58check_address(result["1"]),
+                    "blockNumber": block_number,
+                    "transactionId": event.get("transaction_id"),
+                    "logIndex": event.get("event_index", 0),
+                })
+            fingerprint = (page.get("meta") or {}).get("fingerprint")
+            if not fingerprint:
+                return transfers
+            params["fingerprint"] = fingerprint
+
+
+class RecordedTransferSource:
+    """
+    Replays Transfer events recorded to a JSON file instead of querying a node.
+
+    The file holds ``{"latestBlock": int, "transfers": [...]}`` with transfers shaped
+    like NodeTransferSource.get_transfers returns them.
+    """
+
+    def __init__(self, transfers: List[Dict], latest_block: int):
+        self.transfers = sorted(transfers, key=lambda transfer: (transfer["blockNumber"], transfer.get("logIndex", 0)))
+        self._latest_block = latest_block
+
+    @classmethod
+    def from_file(cls, path: str) -> "RecordedTransferSource":
+        with open(path) as recorded:
+            recording = json.load(recorded)
+        return cls(recording["transfers"], recording["latestBlock"])
+
+    def latest_block(self) -> int:
+        return self._latest_block
+
+    def get_transfers(self, start_block: int, end_block: int) -> List[Dict]:
+        return [transfer for transfer in self.transfers if start_block <= transfer["blockNumber"] <= end_block]
+
+
+async def apply_transfers(transfers: List[Dict]) -> int:
+    """
+    Upsert the resulting owner of every token in ``transfers`` into nft_ownership.
+
+    Only the last transfer of each token is written, and a document already at a later
+    block is left alone, so replaying a range is harmless.
+
+    Returns:
+        int: The number of tokens written.
+    """
+    latest: Dict[int, Dict] = {}
+    for transfer in transfers:
+        latest[transfer["tokenId"]] = transfer
+    if not latest:
+        return 0
+
+    now = datetime.now()
+    operations = [
+        UpdateOne(
+            {"_id": tokenId, "blockNumber": {"$lte": transfer["blockNumber"]}},
+            {"$set": {
+                "owner": transfer["to"],
+                "blockNumber": transfer["blockNumber"],
+                "transactionId": transfer.get("transactionId"),
+                "updatedAt": now,
+            }},
+            upsert=True,
+        )
+        for tokenId, transfer in latest.items()
+    ]
+    try:
+        await nft_ownership_collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Duplicate _id means the token is already indexed at a later block: keep that owner.
+        errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+        if errors:
+            raise
+    return len(operations)
+
+
+async def get_indexed_block() -> Optional[int]:
+    """Return the last block whose Transfer events are in nft_ownership, if any."""
+    checkpoint = await indexer_checkpoint_collection.find_one({"_id": CHECKPOINT_ID}, {"blockNumber": 1})
+    return checkpoint.get("blockNumber") if checkpoint else None
+
+
+async def _acquire_lease() -> bool:
+    """Make sure only one worker indexes at a time; the lease is renewed before every batch."""
+    now = datetime.now()
+    try:
+        await indexer_checkpoint_collection.find_one_and_update(
+            {
+                "_id": CHECKPOINT_ID,
+                "$or": [{"leaseOwner": _lease_owner}, {"leaseUntil": {"$lt": now}}, {"leaseUntil": {"$exists": False}}],
+            },
+            {"$set": {"leaseOwner": _lease_owner, "leaseUntil": now + timedelta(seconds=LEASE_SECONDS)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def _renew_lease() -> bool:
+    """Extend the lease this worker holds; False if another worker has taken it over."""
+    checkpoint = await indexer_checkpoint_collection.find_one_and_update(
+        {"_id": CHECKPOINT_ID, "leaseOwner": _lease_owner},
+        {"$set": {"leaseUntil": datetime.now() + timedelta(seconds=LEASE_SECONDS)}},
+    )
+    return checkpoint is not None
+
+
+async def _load_checkpoint(source) -> int:
+    """Return the last indexed block."""
+    checkpoint = await indexer_checkpoint_collection.find_one({"_id": CHECKPOINT_ID})
+    if checkpoint and checkpoint.get("blockNumber") is not None:
+        return checkpoint["blockNumber"]
+    if START_BLOCK:
+        return int(START_BLOCK) - 1
+    # Pin the starting point, otherwise it would move along with the head on every poll.
+    last_block = await asyncio.to_thread(source.latest_block) - CONFIRMATIONS
+    await _save_checkpoint(last_block)
+    logger.warning(f"NFT_INDEXER_START_BLOCK is not set, indexing NFT transfers after block {last_block}.")
+    return last_block
+
+
+async def _save_checkpoint(block_number: int) -> bool:
+    """
+    Move the checkpoint forward to ``block_number``, while this worker holds the lease.
+
+    Returns:
+        bool: False if the checkpoint is already there or past it, or the lease was lost.
+    """
+    result = await indexer_checkpoint_collection.update_one(
+        {"_id": CHECKPOINT_ID, "leaseOwner": _lease_owner, "blockNumber": {"$not": {"$gte": block_number}}},
+        {"$set": {"blockNumber": block_number, "updatedAt": datetime.now()}},
+    )
+    return result.modified_count == 1
+
+
+async def index_pending_blocks(source) -> int:
+    """
+    Index every confirmed block after the checkpoint, BATCH_BLOCKS at a time.
+
+    The checkpoint is saved after each batch is written, so an interrupted run resumes
+    from the last complete batch. The lease is renewed before each batch, and a worker
+    whose lease was taken over (or whose checkpoint another worker moved past) stops.
+
+    Returns:
+        int: The last indexed block.
+    """
+    last_block = await _load_checkpoint(source)
+    target_block = await asyncio.to_thread(source.latest_block) - CONFIRMATIONS
+
+    while last_block < target_block:
+        if not await _renew_lease():
+            logger.warning(f"Lost the NFT indexer lease at block {last_block}, another worker took over.")
+            break
+        end_block = min(last_block + BATCH_BLOCKS, target_block)
+        transfers = await asyncio.to_thread(source.get_transfers, last_block + 1, end_block)
+        written = await apply_transfers(transfers)
+        if not await _save_checkpoint(end_block):
+            logger.warning(f"NFT indexer checkpoint moved by another worker, stopping at block {last_block}.")
+            break
+        if written:
+            logger.info(f"Indexed {written} NFT owners up to block {end_block}.")
+        last_block = end_block
+
+    return last_block
+
+
+async def run(source=None):
+    """
+    Poll for new blocks and index their Transfer events until cancelled.
+
+    The default source is built inside the loop, so a bad CONTRACT_ADDRESS is logged
+    and retried like any other failure instead of ending the task.
+    """
+    while True:
+        try:
+            source = source or NodeTransferSource()
+            if await _acquire_lease():
+                await index_pending_blocks(source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"NFT transfer indexing failed: {str(e)}")
+        await asyncio.sleep(POLL_SECONDS)
+
+
+def start():
+    """Start the indexer (called from the app lifespan)."""
+    global _task
+    if not ENABLED:
+        logger.info("NFT transfer indexer is disabled.")
+        return
+    if not os.getenv("CONTRACT_ADDRESS"):
+        logger.error("CONTRACT_ADDRESS is not set, NFT transfer indexer is disabled.")
+        return
+    if _task is None:
+        _task = asyncio.create_task(run())
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
@@ -1,12 +1,36 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
 from bson import ObjectId
 from datetime import datetime
 
+from dotenv import load_dotenv
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from tronpy.exceptions import TvmError
 
-from ..core.tron import contract
-from ..core.database import nft_collection
+from ..core import tron
+from ..core.database import nft_collection, nft_ownership_collection
 from ..schemas import nft_schema
 from ..models import nft_model
+from . import bulk_service, nft_indexer_service
+from .bounty_service import invalidate_rewards_cache
+from .cache_service import TTLCache
+from .singleflight_service import flight
+
+load_dotenv()
+
+# Bound on concurrent ownerOf calls against the Tron node.
+OWNER_LOOKUP_CONCURRENCY = int(os.getenv("NFT_OWNER_CONCURRENCY", "8"))
+# Tron produces a block every 3 seconds, no need to ask for the height more often.
+BLOCK_HEIGHT_TTL_SECONDS = 3.0
+
+owner_cache = TTLCache(maxsize=10000, ttl=600)
+_owner_semaphore = asyncio.Semaphore(OWNER_LOOKUP_CONCURRENCY)
+_block_height = {"number": None, "fetched_at": 0.0}
 
 async def get_all_nfts(gameId: str, bountyId: str):
     """Fetch all NFTs reward from specified bounty and game in Database"""
@@ -16,7 +40,7 @@ async def get_all_nfts(gameId: str, bountyId: str):
     }
     cursor = nft_collection.find(query)
     
-    nfts_list = [nft_model.serialize(nft) async for nft in cursor]
+    nfts_list = [nft_model.serialize_trusted(nft) async for nft in cursor]
     
     if nfts_list:
         return nft_schema.ResponseNFTModelCollection(
@@ -38,7 +62,7 @@ async def get_nft(gameId: str, bountyId: str, nftId: str):
     nft = await nft_collection.find_one(query)
     
     if nft:
-        return nft_model.serialize(nft)
+        return nft_model.serialize_trusted(nft)
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,12 +88,18 @@ async def create_nft(gameId: str, bountyId: str, request: nft_schema.NFTModel):
 
     try:
         result = await nft_collection.insert_one(nft_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"An NFT named '{request.name}' already exists in game {gameId} and bounty {bountyId}."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while creating the NFT: {str(e)}"
         )
 
+    invalidate_rewards_cache()
     nft_id = str(result.inserted_id)
 
     return nft_schema.ResponseCreateNFTModel(
@@ -78,35 +108,80 @@ async def create_nft(gameId: str, bountyId: str, request: nft_schema.NFTModel):
         updatedAt = create_nft_data.updatedAt,
     )
 
-async def update_nft(gameId: str, bountyId: str, nftId: str, request: nft_schema.NFTModel):
+_bulk_nfts_adapter = TypeAdapter(List[nft_schema.BulkNFTModel])
+
+async def bulk_upsert_nfts(gameId: str, bountyId: str, items: List[Any]):
+    """
+    Service function to create or update many NFT rewards of a bounty at once, matched on their name.
+
+    Args:
+        gameId (str): The unique ID of the game the NFTs belong to.
+        bountyId (str): The unique ID of the bounty associated with the NFTs.
+        items (list): The raw NFT objects of the request.
+
+    Returns:
+        ResponseBulkWrite: The created/updated/failed counts and one result per item.
+    """
+    valid, invalid = bulk_service.validate_items(_bulk_nfts_adapter, items)
+    current_time = datetime.now()
+    upserts = [
+        (
+            index,
+            {"gameId": gameId, "bountyId": bountyId, "name": nft.name},
+            {
+                "$set": {**nft.model_dump(exclude_unset=True), "updatedAt": current_time},
+                # New NFTs get every field; existing ones keep the fields that were not sent.
+                "$setOnInsert": {
+                    "createdAt": current_time,
+                    **{field: None for field in nft.model_fields.keys() - nft.model_fields_set},
+                },
+            },
+        )
+        for index, nft in valid
+    ]
+    result = await bulk_service.bulk_upsert(nft_collection, upserts, ["gameId", "bountyId", "name"], invalid)
+    invalidate_rewards_cache()
+    return result
+
+async def update_nft(gameId: str, bountyId: str, nftId: str, request: nft_schema.UpdateNFTModel):
     """
     Service function to update an existing NFT's data in the database.
 
+    Only the fields present in the request are changed, and the updated NFT is
+    returned by the update itself instead of a second read.
+
     Args:
         gameId (str): The unique ID of the game the NFT belongs to.
         bountyId (str): The unique ID of the bounty associated with the NFT.
         nftId (str): The unique ID of the NFT to update.
-        request (NFTModel): The new NFT data to update.
+        request (UpdateNFTModel): The NFT fields to update.
 
     Returns:
         dict: The newly updated NFT data.
     """
-    nft_dict = request.model_dump()
+    nft_dict = request.model_dump(exclude_unset=True)
     nft_dict["updatedAt"] = datetime.now()
 
-    update_result = await nft_collection.update_one(
-        {"gameId": gameId, "bountyId": bountyId, "_id": ObjectId(nftId)},
-        {"$set": nft_dict}
-    )
+    try:
+        updated_nft = await nft_collection.find_one_and_update(
+            {"gameId": gameId, "bountyId": bountyId, "_id": ObjectId(nftId)},
+            {"$set": nft_dict},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"An NFT named '{nft_dict.get('name')}' already exists in game {gameId} and bounty {bountyId}."
+        )
 
-    if update_result.matched_count == 0:
+    if updated_nft is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"NFT with ID {nftId} not found in game {gameId} and bounty {bountyId}."
         )
 
-    updated_nft = await get_nft(gameId, bountyId, nftId)  
-    return updated_nft
+    invalidate_rewards_cache()
+    return nft_model.serialize(updated_nft)
 
 async def delete_nft(gameId: str, bountyId: str, nftId: str):
     """
@@ -130,33 +205,142 @@ async def delete_nft(gameId: str, bountyId: str, nftId: str):
             detail=f"NFT with ID {nftId} not found in game {gameId} and bounty {bountyId}."
         )
 
+    invalidate_rewards_cache()
     return {"message": "NFT successfully deleted."}
 
 
 
-async def get_nft_owner(tokenId: int):
-    """Service Function to retrieve NFT Owner's Address from TokenId"""
-    try:
-        address = contract.functions.ownerOf(1)
-        return address
-    except:
-        raise HTTPException(
+async def get_block_height() -> int:
+    """
+    Return the latest block number, refreshed at most once per block interval.
+
+    Concurrent refreshes share one call to the node.
+    """
+    now = time.monotonic()
+    if _block_height["number"] is None or now - _block_height["fetched_at"] >= BLOCK_HEIGHT_TTL_SECONDS:
+        try:
+            number = await flight.do(
+                ("block_height",),
+                lambda: asyncio.to_thread(tron.get_client().get_latest_block_number)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Could not reach the Tron node: {str(e)}"
+            )
+        _block_height["number"] = max(number, _block_height["number"] or 0)
+        _block_height["fetched_at"] = now
+    return _block_height["number"]
+
+async def _fetch_owner(tokenId: int) -> str:
+    async with _owner_semaphore:
+        contract = await asyncio.to_thread(tron.get_contract)
+        return await asyncio.to_thread(contract.functions.ownerOf, tokenId)
+
+async def lookup_owner(tokenId: int, block_number: int) -> str:
+    """
+    Return the owner of ``tokenId`` as of ``block_number``.
+
+    Owners are cached per token together with the block height they were read at,
+    and an entry is only reused while no newer block has been seen.
+    """
+    cache_key = ("nft_owner", tokenId)
+    cached = owner_cache.get(cache_key)
+    if cached is not None and cached[0] >= block_number:
+        return cached[1]
+
+    owner = await flight.do(("nft_owner", tokenId, block_number), lambda: _fetch_owner(tokenId))
+    owner_cache.set(cache_key, (block_number, owner))
+    return owner
+
+def owner_lookup_error(tokenId: int, error: Exception) -> HTTPException:
+    """
+    Map an error of ``lookup_owner`` to the HTTP error to answer with.
+
+    ownerOf reverts (TvmError) for tokens that were never minted; any other error
+    means the node could not be asked, not that the token is missing.
+    """
+    if isinstance(error, TvmError):
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"NFT with tokenId {tokenId} does not exist"
         )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Could not reach the Tron node: {str(error)}"
+    )
 
-# async def mint_nft(user_wallet: str, game_id: str):
-#     # Get game metadata and user info from MongoDB
-#     game_metadata = await get_game_metadata(game_id)
-    
-#     # Interact with the smart contract to mint the NFT
-#     tx = client.trx.create_smart_contract_function(
-#         contract_address,
-#         'mintNFT',
-#         [user_wallet, game_metadata['nftURI']]
-#     ).sign().broadcast()
+async def get_indexed_owners(tokenIds: List[int]) -> Dict[int, str]:
+    """Return the owners of the given tokens already indexed in nft_ownership (see nft_indexer_service)."""
+    cursor = nft_ownership_collection.find({"_id": {"$in": tokenIds}}, {"owner": 1})
+    return {ownership["_id"]: ownership["owner"] async for ownership in cursor}
+
+async def get_nft_owner(tokenId: int):
+    """
+    Service Function to retrieve NFT Owner's Address from TokenId
+
+    Indexed tokens are answered from the database, others from the Tron node.
+    """
+    indexed = await get_indexed_owners([tokenId])
+    if tokenId in indexed:
+        return indexed[tokenId]
 
-#     # Log the transaction in MongoDB
-#     await save_nft_to_mongo(user_wallet, tx['transaction_id'], game_metadata['nftURI'])
+    block_number = await get_block_height()
+    try:
+        return await lookup_owner(tokenId, block_number)
+    except Exception as e:
+        raise owner_lookup_error(tokenId, e)
+
+async def get_nft_owners(request: nft_schema.NFTOwnersRequest):
+    """
+    Service function to retrieve the owners of many NFTs at once.
 
-#     return {"status": "success", "transaction_id": tx['transaction_id']}
+    Indexed tokens are read with one database query. The rest are looked up
+    concurrently, at most NFT_OWNER_CONCURRENCY calls to the Tron node at a time;
+    tokens that cannot be resolved are returned with an error (see owner_lookup_error).
+    """
+    tokenIds = list(dict.fromkeys(request.tokenIds))
+    indexed = await get_indexed_owners(tokenIds)
+    missing = [tokenId for tokenId in tokenIds if tokenId not in indexed]
+
+    if missing:
+        block_number = await get_block_height()
+        results = await asyncio.gather(
+            *(lookup_owner(tokenId, block_number) for tokenId in missing),
+            return_exceptions=True
+        )
+    else:
+        block_number = await nft_indexer_service.get_indexed_block()
+        results = []
+    looked_up = dict(zip(missing, results))
+
+    owners = []
+    for tokenId in tokenIds:
+        result = indexed.get(tokenId, looked_up.get(tokenId))
+        if isinstance(result, Exception):
+            owners.append(nft_schema.NFTOwner(tokenId=tokenId, error=owner_lookup_error(tokenId, result).detail))
+        else:
+            owners.append(nft_schema.NFTOwner(tokenId=tokenId, owner=result))
+
+    return nft_schema.ResponseNFTOwnerCollection(
+        blockNumber=block_number,
+        owners=owners
+    )
+
+async def get_owned_nfts(address: str):
+    """
+    Service function to list the tokenIds owned by a wallet, from the indexed Transfer events.
+
+    Args:
+        address (str): The owner's wallet address.
+
+    Returns:
+        ResponseOwnedNFTCollection: The owned tokenIds and the block they are indexed up to.
+    """
+    cursor = nft_ownership_collection.find({"owner": address}, {"_id": 1}).sort("_id", 1)
+    tokenIds = [ownership["_id"] async for ownership in cursor]
+    return nft_schema.ResponseOwnedNFTCollection(
+        owner=address,
+        blockNumber=await nft_indexer_service.get_indexed_block(),
+        tokenIds=tokenIds
+    )
@@ -1,61 +1,88 @@
 from ..schemas import orderitem_schema
-from ..schemas.orderitem_schema import CreateOrderItem, RespondOrderItemCreate, CreateOrderItemCollection, ResponseCreateOrderItemCollection, DatabaseCreateOrderItemCollection
+from ..schemas.orderitem_schema import CreateOrderItem, RespondOrderItemCreate, CreateOrderItemCollection, ResponseCreateOrderItemCollection, DatabaseCreateOrderItemCollection, OrderItemPriceError, ResponseOrderItemPriceCollection
 from ..core.database import orderitem_collection, game_collection, user_collection
 from ..models.game_model import serialize
 
 import logging
 from fastapi import HTTPException
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime
 from fastapi import status
-from typing import Set, List
+from typing import Set, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+async def resolve_prices(items: List[CreateOrderItem]) -> Tuple[List[RespondOrderItemCreate], List[OrderItemPriceError]]:
+    """
+    Price many order items with a single query.
+
+    Every game is fetched in one ``$in`` query projected to its price, and each item
+    is checked in one pass, so a cart costs one round trip whatever its size.
+
+    Args:
+        items (list[CreateOrderItem]): The items to price.
+
+    Returns:
+        tuple: The priced items and the errors of the items that could not be priced.
+    """
+    object_ids = {}
+    for item in items:
+        try:
+            object_ids[item.game_id] = ObjectId(item.game_id)
+        except (InvalidId, TypeError):
+            pass
+
+    prices = {}
+    if object_ids:
+        query = {"_id": {"$in": list(set(object_ids.values()))}}
+        async for game in game_collection.find(query, {"price": 1}):
+            prices[game["_id"]] = game.get("price")
+
+    priced_items = []
+    errors = []
+    for item in items:
+        game_id = item.game_id
+        object_id = object_ids.get(game_id)
+
+        if object_id is None:
+            error = (status.HTTP_400_BAD_REQUEST, f"Invalid game ID: {game_id}.")
+        elif item.quantity is None:
+            error = (status.HTTP_400_BAD_REQUEST, "Quantity is missing.")
+        elif item.quantity != 1:
+            error = (status.HTTP_400_BAD_REQUEST, "quantity can only be 1")
+        elif object_id not in prices:
+            error = (status.HTTP_404_NOT_FOUND, f"Game with ID {game_id} not found.")
+        elif prices[object_id] is None:
+            error = (status.HTTP_400_BAD_REQUEST, f"Price is missing for game with ID {game_id}.")
+        else:
+            priced_items.append(RespondOrderItemCreate(
+                game_id=game_id,
+                quantity=item.quantity,
+                price=prices[object_id]
+            ))
+            continue
+
+        errors.append(OrderItemPriceError(game_id=game_id, status_code=error[0], detail=error[1]))
+
+    return priced_items, errors
+
 async def get_price(request: CreateOrderItem) -> RespondOrderItemCreate:
-    try:
-        game_id = request.game_id
-        quantity = request.quantity
-
-        query = {"_id" : ObjectId(game_id)}
-        target_game = await game_collection.find_one(query)
-
-        if quantity is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Quantity is missing."
-            )
-        
-        if quantity != 1:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"quantity can only be 1"
-            )
-
-        if target_game is None:
-            raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail= f"Game with ID {game_id} not found."
-                )
-        
-        price = target_game.get("price")
-        if price is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Price is missing for game with ID {game_id}."
-            )
-
-        return RespondOrderItemCreate(
-            game_id=game_id,
-            quantity=quantity,
-            price=price
-        )
-    
-    except Exception as e:
+    priced_items, errors = await resolve_prices([request])
+    if errors:
         raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"There was an internal error while fetching gamedata :{e}"
-            )
+            status_code=errors[0].status_code,
+            detail=errors[0].detail
+        )
+    return priced_items[0]
+
+async def get_prices(request: List[CreateOrderItem]) -> ResponseOrderItemPriceCollection:
+    """Quote many order items at once, reporting the items that cannot be priced."""
+    priced_items, errors = await resolve_prices(request)
+    return ResponseOrderItemPriceCollection(
+        items=priced_items,
+        errors=errors
+    )
 
 async def create_buy_order(request: CreateOrderItemCollection) -> ResponseCreateOrderItemCollection:
 
@@ -111,8 +138,14 @@ async def create_buy_order(request: CreateOrderItemCollection) -> ResponseCreate
     total_price = 0
     total_quantity = 0
 
-    for item in request.OrderItemCollection:
-        item_attribute = await get_price(item)  # This assumes you have a function that gets the price and other attributes
+    priced_items, errors = await resolve_prices(request.OrderItemCollection)
+    if errors:
+        raise HTTPException(
+            status_code=errors[0].status_code,
+            detail="; ".join(error.detail for error in errors)
+        )
+
+    for item_attribute in priced_items:
         total_quantity += item_attribute.quantity
         total_price += item_attribute.price
 
@@ -0,0 +1,122 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+from ..utils.helper.user_helper import hash_password as legacy_hash_password
+
+load_dotenv()
+
+# scrypt cost: memory is 128 * N * r bytes per hash (16 MiB by default). Raising
+# these upgrades existing hashes the next time their users log in.
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+# Hashes computed at once per worker; more concurrent logins queue for a thread
+# instead of each taking another 128 * N * r bytes of memory.
+WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+SALT_BYTES = 16
+KEY_BYTES = 64
+SCHEME = "scrypt"
+# Passwords stored before scrypt: unsalted SHA-512 hex digests.
+LEGACY_HASH = re.compile(r"^[0-9a-f]{128}$")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES, maxmem=128 * n * r * (p + 1) + 1024 * 1024
+    )
+
+
+def hash_password_sync(password: str) -> str:
+    """
+    Hash a password with scrypt at the configured cost (blocking).
+
+    Returns:
+        str: ``scrypt$N$r$p$salt$key``, salt and key base64 encoded.
+    """
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{SCHEME}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    """Check a password against a stored scrypt or legacy SHA-512 hash (blocking)."""
+    if LEGACY_HASH.match(hashed_password or ""):
+        return hmac.compare_digest(legacy_hash_password(password), hashed_password)
+    try:
+        scheme, n, r, p, salt, key = hashed_password.split("$")
+        if scheme != SCHEME:
+            return False
+        expected = _unb64(key)
+        return hmac.compare_digest(_scrypt(password, _unb64(salt), int(n), int(r), int(p)), expected)
+    except (AttributeError, ValueError):
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Return whether a stored hash is legacy SHA-512 or scrypt at another cost than the configured one."""
+    parts = (hashed_password or "").split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return True
+    return (int(parts[1]), int(parts[2]), int(parts[3])) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password on the password thread pool, keeping the event loop free."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), hash_password_sync, password)
+
+
+async def verify_password(password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its stored hash on the password thread pool.
+
+    Without a stored hash (unknown user) the password is hashed anyway, so the
+    response time does not tell whether the account exists.
+
+    Returns:
+        tuple: Whether the password matches, and its new hash when the stored one
+        is due for an upgrade (None otherwise).
+    """
+    loop = asyncio.get_running_loop()
+    if hashed_password is None:
+        await loop.run_in_executor(_get_executor(), hash_password_sync, password)
+        return False, None
+
+    if not await loop.run_in_executor(_get_executor(), verify_password_sync, password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, await hash_password(password)
+    return True, None
+
+
+def shutdown():
+    """Stop the password thread pool (called from the app lifespan)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
\ No newline at end of file
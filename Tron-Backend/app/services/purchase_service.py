@@ -1,9 +1,13 @@
+import os
 from datetime import datetime
-from typing import Set
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
+from ..core import database
 from ..core.database import (
     orderitem_collection,
     user_collection,
@@ -20,171 +24,164 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Run the three writes of a purchase in one multi-document transaction (needs a replica set).
+USE_TRANSACTIONS = os.getenv("PURCHASE_USE_TRANSACTIONS", "false").lower() in ("1", "true", "yes")
+
 
 async def purchase(request: CreatePurchase) -> RespondVerifiedPurchase:
     """
-    Process a purchase request.
+    Record a purchase whose transaction has been verified on chain.
+
+    Called by the verification worker (see verification_service) once the
+    transaction has enough confirmations.
 
     Steps:
-    1. Validate user existence.
-    2. Validate order and transaction status.
-    3. Verify the transaction.
-    4. Update order status.
-    5. Store verified purchase.
-    6. Update user's purchased games.
-    7. Return response.
+    1. Complete the order, atomically checking it is not completed yet.
+    2. Store verified purchase (unique on the transaction ID).
+    3. Add the order's games to the user's library.
+    4. Return response.
+
+    Steps 1-3 are one round trip each, optionally inside a transaction. Without one,
+    a failed step undoes the steps before it (see complete_purchase).
     """
     user_id = request.user_id
-    transaction_id = request.wallet_id
+    transaction_id = request.transaction_id
     order_id = request.order_id
 
-    # Step 1: Validate user existence
-    user_data = await get_user_by_id(user_id)
+    if not USE_TRANSACTIONS:
+        return await complete_purchase(user_id, order_id, transaction_id)
 
-    # Step 2: Validate order and transaction status
-    order_data = await get_order_by_id(order_id)
-    validate_order_status(order_data)
-    await validate_transaction_uniqueness(transaction_id)
+    async def run(session):
+        return await complete_purchase(user_id, order_id, transaction_id, session)
 
-    # Step 3: Verify the transaction
-    if not verify_transaction(transaction_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Transaction ID {transaction_id} cannot be verified.",
-        )
-
-    # Step 4: Update order status
-    await update_order_status(order_id, transaction_id)
+    async with await database.get_client().start_session() as session:
+        return await session.with_transaction(run)
 
-    #step 4.5 call Updated order
-    order_data = await get_order_by_id(order_id)
 
-    # Step 5: Store verified purchase
-    verified_purchase_id = await store_verified_purchase(order_data, transaction_id)
+async def complete_purchase(
+    user_id: str,
+    order_id: str,
+    transaction_id: str,
+    session=None,
+) -> RespondVerifiedPurchase:
+    """
+    Run the write steps of a purchase, inside ``session``'s transaction if given.
 
-    # Step 6: Update user's purchased games
-    await update_user_games(user_data, order_data)
+    Without a transaction, a failed step is compensated: the verified purchase is
+    deleted and the order put back to its previous status, so the purchase can be
+    verified again.
+    """
+    user_object_id = parse_object_id(user_id, "user")
+    order_object_id = parse_object_id(order_id, "order")
 
-    # Step 7: Return response
-    response = await create_response(
-        verified_purchase_id, order_data, transaction_id
-    )
-    return response
+    # Step 1: Complete the order
+    previous_order, order_data = await complete_order(order_object_id, user_id, transaction_id, session)
 
+    # Step 2: Store verified purchase
+    try:
+        verified_purchase_id = await store_verified_purchase(order_data, transaction_id, session)
+    except Exception:
+        if session is None:
+            await revert_order(previous_order, transaction_id)
+        raise
 
-async def get_user_by_id(user_id: str) -> dict:
-    """Retrieve user data by user ID."""
+    # Step 3: Update user's purchased games
     try:
-        user_object_id = ObjectId(user_id)
-    except Exception as e:
-        logger.error(f"Invalid user ID format: {user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid user ID: {user_id}",
-        ) from e
+        await add_user_games(user_object_id, order_data, session)
+    except Exception:
+        if session is None:
+            await delete_verified_purchase(verified_purchase_id)
+            await revert_order(previous_order, transaction_id)
+        raise
 
-    user_data = await user_collection.find_one({"_id": user_object_id})
-    if not user_data:
-        logger.error(f"User not found: {user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {user_id} not found.",
-        )
-    return user_data
+    # Step 4: Return response
+    return await create_response(verified_purchase_id, order_data, transaction_id)
 
 
-async def get_order_by_id(order_id: str) -> dict:
-    """Retrieve order data by order ID."""
+def parse_object_id(object_id: str, kind: str) -> ObjectId:
+    """Parse a user or order ID, rejecting malformed ones with a 400."""
     try:
-        order_object_id = ObjectId(order_id)
+        return ObjectId(object_id)
     except Exception as e:
-        logger.error(f"Invalid order ID format: {order_id}")
+        logger.error(f"Invalid {kind} ID format: {object_id}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid order ID: {order_id}",
+            detail=f"Invalid {kind} ID: {object_id}",
         ) from e
 
-    order_data = await orderitem_collection.find_one({"_id": order_object_id})
-    if not order_data:
-        logger.error(f"Order not found: {order_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Order with ID {order_id} not found.",
-        )
-    return order_data
 
+async def complete_order(order_object_id: ObjectId, user_id: str, transaction_id: str, session=None) -> Tuple[dict, dict]:
+    """
+    Mark the user's order as 'Completed'.
 
-def validate_order_status(order_data: dict):
-    """Check if the order has already been completed."""
-    if order_data.get("status") == "Completed":
-        logger.warning(f"Order already completed: {order_data['_id']}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Order with ID {order_data['_id']} has already been completed.",
-        )
+    The status precondition is part of the update filter, so two concurrent purchases
+    of the same order cannot both complete it.
 
+    Returns:
+        tuple: The order before the update (for revert_order) and after it.
+    """
+    previous_order = await orderitem_collection.find_one_and_update(
+        {"_id": order_object_id, "user_id": user_id, "status": {"$ne": "Completed"}},
+        {"$set": {"status": "Completed", "transaction": transaction_id}},
+        return_document=ReturnDocument.BEFORE,
+        session=session,
+    )
+    if previous_order:
+        logger.info(f"Order status updated to 'Completed' for order ID: {order_object_id}")
+        return previous_order, {**previous_order, "status": "Completed", "transaction": transaction_id}
 
-async def validate_transaction_uniqueness(transaction_id: str):
-    """Ensure the transaction ID hasn't been used before."""
-    existing_transaction = await verifiedpurchase_collection.find_one(
-        {"transaction_id": transaction_id}
+    # Only the failure path pays for a second read, to report why the update matched nothing.
+    existing_order = await orderitem_collection.find_one(
+        {"_id": order_object_id}, {"status": 1, "user_id": 1}, session=session
     )
-    if existing_transaction:
-        logger.warning(f"Transaction ID already verified: {transaction_id}")
+    if existing_order and existing_order.get("user_id") == user_id:
+        logger.warning(f"Order already completed: {order_object_id}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Transaction ID {transaction_id} has already been verified.",
+            detail=f"Order with ID {order_object_id} has already been completed.",
         )
+    logger.error(f"Order not found: {order_object_id}")
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Order with ID {order_object_id} not found for user {user_id}.",
+    )
 
 
-def verify_transaction(transaction_id: str) -> bool:
+async def revert_order(previous_order: dict, transaction_id: str):
     """
-    Verify the transaction.
+    Put an order completed by a failed purchase back to its previous status.
 
-    Replace this with actual verification logic.
+    Only an order still completed by ``transaction_id`` is reverted, never one a
+    later purchase has completed since.
     """
-    # TODO: Implement actual transaction verification logic.
-    logger.info(f"Verifying transaction ID: {transaction_id}")
-    return True  # Mocked as always true for now.
-
-
-async def update_order_status(order_id: str, transaction_id: str):
-    """Update the order status to 'Completed' and set the transaction ID."""
     result = await orderitem_collection.update_one(
-        {"_id": ObjectId(order_id)},
-        {
-            "$set": {
-                "status": "Completed",
-                "transaction": transaction_id,
-            }
-        },
+        {"_id": previous_order["_id"], "status": "Completed", "transaction": transaction_id},
+        {"$set": {"status": previous_order.get("status"), "transaction": previous_order.get("transaction")}},
     )
-    if result.matched_count == 0:
-        logger.error(f"Failed to update order status: {order_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Order with ID {order_id} not found.",
-        )
-    logger.info(f"Order status updated to 'Completed' for order ID: {order_id}")
+    if result.modified_count:
+        logger.info(f"Order status reverted to '{previous_order.get('status')}' for order ID: {previous_order['_id']}")
 
 
-async def store_verified_purchase(order_data: dict, transaction_id: str) -> str:
-    """Store the verified purchase in the database."""
-    current_time = datetime.now()
-
-    response_order_data = ResponseCreateOrderItemCollection(
+def build_order_data(order_data: dict, transaction_id: Optional[str] = None) -> ResponseCreateOrderItemCollection:
+    """Convert an order document into its response model."""
+    return ResponseCreateOrderItemCollection(
         order_id=str(order_data["_id"]),
         user_id=order_data["user_id"],
         OrderItemCollection=order_data["OrderItemCollection"],
         total_quantity=order_data["total_quantity"],
         total_price=order_data["total_price"],
         status=order_data["status"],
-        transaction=order_data["transaction"],
+        transaction=transaction_id or order_data["transaction"],
         created_time=order_data["created_time"],
     )
 
+
+async def store_verified_purchase(order_data: dict, transaction_id: str, session=None) -> str:
+    """Store the verified purchase in the database."""
+    current_time = datetime.now()
+
     verified_purchase = DatabaseVerifiedPurchase(
-        order_data=response_order_data,
+        order_data=build_order_data(order_data),
         purchase_time=current_time,
         verification_status="Verified",
         verification_method="Automated",
@@ -193,9 +190,17 @@ async def store_verified_purchase(order_data: dict, transaction_id: str) -> str:
         transaction_id=transaction_id,
     )
 
-    result = await verifiedpurchase_collection.insert_one(
-        verified_purchase.model_dump()
-    )
+    try:
+        result = await verifiedpurchase_collection.insert_one(
+            verified_purchase.model_dump(), session=session
+        )
+    except DuplicateKeyError:
+        # The unique transaction_id index replaces a separate uniqueness lookup.
+        logger.warning(f"Transaction ID already verified: {transaction_id}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Transaction ID {transaction_id} has already been verified.",
+        )
     if not result.acknowledged:
         logger.error("Failed to store verified purchase.")
         raise HTTPException(
@@ -206,27 +211,30 @@ async def store_verified_purchase(order_data: dict, transaction_id: str) -> str:
     return str(result.inserted_id)
 
 
-async def update_user_games(user_data: dict, order_data: dict):
-    """Update the user's purchased games."""
-    user_id = user_data["_id"]
-    current_games: Set[str] = set(user_data.get("games", []))
-    new_games: Set[str] = {
+async def delete_verified_purchase(verified_purchase_id: str):
+    """Delete the verified purchase of a purchase whose later step failed."""
+    await verifiedpurchase_collection.delete_one({"_id": ObjectId(verified_purchase_id)})
+    logger.info(f"Verified purchase deleted: {verified_purchase_id}")
+
+
+async def add_user_games(user_object_id: ObjectId, order_data: dict, session=None):
+    """Add the order's games to the user's purchased games."""
+    new_games: List[str] = [
         item["game_id"] for item in order_data["OrderItemCollection"]
-    }
+    ]
 
-    # Merge and update games
-    updated_games = list(current_games.union(new_games))
     result = await user_collection.update_one(
-        {"_id": user_id},
-        {"$set": {"games": updated_games}},
+        {"_id": user_object_id},
+        {"$addToSet": {"games": {"$each": new_games}}},
+        session=session,
     )
     if result.matched_count == 0:
-        logger.error(f"Failed to update games for user ID: {user_id}")
+        logger.error(f"Failed to update games for user ID: {user_object_id}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update games for user ID: {user_id}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_object_id} not found.",
         )
-    logger.info(f"User games updated for user ID: {user_id}")
+    logger.info(f"User games updated for user ID: {user_object_id}")
 
 
 async def create_response(
@@ -235,25 +243,15 @@ async def create_response(
     """Create the response object to return to the client."""
     current_time = datetime.now()
 
-    response_order_data = ResponseCreateOrderItemCollection(
-        order_id=str(order_data["_id"]),
-        user_id=order_data["user_id"],
-        OrderItemCollection=order_data["OrderItemCollection"],
-        total_quantity=order_data["total_quantity"],
-        total_price=order_data["total_price"],
-        status=order_data["status"],
-        transaction=transaction_id,
-        created_time=order_data["created_time"],
-    )
-
     response = RespondVerifiedPurchase(
         verifiedpurchase_id=verified_purchase_id,
-        order_data=response_order_data,
+        order_data=build_order_data(order_data, transaction_id),
         purchase_time=current_time,
         verification_status="Verified",
         verification_method="Automated",
         verified_by="System",
         verified_time=current_time,
+        transaction_id=transaction_id,
     )
     logger.info(f"Responding with verified purchase ID: {verified_purchase_id}")
     return response
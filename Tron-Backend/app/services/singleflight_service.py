@@ -0,0 +1,71 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical reads into a single in-flight call.
+
+    The first caller for a key starts the load as a task; every caller that arrives
+    with the same key while it is running awaits that same task and receives its
+    result (or exception). Keys are tuples whose first item is a namespace, e.g.
+    ``("game", gameId)``, which is also what the deduplication metrics are grouped by.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = Counter()
+        self.deduplicated = Counter()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn()`` for ``key`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key (tuple): Identifies the read, e.g. ``("bounties", gameId)``.
+            fn (callable): Zero argument function returning the awaitable to run.
+
+        Returns:
+            Any: The result of the single shared call.
+        """
+        namespace = key[0] if isinstance(key, tuple) and key else key
+        self.calls[namespace] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_task(key, done))
+        else:
+            self.deduplicated[namespace] += 1
+
+        # Shield so a cancelled caller does not cancel the load for everyone else.
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """
+        Let the next call for ``key`` start a new load instead of joining the one in
+        flight, e.g. after a write made what it is reading stale.
+        """
+        self._inflight.pop(key, None)
+
+    def forget_namespace(self, namespace: str):
+        """``forget`` every key whose first item is ``namespace``."""
+        for key in [key for key in self._inflight if isinstance(key, tuple) and key and key[0] == namespace]:
+            del self._inflight[key]
+
+    def _forget_task(self, key: Hashable, task: asyncio.Task):
+        # A forgotten load must not remove the newer one started for the same key.
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call and deduplication counters per namespace."""
+        return {
+            "in_flight": len(self._inflight),
+            "calls": dict(self.calls),
+            "deduplicated": dict(self.deduplicated),
+        }
+
+
+flight = SingleFlight()
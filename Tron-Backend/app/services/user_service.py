@@ -1,40 +1,50 @@
+import re
 from datetime import datetime
+from typing import Optional
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import HTTPException, status
 from pymongo.errors import DuplicateKeyError
+from tronpy.exceptions import BadAddress
+from tronpy.keys import to_base58check_address
 
 from ..schemas import user_schema
 from ..schemas.user_schema import UserCreate, DatabaseUserCreate, UserResponse
-from ..core.database import user_collection
-from ..utils.helper.user_helper import hash_password
-from ..models.user_model import serialize
+from ..core.database import duplicate_key_field, game_collection, user_collection
+from ..models.user_model import serialize, serialize_library_game, serialize_nfts, serialize_trusted
+from . import password_service
 
 from datetime import datetime
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Catalog fields returned for every game of a user's library; ``_id`` and ``id`` are always returned.
+LIBRARY_FIELDS = ("title", "price", "genre", "images", "tags", "rating", "developerData")
+
 async def register(request: user_schema.UserCreate):
-    # Check if email already exists
-    existing_email = await user_collection.find_one({"email": request.email})
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This email is already registered."
-        )
-    
-    existing_username = await user_collection.find_one({"username": request.username})
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This username is already registered."
-        )
-    
+    # Email and username uniqueness is enforced by unique indexes (see core/indexes.py),
+    # so registering is a single insert instead of two lookups followed by an insert.
     current_time = datetime.now()
+
+    wallet_address = None
+    if request.wallet_address:
+        try:
+            wallet_address = to_base58check_address(request.wallet_address)
+        except (BadAddress, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid wallet address: {request.wallet_address}"
+            )
     
-    hashed_password = hash_password(request.password)
+    hashed_password = await password_service.hash_password(request.password)
 
     user_data = DatabaseUserCreate(
         username=request.username,
         email=request.email,
         password=hashed_password,
+        wallet_address=wallet_address,
         bio=None,
         nfts=[],
         achievements=[],
@@ -45,13 +55,21 @@ async def register(request: user_schema.UserCreate):
 
     user_data_dict = user_data.model_dump()
 
-    result = await user_collection.insert_one(user_data_dict)
+    try:
+        result = await user_collection.insert_one(user_data_dict)
+    except DuplicateKeyError as e:
+        field = "username" if duplicate_key_field(e) == "username" else "email"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"This {field} is already registered."
+        )
     new_user_id = str(result.inserted_id)
 
     return UserResponse(
         user_id=new_user_id,
         username=request.username,
         email=request.email,
+        wallet_address=wallet_address,
         bio=None,
         nfts=[],
         achievements=[],
@@ -60,6 +78,164 @@ async def register(request: user_schema.UserCreate):
         games=[]
     )
 
+async def login(request: user_schema.UserLogin):
+    """
+    Service function to check a user's credentials.
+
+    A password stored with a legacy or weaker hash is rehashed at the current cost
+    once it has been checked.
+
+    Args:
+        request (UserLogin): The email and password of the user.
+
+    Returns:
+        UserResponse: The user's details.
+
+    Raises:
+        HTTPException: 401 if the email or password is wrong.
+    """
+    user = await user_collection.find_one({"email": request.email})
+
+    verified, new_hash = await password_service.verify_password(
+        request.password, user.get("password") if user else None
+    )
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password."
+        )
+
+    if new_hash:
+        # Matching on the old hash leaves a password changed meanwhile untouched.
+        await user_collection.update_one(
+            {"_id": user["_id"], "password": user["password"]},
+            {"$set": {"password": new_hash}}
+        )
+
+    return serialize_trusted(user)
+
+def _object_id(value: str, name: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name}: {value}"
+        )
+
+async def get_purchased_games(userId: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """
+    Service function to retrieve one page of a user's purchased games.
+
+    One aggregation on the user document: a ``$lookup`` fetches the purchased games
+    by ``_id`` (keyset pagination, so every page is an indexed range scan), projected
+    to LIBRARY_FIELDS, each with the user's NFTs from that game.
+
+    Args:
+        userId (str): The unique ID of the user.
+        limit (int): Maximum number of games to return, capped at MAX_PAGE_SIZE.
+        cursor (str | None): The ``next_cursor`` returned by the previous page.
+
+    Returns:
+        tuple: The page of games and the cursor of the next page (None on the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    user_id = _object_id(userId, "user ID")
+    game_match = {"_id": {"$gt": _object_id(cursor, "cursor")}} if cursor else {}
+
+    projection = {field: 1 for field in LIBRARY_FIELDS}
+    projection["id"] = 1
+    pipeline = [
+        {"$match": {"_id": user_id}},
+        {"$project": {
+            "nfts": 1,
+            # Purchased games are stored as the string form of their _id.
+            "gameIds": {"$map": {
+                "input": {"$ifNull": ["$games", []]},
+                "in": {"$convert": {"input": "$$this", "to": "objectId", "onError": None, "onNull": None}},
+            }},
+        }},
+        {"$lookup": {
+            "from": game_collection.name,
+            "localField": "gameIds",
+            "foreignField": "_id",
+            "let": {"nfts": {"$ifNull": ["$nfts", []]}},
+            "pipeline": [
+                {"$match": game_match},
+                {"$sort": {"_id": 1}},
+                # Fetch one extra game to know whether another page exists.
+                {"$limit": limit + 1},
+                {"$project": {
+                    **projection,
+                    "nfts": {"$filter": {
+                        "input": "$$nfts",
+                        "as": "nft",
+                        "cond": {"$in": ["$$nft.game", [{"$toString": "$_id"}, "$id"]]},
+                    }},
+                }},
+            ],
+            "as": "library",
+        }},
+        {"$project": {"library": 1}},
+    ]
+    users = await user_collection.aggregate(pipeline).to_list(length=1)
+    if not users:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {userId} not found."
+        )
+
+    documents = users[0]["library"]
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = str(documents[-1]["_id"])
+
+    library = user_schema.ResponseLibraryCollection(
+        games=[serialize_library_game(game) for game in documents]
+    )
+    include = set(projection) | {"game_id", "nfts"}
+    return library.model_dump(include={"games": {"__all__": include}}), next_cursor
+
+async def get_purchased_nfts(userId: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """
+    Service function to retrieve one page of a user's NFTs.
+
+    Only the requested slice of the user's ``nfts`` is read from the database.
+
+    Args:
+        userId (str): The unique ID of the user.
+        limit (int): Maximum number of NFTs to return, capped at MAX_PAGE_SIZE.
+        cursor (str | None): The ``next_cursor`` returned by the previous page.
+
+    Returns:
+        tuple: The page of NFTs and the cursor of the next page (None on the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    user_id = _object_id(userId, "user ID")
+    # Not str.isdigit(), which accepts digits int() refuses (e.g. superscripts).
+    if cursor is not None and not re.fullmatch(r"[0-9]+", cursor):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+    offset = int(cursor or 0)
+
+    user = await user_collection.find_one({"_id": user_id}, {"_id": 1, "nfts": {"$slice": [offset, limit + 1]}})
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {userId} not found."
+        )
+
+    nfts = user.get("nfts") or []
+    next_cursor = None
+    if len(nfts) > limit:
+        nfts = nfts[:limit]
+        next_cursor = str(offset + limit)
+
+    return serialize_nfts(nfts), next_cursor
+
 async def all_user():
     """
     Service function to retrieve all user data from the database.
@@ -75,7 +251,7 @@ async def all_user():
 
     users = []
     async for user in cursor:  # Process the cursor asynchronously
-        users.append(serialize(user))
+        users.append(serialize_trusted(user))
 
     if users:
         return users
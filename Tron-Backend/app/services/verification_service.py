@@ -0,0 +1,366 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from tronpy.exceptions import BadAddress, BadHash, TransactionNotFound
+from tronpy.keys import to_base58check_address
+
+from ..core import tron
+from ..core.database import (
+    game_collection,
+    orderitem_collection,
+    purchaseverification_collection,
+    user_collection,
+)
+from ..schemas.purchase_schema import (
+    CreatePurchase,
+    DatabasePurchaseVerification,
+    ResponsePurchaseVerification,
+)
+from ..models.purchaseverification_model import serialize
+from . import purchase_service
+from .cache_service import TTLCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv("VERIFICATION_WORKERS", "4"))
+REQUIRED_CONFIRMATIONS = int(os.getenv("VERIFICATION_CONFIRMATIONS", "19"))
+MAX_ATTEMPTS = int(os.getenv("VERIFICATION_MAX_ATTEMPTS", "30"))
+RETRY_DELAY_SECONDS = 3.0
+MAX_RETRY_DELAY_SECONDS = 30.0
+# Jobs left Pending/Verifying for this long (e.g. by a worker that was restarted) are picked up again.
+STALE_AFTER_SECONDS = 300
+# Wallet receiving the payments; unset, an order is paid to its games' developer wallet.
+STORE_WALLET_ADDRESS = os.getenv("STORE_WALLET_ADDRESS")
+
+SUN_PER_TRX = 1_000_000
+
+PENDING = "Pending"
+VERIFYING = "Verifying"
+COMPLETED = "Completed"
+FAILED = "Failed"
+
+# Final on-chain results keyed by ("transaction", transaction_id, sender, recipient, amount);
+# confirmed blocks do not change.
+transaction_cache = TTLCache(maxsize=10000, ttl=3600)
+
+_queue: Optional[asyncio.Queue] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_tasks: List[asyncio.Task] = []
+_retries: Dict[ObjectId, asyncio.TimerHandle] = {}
+
+
+class VerificationPending(Exception):
+    """The transaction is not on chain yet or does not have enough confirmations."""
+
+
+class PaymentUnknown(Exception):
+    """The payment an order expects cannot be determined (missing order, buyer wallet or payee)."""
+
+
+def _address(value) -> Optional[str]:
+    try:
+        return to_base58check_address(value)
+    except (BadAddress, TypeError, ValueError, IndexError):
+        return None
+
+
+async def expected_payment(verification: Dict) -> Dict:
+    """
+    Return the TRX transfer that pays for a verification's order.
+
+    Returns:
+        dict: ``{"sender": str, "recipient": str, "amount": int}``, addresses in
+        base58 and the amount in sun.
+
+    Raises:
+        PaymentUnknown: If the order, the buyer's wallet or the payee wallet is missing.
+    """
+    order_id = verification["order_id"]
+    try:
+        order = await orderitem_collection.find_one(
+            {"_id": ObjectId(order_id), "user_id": verification["user_id"]},
+            {"OrderItemCollection": 1, "total_price": 1},
+        )
+        user = await user_collection.find_one({"_id": ObjectId(verification["user_id"])}, {"wallet_address": 1})
+    except InvalidId:
+        order = user = None
+    if order is None or order.get("total_price") is None:
+        raise PaymentUnknown(f"Order with ID {order_id} not found for user {verification['user_id']}.")
+
+    sender = _address(user.get("wallet_address")) if user else None
+    if sender is None:
+        raise PaymentUnknown(f"User {verification['user_id']} has no wallet address to pay from.")
+
+    if STORE_WALLET_ADDRESS:
+        recipients = {_address(STORE_WALLET_ADDRESS)}
+    else:
+        game_ids = [ObjectId(item["game_id"]) for item in order.get("OrderItemCollection") or []]
+        recipients = {
+            _address((game.get("developerData") or {}).get("wallet_address"))
+            async for game in game_collection.find({"_id": {"$in": game_ids}}, {"developerData.wallet_address": 1})
+        }
+    if len(recipients) != 1 or None in recipients:
+        raise PaymentUnknown(f"Order with ID {order_id} has no single wallet to pay to.")
+
+    return {
+        "sender": sender,
+        "recipient": recipients.pop(),
+        "amount": round(order["total_price"] * SUN_PER_TRX),
+    }
+
+
+def payment_mismatch(transaction: Dict, payment: Dict) -> Optional[str]:
+    """Return why a transaction does not make ``payment``, or None if it does."""
+    contracts = (transaction.get("raw_data") or {}).get("contract") or []
+    if len(contracts) != 1 or contracts[0].get("type") != "TransferContract":
+        return "Transaction is not a TRX transfer."
+
+    value = (contracts[0].get("parameter") or {}).get("value") or {}
+    if _address(value.get("to_address")) != payment["recipient"]:
+        return "Transaction does not pay the order's payee."
+    if _address(value.get("owner_address")) != payment["sender"]:
+        return "Transaction is not sent from the buyer's wallet."
+    if (value.get("amount") or 0) < payment["amount"]:
+        return f"Transaction pays {value.get('amount') or 0} sun, the order costs {payment['amount']} sun."
+    return None
+
+
+def check_transaction(transaction_id: str, payment: Dict) -> Dict:
+    """
+    Look the transaction up on chain (blocking, runs on the verification thread pool)
+    and check it makes ``payment`` (see expected_payment).
+
+    Returns:
+        dict: ``{"verified": bool, "detail": str | None}`` once the result is final.
+
+    Raises:
+        VerificationPending: If the transaction should be checked again later.
+    """
+    client = tron.get_client()
+    try:
+        transaction = client.get_transaction(transaction_id)
+        info = client.get_transaction_info(transaction_id)
+    except BadHash:
+        return {"verified": False, "detail": f"Invalid transaction ID: {transaction_id}."}
+    except TransactionNotFound:
+        raise VerificationPending("Transaction not found on chain yet.")
+
+    if info.get("result") == "FAILED":
+        return {"verified": False, "detail": "Transaction failed on chain."}
+
+    mismatch = payment_mismatch(transaction, payment)
+    if mismatch is not None:
+        return {"verified": False, "detail": mismatch}
+
+    block_number = info.get("blockNumber")
+    if block_number is None:
+        raise VerificationPending("Transaction not included in a block yet.")
+
+    confirmations = client.get_latest_block_number() - block_number + 1
+    if confirmations < REQUIRED_CONFIRMATIONS:
+        raise VerificationPending(f"{confirmations}/{REQUIRED_CONFIRMATIONS} confirmations.")
+
+    return {"verified": True, "detail": None}
+
+
+async def verify_transaction(transaction_id: str, payment: Dict) -> Dict:
+    """Return the final on-chain result of a transaction for ``payment``, from the cache when known."""
+    cache_key = ("transaction", transaction_id, payment["sender"], payment["recipient"], payment["amount"])
+    cached = transaction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_executor, check_transaction, transaction_id, payment)
+    transaction_cache.set(cache_key, result)
+    return result
+
+
+async def submit(request: CreatePurchase) -> ResponsePurchaseVerification:
+    """
+    Queue a purchase for on-chain verification and return its status handle.
+
+    The purchase is recorded by a worker once the transaction is confirmed; poll
+    ``get_verification`` with the returned ``verification_id`` for the outcome.
+    """
+    purchase_service.parse_object_id(request.user_id, "user")
+    purchase_service.parse_object_id(request.order_id, "order")
+
+    current_time = datetime.now()
+    verification = DatabasePurchaseVerification(
+        user_id=request.user_id,
+        order_id=request.order_id,
+        transaction_id=request.transaction_id,
+        status=PENDING,
+        createdAt=current_time,
+        updatedAt=current_time,
+    )
+    verification_dict = verification.model_dump()
+    result = await purchaseverification_collection.insert_one(verification_dict)
+    verification_dict["_id"] = result.inserted_id
+
+    if _queue is None:
+        logger.warning("Verification workers are not running, the purchase will be verified after a restart.")
+    else:
+        _queue.put_nowait(result.inserted_id)
+
+    return serialize(verification_dict)
+
+
+async def get_verification(verification_id: str) -> ResponsePurchaseVerification:
+    """Return the current status of a queued purchase verification."""
+    try:
+        query = {"_id": ObjectId(verification_id)}
+    except InvalidId:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid verification ID: {verification_id}",
+        )
+
+    verification = await purchaseverification_collection.find_one(query)
+    if verification is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Purchase verification with ID {verification_id} not found.",
+        )
+    return serialize(verification)
+
+
+async def _set_status(verification_id: ObjectId, status_name: str, **fields):
+    await purchaseverification_collection.update_one(
+        {"_id": verification_id},
+        {"$set": {"status": status_name, "updatedAt": datetime.now(), **fields}},
+    )
+
+
+def _retry_later(verification_id: ObjectId, attempts: int):
+    delay = min(RETRY_DELAY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+    def requeue():
+        _retries.pop(verification_id, None)
+        if _queue is not None:
+            _queue.put_nowait(verification_id)
+
+    _retries[verification_id] = asyncio.get_running_loop().call_later(delay, requeue)
+
+
+async def process(verification_id: ObjectId):
+    """Run one verification attempt and, once confirmed, record the purchase."""
+    verification = await purchaseverification_collection.find_one_and_update(
+        {"_id": verification_id, "status": {"$in": [PENDING, VERIFYING]}},
+        {"$set": {"status": VERIFYING, "updatedAt": datetime.now()}, "$inc": {"attempts": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if verification is None:
+        return
+
+    attempts = verification["attempts"]
+    try:
+        payment = await expected_payment(verification)
+    except PaymentUnknown as e:
+        await _set_status(verification_id, FAILED, detail=str(e))
+        return
+
+    try:
+        result = await verify_transaction(verification["transaction_id"], payment)
+    except Exception as e:
+        # Not confirmed yet, or the node could not be reached: try again with backoff.
+        if attempts >= MAX_ATTEMPTS:
+            await _set_status(verification_id, FAILED, detail=f"Gave up after {attempts} attempts: {str(e)}")
+            return
+        await _set_status(verification_id, PENDING, detail=str(e))
+        _retry_later(verification_id, attempts)
+        return
+
+    if not result["verified"]:
+        await _set_status(verification_id, FAILED, detail=result["detail"])
+        return
+
+    try:
+        verified_purchase = await purchase_service.purchase(CreatePurchase(
+            user_id=verification["user_id"],
+            order_id=verification["order_id"],
+            transaction_id=verification["transaction_id"],
+        ))
+    except HTTPException as e:
+        await _set_status(verification_id, FAILED, detail=str(e.detail))
+        return
+
+    await _set_status(
+        verification_id,
+        COMPLETED,
+        detail=None,
+        verifiedpurchase_id=verified_purchase.verifiedpurchase_id,
+    )
+    logger.info(f"Purchase verification {verification_id} completed.")
+
+
+async def _worker():
+    while True:
+        verification_id = await _queue.get()
+        try:
+            await process(verification_id)
+        except Exception as e:
+            logger.error(f"Purchase verification {verification_id} failed: {str(e)}")
+        finally:
+            _queue.task_done()
+
+
+async def _recover_stale():
+    """Queue again the verifications abandoned by workers that stopped mid-way."""
+    cutoff = datetime.now() - timedelta(seconds=STALE_AFTER_SECONDS)
+    try:
+        while True:
+            # Claiming by bumping updatedAt keeps other workers from recovering the same job.
+            verification = await purchaseverification_collection.find_one_and_update(
+                {"status": {"$in": [PENDING, VERIFYING]}, "updatedAt": {"$lt": cutoff}},
+                {"$set": {"status": PENDING, "updatedAt": datetime.now()}},
+            )
+            if verification is None:
+                return
+            _queue.put_nowait(verification["_id"])
+    except PyMongoError as e:
+        logger.error(f"Could not recover pending purchase verifications: {str(e)}")
+
+
+def start():
+    """Start the verification workers (called from the app lifespan)."""
+    global _queue, _executor
+    if _queue is not None:
+        return
+
+    _queue = asyncio.Queue()
+    # tronpy's client is synchronous, its calls run here instead of on the event loop.
+    _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="tron-verify")
+    _tasks.extend(asyncio.create_task(_worker()) for _ in range(WORKERS))
+    _tasks.append(asyncio.create_task(_recover_stale()))
+
+
+async def stop():
+    """Stop the workers; unfinished verifications are recovered on the next start."""
+    global _queue, _executor
+    for handle in _retries.values():
+        handle.cancel()
+    _retries.clear()
+
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _queue = None
+    _executor = None
@@ -1,4 +1,6 @@
 from hashlib import sha512
 
 def hash_password(password: str) -> str:
+    # Unsalted SHA-512 of the passwords stored before scrypt, kept to verify them;
+    # new passwords are hashed by services/password_service.py.
     return sha512(password.encode()).hexdigest()
\ No newline at end of file
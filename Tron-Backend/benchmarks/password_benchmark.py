@@ -0,0 +1,65 @@
+"""
+Register throughput under concurrent load, scrypt inline vs on the password pool.
+
+Each simulated register hashes a password and then awaits a 2 ms stand-in for the
+insert round trip. A probe meanwhile sleeps 10 ms at a time and records how late it
+wakes up: the delay every other request on the worker would see.
+
+    PASSWORD_HASH_WORKERS=4 python -m benchmarks.password_benchmark [registers] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from app.services import password_service
+
+INSERT_SECONDS = 0.002
+PROBE_SECONDS = 0.01
+
+
+async def probe(lags, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_SECONDS)
+        lags.append((time.perf_counter() - start - PROBE_SECONDS) * 1000)
+
+
+async def run(hash_password, registers: int, concurrency: int):
+    """Return registers/sec and the probe's p50 / max lag in ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def register(index: int):
+        async with semaphore:
+            await hash_password(f"password-{index}")
+            await asyncio.sleep(INSERT_SECONDS)
+
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(register(index) for index in range(registers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    return registers / elapsed, statistics.median(lags), max(lags)
+
+
+async def inline_hash(password: str) -> str:
+    return password_service.hash_password_sync(password)
+
+
+async def main():
+    registers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    print(
+        f"{registers} registers, {concurrency} concurrent, scrypt N={password_service.SCRYPT_N} "
+        f"r={password_service.SCRYPT_R} p={password_service.SCRYPT_P}, {password_service.WORKERS} hash threads"
+    )
+    for name, hash_password in (("inline", inline_hash), ("pool", password_service.hash_password)):
+        rate, p50, worst = await run(hash_password, registers, concurrency)
+        print(f"{name:7} {rate:7.1f} registers/s   loop lag p50 {p50:7.1f} ms, max {worst:7.1f} ms")
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Requests per second of one worker serving a page of games, per response path.
+
+Each path serves the same in-memory game documents (no database), through the
+ASGI app in-process, so the numbers are the app's own cost per request:
+
+- ``json``: ``serialize`` + ResponseModel, encoded by FastAPI's default JSONResponse
+- ``orjson``: the same endpoint with ORJSONResponse as the default response class
+- ``orjson-direct``: ``serialize_trusted`` + ORJSONResponse returned by the endpoint
+
+    python -m benchmarks.response_benchmark [games per page] [seconds per path] [concurrency]
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+os.environ["TRUSTED_READS"] = "true"
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.responses import ORJSONResponse  # noqa: E402
+from app.models import game_model  # noqa: E402
+from app.schemas import response_schema  # noqa: E402
+from benchmarks.serialization_benchmark import make_game  # noqa: E402
+
+
+def build_apps(documents):
+    json_app = FastAPI()
+    orjson_app = FastAPI(default_response_class=ORJSONResponse)
+
+    def games_endpoint():
+        return response_schema.ResponseModel(
+            status="success",
+            message="Retrieve Games successfully",
+            data={"games": [game_model.serialize(document) for document in documents]},
+            timestamp=datetime.now().isoformat()
+        )
+
+    async def games_json():
+        return games_endpoint()
+
+    async def games_orjson():
+        return games_endpoint()
+
+    async def games_orjson_direct():
+        return ORJSONResponse(response_schema.ResponseModel(
+            status="success",
+            message="Retrieve Games successfully",
+            data={"games": [game_model.serialize_trusted(document) for document in documents]},
+            timestamp=datetime.now().isoformat()
+        ))
+
+    json_app.get("/games")(games_json)
+    orjson_app.get("/games")(games_orjson)
+    orjson_app.get("/games/direct")(games_orjson_direct)
+    return {
+        "json": (json_app, "/games"),
+        "orjson": (orjson_app, "/games"),
+        "orjson-direct": (orjson_app, "/games/direct"),
+    }
+
+
+async def measure(app, path: str, seconds: float, concurrency: int) -> float:
+    """Return the requests per second ``concurrency`` clients get from ``app`` over ``seconds``."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        (await client.get(path)).raise_for_status()
+        deadline = time.perf_counter() + seconds
+        completed = 0
+
+        async def worker():
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                (await client.get(path)).raise_for_status()
+                completed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return completed / (time.perf_counter() - start)
+
+
+async def main():
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    documents = [make_game(index) for index in range(page_size)]
+
+    print(f"{page_size} games per response, {concurrency} concurrent clients, {seconds:g}s per path, 1 worker")
+    baseline = None
+    for name, (app, path) in build_apps(documents).items():
+        rate = await measure(app, path, seconds, concurrency)
+        baseline = baseline or rate
+        print(f"{name:14} {rate:8.1f} req/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
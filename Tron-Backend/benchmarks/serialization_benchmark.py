@@ -0,0 +1,90 @@
+"""
+Per-document cost of turning game documents into a JSON response body.
+
+Compares the validating path (``serialize`` + ``jsonable_encoder`` + ``json.dumps``,
+what a list endpoint returning its ResponseModel used to cost) with the trusted
+path (``serialize_trusted`` + orjson). No database is needed:
+
+    python -m benchmarks.serialization_benchmark [documents] [rounds]
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+os.environ["TRUSTED_READS"] = "true"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.core.responses import dumps  # noqa: E402
+from app.models import game_model  # noqa: E402
+
+
+def make_game(index: int) -> dict:
+    """A game document shaped like the ones stored by the games endpoints."""
+    now = datetime.now()
+    return {
+        "_id": ObjectId(),
+        "id": f"game-{index}",
+        "title": f"Game {index}",
+        "price": 9.99,
+        "genre": "RPG",
+        "description": "An adventure across the chain. " * 8,
+        "nftRewards": [{"name": f"Reward {n}", "description": "A rare drop."} for n in range(5)],
+        "images": [f"https://cdn.example.com/games/{index}/{n}.png" for n in range(4)],
+        "tags": ["rpg", "fantasy", "multiplayer", "tron"],
+        "rating": 4.5,
+        "systemRequirements": {
+            "os": "Windows 10", "processor": "i5", "memory": "8 GB", "graphics": "GTX 1060", "storage": "20 GB",
+        },
+        "developerData": {"name": "CogniticCore", "wallet_address": "TXYZ1234567890abcdefghijklmnopqrs"},
+        "createdAt": now,
+        "updatedAt": now,
+        "reviews": [
+            {"user_id": str(ObjectId()), "user": f"player{n}", "avatar": None, "rating": 4.0, "comment": "Great game!"}
+            for n in range(10)
+        ],
+    }
+
+
+def validated(documents):
+    games = [game_model.serialize(document) for document in documents]
+    return json.dumps(jsonable_encoder({"data": games})).encode("utf-8")
+
+
+def trusted(documents):
+    games = [game_model.serialize_trusted(document) for document in documents]
+    return dumps({"data": games})
+
+
+def measure(fn, documents, rounds: int) -> float:
+    """Return the best per-document time of ``fn`` over ``rounds`` runs, in microseconds."""
+    fn(documents)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(documents)
+        best = min(best, time.perf_counter() - start)
+    return best / len(documents) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    documents = [make_game(index) for index in range(count)]
+
+    assert json.loads(validated(documents)) == json.loads(trusted(documents)), "Both paths must render the same body."
+
+    before = measure(validated, documents, rounds)
+    after = measure(trusted, documents, rounds)
+    print(f"{count} game documents, best of {rounds} rounds")
+    print(f"serialize + jsonable_encoder + json.dumps: {before:8.1f} us/document")
+    print(f"serialize_trusted + orjson:                {after:8.1f} us/document")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import os
+
+# The app reads these on import; the tests never reach a real server.
+os.environ.setdefault("MONGODB_USERNAME", "test")
+os.environ.setdefault("MONGODB_PASSWORD", "test")
+
+import pytest
+from mongomock import aggregate, helpers
+from mongomock.collection import BulkOperationBuilder, Collection
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import DuplicateKeyError
+
+from app.core import database
+
+# pymongo 4.9+ passes a ``sort`` argument to bulk updates that mongomock does not know yet.
+_add_update = BulkOperationBuilder.add_update
+_add_replace = BulkOperationBuilder.add_replace
+BulkOperationBuilder.add_update = lambda self, *args, sort=None, **kwargs: _add_update(self, *args, **kwargs)
+BulkOperationBuilder.add_replace = lambda self, *args, sort=None, **kwargs: _add_replace(self, *args, **kwargs)
+
+# mongomock's create_indexes drops partialFilterExpression, so a partial unique index
+# would be checked against every document instead of the ones it covers.
+_create_indexes = Collection.create_indexes
+
+
+def _create_partial_indexes(self, indexes, session=None):
+    names = []
+    for index in indexes:
+        document = index.document
+        partial = document.get("partialFilterExpression")
+        if partial is None or not document.get("unique"):
+            names.extend(_create_indexes(self, [index], session=session))
+            continue
+        keys = list(document["key"].items())
+        seen = set()
+        for existing in self.find(partial):
+            key = tuple(str(helpers.get_value_by_dot(existing, field)) for field, _ in keys)
+            if key in seen:
+                raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
+            seen.add(key)
+        self._store.create_index(document["name"], {"key": keys, "unique": True, "partialFilterExpression": partial})
+        names.append(document["name"])
+    return names
+
+
+Collection.create_indexes = _create_partial_indexes
+
+# mongomock only knows $lookup on localField/foreignField: run the ``let``/``pipeline``
+# form by binding the variables of each document into the sub-pipeline.
+_lookup = aggregate._PIPELINE_HANDLERS["$lookup"]
+
+
+def _bind(value, variables):
+    if isinstance(value, str) and value[2:] in variables and value.startswith("$$"):
+        return {"$literal": variables[value[2:]]}
+    if isinstance(value, dict):
+        return {key: _bind(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_bind(item, variables) for item in value]
+    return value
+
+
+def _lookup_pipeline(in_collection, database, options):
+    if "pipeline" not in options:
+        return _lookup(in_collection, database, options)
+    foreign = database.get_collection(options["from"])
+    for document in in_collection:
+        variables = {
+            name: aggregate._parse_expression(expression, document)
+            for name, expression in options.get("let", {}).items()
+        }
+        document[options["as"]] = list(foreign.aggregate(_bind(options["pipeline"], variables)))
+    return in_collection
+
+
+aggregate._PIPELINE_HANDLERS["$lookup"] = _lookup_pipeline
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def db(monkeypatch):
+    """Point every collection at a fresh in-memory database."""
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(database, "_client", client)
+    return client.get_database(database.DATABASE_NAME)
\ No newline at end of file
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.schemas import bounty_schema
+from app.services import bounty_service
+from app.services.cache_service import game_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    game_cache.clear()
+    yield
+    game_cache.clear()
+
+
+def stamps():
+    now = datetime.now()
+    return {"createdAt": now, "updatedAt": now}
+
+
+async def insert_bounty(db, gameId, name):
+    result = await db.bounty.insert_one({"gameId": gameId, "name": name, "description": name, **stamps()})
+    return str(result.inserted_id)
+
+
+async def insert_nft(db, gameId, bountyId, name):
+    await db.nft.insert_one(
+        {"gameId": gameId, "bountyId": bountyId, "name": name, "description": name, "uri": name, **stamps()}
+    )
+
+
+@pytest.mark.anyio
+async def test_rewards_join_every_bounty_with_its_nfts(db):
+    first = await insert_bounty(db, "g", "First")
+    second = await insert_bounty(db, "g", "Second")
+    await insert_nft(db, "g", first, "Sword")
+    await insert_nft(db, "g", first, "Shield")
+    # Same bounty ID under another game: not part of this game's rewards.
+    await insert_nft(db, "other", first, "Elsewhere")
+
+    rewards = await bounty_service.get_game_rewards("g")
+
+    assert {bounty.name: sorted(nft.name for nft in bounty.nfts) for bounty in rewards.bounties} == {
+        "First": ["Shield", "Sword"],
+        "Second": [],
+    }
+    assert [bounty.bountyId for bounty in rewards.bounties] == [first, second]
+
+
+@pytest.mark.anyio
+async def test_rewards_of_a_game_without_bounties(db):
+    with pytest.raises(HTTPException) as raised:
+        await bounty_service.get_game_rewards("g")
+    assert raised.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_update_sets_only_the_sent_fields_without_a_second_read(db, monkeypatch):
+    bountyId = await insert_bounty(db, "g", "First")
+
+    async def no_read(*args, **kwargs):
+        raise AssertionError("update should return the post-image, not read it again")
+
+    monkeypatch.setitem(vars(bounty_service.bounty_collection), "find_one", no_read)
+    updated = await bounty_service.update_bounty("g", bountyId, bounty_schema.UpdateBountyModel(name="Renamed"))
+
+    stored = await db.bounty.find_one({"_id": ObjectId(bountyId)})
+    assert (updated.name, updated.description) == ("Renamed", "First")
+    assert (stored["name"], stored["description"]) == ("Renamed", "First")
+
+
+@pytest.mark.anyio
+async def test_update_of_a_missing_bounty(db):
+    with pytest.raises(HTTPException) as raised:
+        await bounty_service.update_bounty("g", str(ObjectId()), bounty_schema.UpdateBountyModel(name="Renamed"))
+    assert raised.value.status_code == 404
\ No newline at end of file
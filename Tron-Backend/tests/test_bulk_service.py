@@ -0,0 +1,43 @@
+import pytest
+
+from app.core import indexes
+from app.services import bounty_service, bulk_service
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("unique_index", [True, False])
+async def test_same_key_twice_updates_the_document_it_created(db, unique_index):
+    # The unique index is best effort (see indexes.BEST_EFFORT): upserts work without it.
+    if unique_index:
+        await indexes.ensure_indexes()
+
+    result = await bounty_service.bulk_upsert_bounties("g", [
+        {"name": "First blood", "description": "one"},
+        {"name": "First blood", "description": "two"},
+    ])
+
+    assert (result.created, result.updated, result.failed) == (1, 1, 0)
+    assert await db.bounty.count_documents({"gameId": "g", "name": "First blood"}) == 1
+
+
+@pytest.mark.anyio
+async def test_duplicate_key_is_retried_once(db, monkeypatch):
+    await indexes.ensure_indexes()
+    await db.bounty.insert_one({"gameId": "g", "name": "Taken"})
+
+    # Another writer inserts the same key between the lookup and the insert of the upsert.
+    write = bulk_service._bulk_write
+    calls = []
+
+    async def racing_write(collection, operations):
+        calls.append(len(operations))
+        if len(calls) == 1:
+            return {}, {0: {"index": 0, "code": bulk_service.DUPLICATE_KEY, "errmsg": "E11000 duplicate key"}}
+        return await write(collection, operations)
+
+    monkeypatch.setattr(bulk_service, "_bulk_write", racing_write)
+    result = await bounty_service.bulk_upsert_bounties("g", [{"name": "Taken", "description": "new"}])
+
+    assert calls == [1, 1]
+    assert [item.status for item in result.results] == [bulk_service.UPDATED]
+    assert (await db.bounty.find_one({"name": "Taken"}))["description"] == "new"
\ No newline at end of file
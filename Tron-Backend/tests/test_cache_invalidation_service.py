@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app.core import database
+from app.services import cache_invalidation_service
+
+
+class FakeStream:
+    """A change stream yielding ``changes``, then failing as a dropped connection would."""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.changes:
+            raise AutoReconnect("connection closed")
+        change = self.changes.pop(0)
+        self.resume_token = {"_data": change["documentKey"]["_id"]}
+        return change
+
+
+@pytest.mark.anyio
+async def test_flushes_on_start_and_resumes_on_reconnect(monkeypatch):
+    opened = []
+    batches = [[{"operationType": "update", "documentKey": {"_id": "a"}}], []]
+
+    def watch(resume_after=None):
+        opened.append(resume_after)
+        if not batches:
+            raise asyncio.CancelledError
+        return FakeStream(batches.pop(0))
+
+    collection = SimpleNamespace(watch=watch)
+    monkeypatch.setattr(database, "get_database", lambda: SimpleNamespace(get_collection=lambda name: collection))
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: _done())
+    invalidated = []
+    monkeypatch.setattr(cache_invalidation_service, "_invalidators", {"game": [invalidated.append]})
+
+    with pytest.raises(asyncio.CancelledError):
+        await cache_invalidation_service.watch_collection("game")
+
+    # Nothing is read from a shared checkpoint: the first stream starts fresh and
+    # flushes, the reconnect resumes from this process's own token without flushing.
+    assert opened == [None, {"_data": "a"}, {"_data": "a"}]
+    assert invalidated == [None, "a"]
+
+
+async def _done():
+    return None
\ No newline at end of file
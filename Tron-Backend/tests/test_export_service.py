@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import exports
+from app.core.database import game_collection
+from app.models import game_model
+from app.services import export_service
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(exports.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("export_key, headers, status_code", [
+    (None, {"X-API-Key": "key"}, 503),
+    ("key", {}, 401),
+    ("key", {"X-API-Key": "wrong"}, 401),
+])
+def test_exports_require_the_key(client, monkeypatch, export_key, headers, status_code):
+    if export_key is None:
+        monkeypatch.delenv("EXPORT_API_KEY", raising=False)
+    else:
+        monkeypatch.setenv("EXPORT_API_KEY", export_key)
+
+    assert client.get("/exports/users", headers=headers).status_code == status_code
+
+
+@pytest.mark.anyio
+async def test_stream_sends_every_document_in_chunks(db):
+    await db.game.insert_many([{"id": f"g{i:03}", "title": f"Game {i}"} for i in range(250)])
+
+    chunks = [chunk async for chunk in export_service.stream_ndjson(game_collection, game_model.serialize_trusted)]
+
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [len(chunk.splitlines()) for chunk in chunks] == [100, 100, 50]
+    assert [row["id"] for row in rows] == [f"g{i:03}" for i in range(250)]
+
+
+def test_export_endpoint_streams_ndjson(client, monkeypatch):
+    monkeypatch.setenv("EXPORT_API_KEY", "key")
+
+    response = client.get("/exports/games", headers={"X-API-Key": "key"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == ""
\ No newline at end of file
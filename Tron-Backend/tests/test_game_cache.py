@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.services import game_service
+from app.services.cache_service import TTLCache, game_cache
+from app.services.singleflight_service import flight
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    game_cache.clear()
+    yield
+    game_cache.clear()
+
+
+def test_set_skips_values_read_before_an_invalidation():
+    cache = TTLCache()
+    generation = cache.generation(("game", "a"))
+    cache.invalidate(("game", "b"))
+    cache.set(("game", "a"), "stale", generation=generation)
+    assert cache.get(("game", "a")) is None
+
+    generation = cache.generation(("game", "a"))
+    cache.set(("game", "a"), "fresh", generation=generation)
+    assert cache.get(("game", "a")) == "fresh"
+
+
+def test_clear_invalidates_every_namespace():
+    cache = TTLCache()
+    generation = cache.generation(("games", 20))
+    cache.clear()
+    cache.set(("games", 20), "stale", generation=generation)
+    assert cache.get(("games", 20)) is None
+
+
+@pytest.mark.anyio
+async def test_read_in_flight_during_a_write_is_not_cached(db, monkeypatch):
+    game_id = str((await db.game.insert_one({"id": "a", "title": "Before"})).inserted_id)
+    find_one = game_service.game_collection.find_one
+    fetched, release = asyncio.Event(), asyncio.Event()
+    reads = []
+
+    async def slow_find_one(query):
+        # The first read fetches the document, then stalls until after the write.
+        document = await find_one(query)
+        reads.append(document["title"])
+        if len(reads) == 1:
+            fetched.set()
+            await release.wait()
+        return document
+
+    # Set on the instance, not with setattr: undoing that would leave the bound method
+    # of this test's database behind on the shared LazyCollection.
+    monkeypatch.setitem(vars(game_service.game_collection), "find_one", slow_find_one)
+
+    stale_read = asyncio.ensure_future(game_service.get_game(game_id))
+    await fetched.wait()
+    await db.game.update_one({"title": "Before"}, {"$set": {"title": "After"}})
+    game_service.invalidate_game_cache(game_id)
+
+    # A caller arriving after the write starts its own read instead of joining the stale one.
+    assert (await game_service.get_game(game_id)).title == "After"
+    release.set()
+    assert (await stale_read).title == "Before"
+
+    assert game_cache.get(("game", game_id)).title == "After"
+    assert reads == ["Before", "After"]
+    assert flight.stats()["in_flight"] == 0
\ No newline at end of file
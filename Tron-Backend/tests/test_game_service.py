@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services import game_service
+from app.services.cache_service import game_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    game_cache.clear()
+    yield
+    game_cache.clear()
+
+
+@pytest.fixture
+async def games(db):
+    await db.game.insert_many([{"id": f"g{i}", "title": f"Game {i}", "price": i} for i in range(5)])
+
+
+@pytest.mark.anyio
+async def test_pages_follow_the_cursor_to_the_end(games):
+    pages, cursor = [], None
+    while True:
+        page, cursor = await game_service.get_all_games(limit=2, cursor=cursor)
+        pages.append([game.id for game in page.games])
+        if cursor is None:
+            break
+
+    assert pages == [["g0", "g1"], ["g2", "g3"], ["g4"]]
+
+
+@pytest.mark.anyio
+async def test_fields_project_the_games(games):
+    page, _ = await game_service.get_all_games(limit=1, fields="title")
+
+    assert page == {"games": [{"game_id": page["games"][0]["game_id"], "id": "g0", "title": "Game 0"}]}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("kwargs", [{"fields": "title,secret"}, {"cursor": "not-an-id"}])
+async def test_unknown_fields_and_invalid_cursors_are_refused(games, kwargs):
+    with pytest.raises(HTTPException) as raised:
+        await game_service.get_all_games(**kwargs)
+    assert raised.value.status_code == 400
\ No newline at end of file
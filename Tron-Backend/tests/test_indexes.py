@@ -0,0 +1,99 @@
+import ast
+import pathlib
+
+import pytest
+
+from app.core import indexes
+
+SERVICES = pathlib.Path(indexes.__file__).parent.parent / "services"
+QUERY_METHODS = {
+    "find", "find_one", "count_documents", "distinct", "update_one", "update_many", "replace_one",
+    "delete_one", "delete_many", "find_one_and_update", "find_one_and_replace", "find_one_and_delete",
+}
+
+
+def issued_filters():
+    """
+    Yield ``(collection, fields, location)`` for every filter passed to a query method of
+    a ``<name>_collection`` in app/services, as a dict literal or a variable assigned one.
+    """
+    for path in sorted(SERVICES.glob("*.py")):
+        for function in ast.walk(ast.parse(path.read_text())):
+            if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            # Fields of the dicts assigned to each local name, including ``query["field"] = ...``.
+            assigned = {}
+            for node in ast.walk(function):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name) and isinstance(node.value, ast.Dict):
+                            assigned.setdefault(target.id, set()).update(
+                                key.value for key in node.value.keys if isinstance(key, ast.Constant)
+                            )
+                        elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) \
+                                and isinstance(target.slice, ast.Constant) and target.value.id in assigned:
+                            assigned[target.value.id].add(target.slice.value)
+            for node in ast.walk(function):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                        and node.func.attr in QUERY_METHODS and isinstance(node.func.value, ast.Name)
+                        and node.func.value.id.endswith("_collection")):
+                    continue
+                query = node.args[0] if node.args else next((k.value for k in node.keywords if k.arg == "filter"), None)
+                if isinstance(query, ast.Dict):
+                    fields = {key.value for key in query.keys if isinstance(key, ast.Constant)}
+                elif isinstance(query, ast.Name) and query.id in assigned:
+                    fields = assigned[query.id]
+                else:
+                    raise AssertionError(f"{path.name}:{node.lineno}: filter is not a dict literal or a local dict")
+                yield node.func.value.id[:-len("_collection")], frozenset(fields), f"{path.name}:{node.lineno}"
+
+
+def test_every_issued_filter_has_a_query_shape():
+    registered = {(shape["collection"], frozenset(shape["filter"])) for shape in indexes.QUERY_SHAPES}
+    # Filters without fields read the whole collection on purpose (e.g. listing every user).
+    missing = [
+        f"{location} {collection} {sorted(fields)}"
+        for collection, fields, location in issued_filters()
+        if fields and (collection, fields) not in registered
+    ]
+    assert not missing, "Add these filters to indexes.QUERY_SHAPES:\n" + "\n".join(missing)
+
+
+@pytest.mark.anyio
+async def test_ensure_indexes_creates_the_registry(db):
+    await indexes.ensure_indexes()
+    assert "email_unique" in await db.user.index_information()
+
+
+@pytest.mark.anyio
+async def test_ensure_indexes_fails_on_duplicates_of_a_unique_field(db):
+    await db.user.insert_many([{"email": "a@x.com", "username": "a"}, {"email": "a@x.com", "username": "b"}])
+
+    with pytest.raises(RuntimeError, match="user.email_unique"):
+        await indexes.ensure_indexes()
+
+
+@pytest.mark.anyio
+async def test_legacy_users_without_email_or_username_still_boot(db):
+    await db.user.insert_many([
+        {"username": "a"},
+        {"username": "b", "email": None},
+        {"email": "c@x.com"},
+        {"email": "d@x.com", "username": None},
+    ])
+
+    await indexes.ensure_indexes()
+
+    user_indexes = await db.user.index_information()
+    assert {"email_unique", "username_unique"} <= user_indexes.keys()
+
+
+@pytest.mark.anyio
+async def test_duplicate_bounty_names_do_not_fail_startup(db):
+    await db.bounty.insert_many([{"gameId": "g", "name": "Same"}, {"gameId": "g", "name": "Same"}])
+
+    await indexes.ensure_indexes()
+
+    bounty_indexes = await db.bounty.index_information()
+    assert "gameId" in bounty_indexes
+    assert "gameId_name_unique" not in bounty_indexes
\ No newline at end of file
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/metrics", dependencies=[Depends(metrics.verify_metrics_key)])
+    def get_metrics():
+        return PlainTextResponse(metrics.render())
+
+    return TestClient(app)
+
+
+def test_open_without_a_key(client, monkeypatch):
+    monkeypatch.delenv("METRICS_API_KEY", raising=False)
+    assert client.get("/metrics").status_code == 200
+
+
+@pytest.mark.parametrize("headers, status_code", [
+    ({}, 401),
+    ({"X-API-Key": "wrong"}, 401),
+    ({"X-API-Key": "key"}, 200),
+    ({"Authorization": "Bearer key"}, 200),
+    ({"Authorization": "Basic key"}, 401),
+])
+def test_requires_the_key_when_set(client, monkeypatch, headers, status_code):
+    monkeypatch.setenv("METRICS_API_KEY", "key")
+    assert client.get("/metrics", headers=headers).status_code == status_code
\ No newline at end of file
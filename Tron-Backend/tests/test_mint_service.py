@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tronpy.exceptions import TransactionNotFound
+
+from app.api.v1.endpoints import nfts
+from app.core import tron
+from app.services import mint_service
+
+
+@pytest.fixture
+def receipts(monkeypatch):
+    """Transaction info by transaction ID, as returned by the node."""
+    infos = {}
+
+    def get_transaction_info(transaction_id):
+        if transaction_id not in infos:
+            raise TransactionNotFound
+        return infos[transaction_id]
+
+    monkeypatch.setattr(tron, "get_client", lambda: SimpleNamespace(get_transaction_info=get_transaction_info))
+    return infos
+
+
+async def insert_job(db, transaction_id, status=mint_service.BROADCAST, age_seconds=10, attempts=1):
+    job = {
+        "gameId": "g", "bountyId": "b", "nftId": "n", "wallet": "w",
+        "status": status, "attempts": attempts, "transaction_id": transaction_id,
+        "updatedAt": datetime.now() - timedelta(seconds=age_seconds),
+    }
+    await db.mintjob.insert_one(job)
+    return job["_id"]
+
+
+async def status_of(db, job_id):
+    return (await db.mintjob.find_one({"_id": job_id}))["status"]
+
+
+@pytest.mark.parametrize("info, result", [
+    ({"blockNumber": 5, "receipt": {"result": "SUCCESS"}}, "SUCCESS"),
+    ({"blockNumber": 5, "result": "FAILED", "receipt": {"result": "OUT_OF_ENERGY"}}, "OUT_OF_ENERGY"),
+    ({"blockNumber": 5, "receipt": {}}, "SUCCESS"),
+    ({"blockNumber": 5, "result": "FAILED", "receipt": {}}, "FAILED"),
+    ({}, None),
+])
+def test_get_receipt_result(receipts, info, result):
+    receipts["tx"] = info
+    assert mint_service.get_receipt_result("tx") == result
+
+
+def test_get_receipt_result_before_the_block(receipts):
+    assert mint_service.get_receipt_result("tx") is None
+
+
+@pytest.mark.anyio
+async def test_recover_settles_broadcast_jobs_from_their_receipts(db, receipts):
+    receipts["minted"] = {"blockNumber": 5, "receipt": {"result": "SUCCESS"}}
+    receipts["reverted"] = {"blockNumber": 5, "result": "FAILED", "receipt": {"result": "REVERT"}}
+    minted = await insert_job(db, "minted")
+    reverted = await insert_job(db, "reverted")
+    waiting = await insert_job(db, "waiting")
+    expired = await insert_job(db, "expired", age_seconds=mint_service.SIGNED_EXPIRED_AFTER_SECONDS + 1)
+    exhausted = await insert_job(db, "reverted", attempts=mint_service.MAX_ATTEMPTS)
+
+    await mint_service.recover_jobs()
+
+    assert await status_of(db, minted) == mint_service.MINTED
+    assert await status_of(db, reverted) == mint_service.PENDING
+    assert "REVERT" in (await db.mintjob.find_one({"_id": reverted}))["detail"]
+    assert await status_of(db, waiting) == mint_service.BROADCAST
+    assert await status_of(db, expired) == mint_service.PENDING
+    assert await status_of(db, exhausted) == mint_service.FAILED
+
+
+@pytest.mark.anyio
+async def test_recover_does_not_mark_reverted_signed_jobs_broadcast(db, receipts):
+    receipts["reverted"] = {"blockNumber": 5, "result": "FAILED", "receipt": {"result": "OUT_OF_ENERGY"}}
+    receipts["minted"] = {"blockNumber": 5, "receipt": {"result": "SUCCESS"}}
+    age = mint_service.SIGNED_EXPIRED_AFTER_SECONDS + 1
+    reverted = await insert_job(db, "reverted", status=mint_service.SIGNED, age_seconds=age)
+    minted = await insert_job(db, "minted", status=mint_service.SIGNED, age_seconds=age)
+
+    await mint_service.recover_jobs()
+
+    assert await status_of(db, reverted) == mint_service.PENDING
+    assert await status_of(db, minted) == mint_service.MINTED
+
+
+@pytest.mark.anyio
+async def test_stalled_worker_does_not_mint_a_reclaimed_job(db, monkeypatch):
+    job_id = await insert_job(db, None, status=mint_service.PENDING)
+    await db.mintjob.update_one({"_id": job_id}, {"$set": {"nextAttemptAt": datetime.now(), "uri": "u"}})
+    [stalled] = await mint_service.claim_jobs(10)
+
+    # The job is released as stale and claimed again by another worker.
+    await db.mintjob.update_one({"_id": job_id}, {"$set": {"status": mint_service.PENDING}})
+    [reclaimed] = await mint_service.claim_jobs(10)
+    assert reclaimed["claim"] != stalled["claim"]
+
+    broadcast = []
+    monkeypatch.setattr(mint_service, "build_transaction", lambda job: SimpleNamespace(txid=f"tx-{job['claim']}"))
+    monkeypatch.setattr(mint_service, "broadcast_transaction", lambda transaction: broadcast.append(transaction.txid) or transaction.txid)
+
+    await mint_service.process_batch([stalled])
+    assert broadcast == []
+    assert await status_of(db, job_id) == mint_service.PROCESSING
+
+    await mint_service.process_batch([reclaimed])
+    assert broadcast == [f"tx-{reclaimed['claim']}"]
+    assert await status_of(db, job_id) == mint_service.BROADCAST
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(nfts.router)
+    return TestClient(app)
+
+
+MINT = {"gameId": "g", "bountyId": "b", "nftId": "n", "wallets": ["w"]}
+
+
+@pytest.mark.parametrize("admin_key, headers, status_code", [
+    (None, {"X-API-Key": "key"}, 503),
+    ("key", {}, 401),
+    ("key", {"X-API-Key": "wrong"}, 401),
+])
+def test_mint_endpoint_requires_the_admin_key(client, monkeypatch, admin_key, headers, status_code):
+    if admin_key is None:
+        monkeypatch.delenv("ADMIN_API_KEY", raising=False)
+    else:
+        monkeypatch.setenv("ADMIN_API_KEY", admin_key)
+    queued = []
+    monkeypatch.setattr(mint_service, "enqueue", lambda request: queued.append(request))
+
+    assert client.post("/nfts/mint", json=MINT, headers=headers).status_code == status_code
+    assert queued == []
+
+def test_mint_endpoint_queues_with_the_admin_key(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_API_KEY", "key")
+    queued = []
+
+    async def enqueue(request):
+        queued.append(request)
+        return []
+
+    monkeypatch.setattr(mint_service, "enqueue", enqueue)
+
+    assert client.post("/nfts/mint", json=MINT, headers={"X-API-Key": "key"}).status_code == 202
+    assert len(queued) == 1
\ No newline at end of file
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from app.models import bounty_model, game_model, nft_model, user_model
+
+NOW = datetime(2026, 1, 2, 3, 4, 5, 678000)
+
+DOCUMENTS = {
+    game_model: {
+        "_id": ObjectId(),
+        "id": "g1",
+        "title": "Game",
+        "price": 9.5,
+        "genre": "RPG",
+        "description": "A game",
+        "nftRewards": [{"name": "Sword", "description": "Sharp"}],
+        "images": ["https://example.com/a.png"],
+        "tags": ["fantasy"],
+        "rating": 4.5,
+        "systemRequirements": {"os": "Linux", "memory": "8 GB"},
+        "developerData": {"name": "Studio", "wallet_address": "T" * 34},
+        "createdAt": NOW,
+        "updatedAt": NOW,
+        "reviews": [{"user": "ann", "rating": 5.0, "comment": "Fun"}],
+    },
+    bounty_model: {
+        "_id": ObjectId(),
+        "gameId": "g1",
+        "name": "First",
+        "description": "Win once",
+        "createdAt": NOW,
+        "updatedAt": NOW,
+    },
+    nft_model: {
+        "_id": ObjectId(),
+        "gameId": "g1",
+        "bountyId": "b1",
+        "name": "Sword",
+        "description": "Sharp",
+        "uri": "ipfs://sword",
+        "createdAt": NOW,
+        "updatedAt": NOW,
+    },
+    user_model: {
+        "_id": ObjectId(),
+        "username": "ann",
+        "email": "ann@example.com",
+        "wallet_address": "T" * 34,
+        "bio": "Player",
+        "nfts": [{"id": 1, "name": "Sword", "description": "Sharp", "image": "sword.png", "game": "g1"}],
+        "achievements": [{"id": 1, "name": "First", "description": "Win once", "date_achieved": NOW}],
+        "is_active": True,
+        "date_joined": NOW,
+        "games": ["g1"],
+    },
+}
+
+
+@pytest.mark.parametrize("model", DOCUMENTS, ids=lambda model: model.__name__.rsplit(".", 1)[-1])
+def test_trusted_serializers_match_the_validating_ones(model):
+    document = DOCUMENTS[model]
+
+    trusted = model.serialize_trusted(document)
+
+    assert type(trusted) is type(model.serialize(document))
+    assert trusted.model_dump(mode="json") == model.serialize(document).model_dump(mode="json")
+
+
+def test_trusted_reads_off_validates_documents_again(monkeypatch):
+    monkeypatch.setattr(bounty_model, "TRUSTED_READS", False)
+
+    with pytest.raises(ValidationError):
+        bounty_model.serialize_trusted({**DOCUMENTS[bounty_model], "name": None})
\ No newline at end of file
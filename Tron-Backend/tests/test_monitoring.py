@@ -0,0 +1,69 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from bson.int64 import Int64
+
+from app.core.monitoring import CommandMonitor
+
+CHANGE_STREAM_CURSOR = Int64(7)
+
+
+@pytest.fixture
+def monitor():
+    return CommandMonitor()
+
+
+def run_command(monitor, request_id, command_name, command, reply, duration_ms=1.0):
+    event = SimpleNamespace(
+        connection_id=("localhost", 27017), request_id=request_id,
+        command_name=command_name, command=command, reply=reply, duration_micros=int(duration_ms * 1000),
+    )
+    monitor.started(event)
+    monitor.succeeded(event)
+
+
+def open_change_stream(monitor):
+    run_command(
+        monitor, 1, "aggregate",
+        {"aggregate": "game", "pipeline": [{"$changeStream": {}}], "cursor": {}},
+        {"cursor": {"id": CHANGE_STREAM_CURSOR, "firstBatch": []}},
+    )
+
+
+def test_idle_change_stream_get_more_is_not_slow(monitor, caplog):
+    open_change_stream(monitor)
+    with caplog.at_level(logging.WARNING):
+        run_command(
+            monitor, 2, "getMore", {"getMore": CHANGE_STREAM_CURSOR, "collection": "game"},
+            {"cursor": {"id": CHANGE_STREAM_CURSOR, "nextBatch": []}}, duration_ms=1000,
+        )
+
+    assert "Slow MongoDB" not in caplog.text
+    assert monitor.commands[("<background>", "game", "getMore")] == 1
+    assert ("<background>", "game", "getMore") not in monitor.duration.series
+
+
+def test_get_more_of_a_regular_cursor_is_slow(monitor, caplog):
+    open_change_stream(monitor)
+    with caplog.at_level(logging.WARNING):
+        run_command(
+            monitor, 2, "getMore", {"getMore": Int64(8), "collection": "game"},
+            {"cursor": {"id": Int64(0), "nextBatch": []}}, duration_ms=1000,
+        )
+
+    assert "Slow MongoDB getMore on 'game'" in caplog.text
+
+
+def test_closed_change_stream_cursors_are_forgotten(monitor):
+    open_change_stream(monitor)
+    run_command(monitor, 2, "killCursors", {"killCursors": "game", "cursors": [CHANGE_STREAM_CURSOR]},
+                {"cursorsKilled": [CHANGE_STREAM_CURSOR]})
+    assert monitor._tailing_cursors == set()
+
+    open_change_stream(monitor)
+    run_command(
+        monitor, 3, "getMore", {"getMore": CHANGE_STREAM_CURSOR, "collection": "game"},
+        {"cursor": {"id": Int64(0), "nextBatch": []}},
+    )
+    assert monitor._tailing_cursors == set()
\ No newline at end of file
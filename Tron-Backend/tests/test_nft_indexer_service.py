@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import tron
+from app.services import nft_indexer_service
+from app.services.nft_indexer_service import NodeTransferSource, RecordedTransferSource
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+A = "TCNkawTmcQgYSU8nP8cHswT1QPjharxJr7"
+B = "THHsfg2eNiv6MSXC4y5d4t5wkvRVADRKiF"
+
+
+@pytest.fixture(autouse=True)
+def indexer(monkeypatch):
+    monkeypatch.setattr(nft_indexer_service, "START_BLOCK", "1")
+    monkeypatch.setattr(nft_indexer_service, "CONFIRMATIONS", 0)
+    monkeypatch.setattr(nft_indexer_service, "BATCH_BLOCKS", 40)
+    monkeypatch.setattr(nft_indexer_service, "_lease_owner", "worker-a")
+
+
+@pytest.fixture
+def source():
+    return RecordedTransferSource.from_file(os.path.join(FIXTURES, "nft_transfers.json"))
+
+
+async def owners(db):
+    return {document["_id"]: document["owner"] async for document in db.nft_ownership.find()}
+
+
+@pytest.mark.anyio
+async def test_indexes_the_recorded_transfers(db, source):
+    assert await nft_indexer_service._acquire_lease()
+    assert await nft_indexer_service.index_pending_blocks(source) == 150
+
+    assert await owners(db) == {1: B, 2: A, 3: B}
+    assert await nft_indexer_service.get_indexed_block() == 150
+
+
+@pytest.mark.anyio
+async def test_replaying_older_transfers_keeps_the_newer_owner(db, source):
+    assert await nft_indexer_service._acquire_lease()
+    await nft_indexer_service.index_pending_blocks(source)
+
+    await nft_indexer_service.apply_transfers(source.get_transfers(1, 20))
+    assert (await owners(db))[1] == B
+
+
+@pytest.mark.anyio
+async def test_stops_when_the_lease_is_taken_over_mid_batch(db, source, monkeypatch):
+    assert await nft_indexer_service._acquire_lease()
+    apply_transfers = nft_indexer_service.apply_transfers
+    batches = []
+
+    async def take_over_during_second_batch(transfers):
+        batches.append(transfers)
+        if len(batches) == 2:
+            # Another worker took the expired lease while this one was catching up.
+            await db.indexer_checkpoint.update_one(
+                {"_id": nft_indexer_service.CHECKPOINT_ID}, {"$set": {"leaseOwner": "worker-b"}}
+            )
+        return await apply_transfers(transfers)
+
+    monkeypatch.setattr(nft_indexer_service, "apply_transfers", take_over_during_second_batch)
+
+    assert await nft_indexer_service.index_pending_blocks(source) == 40
+    assert len(batches) == 2
+    assert await nft_indexer_service.get_indexed_block() == 40
+
+
+@pytest.mark.anyio
+async def test_does_not_start_a_batch_without_the_lease(db, source):
+    assert await nft_indexer_service._acquire_lease()
+    await db.indexer_checkpoint.update_one({"_id": nft_indexer_service.CHECKPOINT_ID}, {"$set": {"leaseOwner": "worker-b"}})
+
+    assert await nft_indexer_service.index_pending_blocks(source) == 0
+    assert await owners(db) == {}
+
+
+@pytest.mark.anyio
+async def test_checkpoint_never_moves_backwards(db):
+    assert await nft_indexer_service._acquire_lease()
+    assert await nft_indexer_service._save_checkpoint(100)
+    assert not await nft_indexer_service._save_checkpoint(60)
+    assert await nft_indexer_service.get_indexed_block() == 100
+
+
+@pytest.mark.anyio
+async def test_renewing_a_lease_held_by_another_worker_fails(db, monkeypatch):
+    assert await nft_indexer_service._acquire_lease()
+    monkeypatch.setattr(nft_indexer_service, "_lease_owner", "worker-b")
+    assert not await nft_indexer_service._acquire_lease()
+    assert not await nft_indexer_service._renew_lease()
+
+
+def test_node_source_reads_the_contract_events_api(monkeypatch):
+    with open(os.path.join(FIXTURES, "trongrid_transfer_events.json")) as recorded:
+        pages = json.load(recorded)
+    requests = []
+
+    def get(url, params, timeout):
+        requests.append((url, dict(params)))
+        page = pages[1] if params.get("fingerprint") == "page2" else pages[0]
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: page)
+
+    client = SimpleNamespace(
+        provider=SimpleNamespace(endpoint_uri="https://nile.trongrid.io/", timeout=10, sess=SimpleNamespace(get=get)),
+        get_block=lambda number: {"block_header": {"raw_data": {"timestamp": 1000030000}}},
+    )
+    monkeypatch.setattr(tron, "get_client", lambda: client)
+
+    transfers = NodeTransferSource(A).get_transfers(10, 120)
+
+    assert [(transfer["tokenId"], transfer["to"], transfer["blockNumber"]) for transfer in transfers] == [
+        (1, A, 10), (2, A, 50), (1, B, 120),
+    ]
+    assert requests[0][0] == f"https://nile.trongrid.io/v1/contracts/{A}/events"
+    assert requests[0][1]["event_name"] == "Transfer"
+    assert requests[0][1]["min_block_timestamp"] == 1000030000
+    assert requests[1][1]["fingerprint"] == "page2"
+
+
+@pytest.mark.anyio
+async def test_bad_contract_address_is_retried_not_fatal(db, monkeypatch):
+    monkeypatch.setenv("CONTRACT_ADDRESS", "not-an-address")
+    polls = []
+
+    async def sleep(delay):
+        polls.append(delay)
+        if len(polls) == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(nft_indexer_service.asyncio, "sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await nft_indexer_service.run()
+    assert len(polls) == 2
+
+
+def test_not_started_without_a_contract_address(monkeypatch):
+    monkeypatch.delenv("CONTRACT_ADDRESS", raising=False)
+    monkeypatch.setattr(nft_indexer_service, "ENABLED", True)
+
+    nft_indexer_service.start()
+
+    assert nft_indexer_service._task is None
\ No newline at end of file
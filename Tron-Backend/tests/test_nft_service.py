@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from tronpy.exceptions import TvmError
+
+from app.core import tron
+from app.schemas import nft_schema
+from app.services import nft_service
+
+MINTED = "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf"
+
+
+@pytest.fixture
+def node(monkeypatch):
+    """A Tron node where token 1 is minted, token 2 reverts and token 3 times out."""
+    def owner_of(tokenId):
+        if tokenId == 1:
+            return MINTED
+        if tokenId == 2:
+            raise TvmError("REVERT opcode executed: ERC721: invalid token ID")
+        raise TimeoutError("read timed out")
+
+    monkeypatch.setattr(tron, "get_contract", lambda: SimpleNamespace(functions=SimpleNamespace(ownerOf=owner_of)))
+    monkeypatch.setattr(nft_service, "get_block_height", lambda: _block(100))
+    nft_service.owner_cache.clear()
+
+
+async def _block(number):
+    return number
+
+
+@pytest.mark.anyio
+async def test_owner_of_minted_token(node):
+    assert await nft_service.get_nft_owner(1) == MINTED
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("tokenId, status_code", [(2, 404), (3, 503)])
+async def test_owner_lookup_errors(node, tokenId, status_code):
+    with pytest.raises(HTTPException) as raised:
+        await nft_service.get_nft_owner(tokenId)
+    assert raised.value.status_code == status_code
+
+
+@pytest.mark.anyio
+async def test_batch_tells_missing_tokens_from_node_errors(node):
+    response = await nft_service.get_nft_owners(nft_schema.NFTOwnersRequest(tokenIds=[1, 2, 3]))
+    owners = {owner.tokenId: owner for owner in response.owners}
+
+    assert owners[1].owner == MINTED
+    assert owners[2].error == "NFT with tokenId 2 does not exist"
+    assert owners[3].error.startswith("Could not reach the Tron node")
\ No newline at end of file
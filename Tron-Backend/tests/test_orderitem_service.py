@@ -0,0 +1,43 @@
+import pytest
+from bson import ObjectId
+
+from app.services import orderitem_service
+from app.schemas.orderitem_schema import CreateOrderItem
+
+
+class CountingCollection:
+    """Counts the queries sent through a collection."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.finds = 0
+
+    def find(self, *args, **kwargs):
+        self.finds += 1
+        return self.collection.find(*args, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_a_cart_is_priced_with_one_query(db, monkeypatch):
+    priced = await db.game.insert_one({"id": "a", "price": 10.0})
+    unpriced = await db.game.insert_one({"id": "b"})
+    missing = str(ObjectId())
+    games = CountingCollection(orderitem_service.game_collection)
+    monkeypatch.setattr(orderitem_service, "game_collection", games)
+
+    items, errors = await orderitem_service.resolve_prices([
+        CreateOrderItem(game_id=str(priced.inserted_id), quantity=1),
+        CreateOrderItem(game_id=str(unpriced.inserted_id), quantity=1),
+        CreateOrderItem(game_id=missing, quantity=1),
+        CreateOrderItem(game_id="not-an-id", quantity=1),
+        CreateOrderItem(game_id=str(priced.inserted_id), quantity=2),
+    ])
+
+    assert games.finds == 1
+    assert [(item.game_id, item.price) for item in items] == [(str(priced.inserted_id), 10.0)]
+    assert [(error.game_id, error.status_code) for error in errors] == [
+        (str(unpriced.inserted_id), 400),
+        (missing, 404),
+        ("not-an-id", 400),
+        (str(priced.inserted_id), 400),
+    ]
\ No newline at end of file
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import users
+from app.schemas import user_schema
+from app.services import password_service, user_service
+from app.utils.helper.user_helper import hash_password as legacy_hash_password
+
+
+@pytest.fixture(autouse=True)
+def cheap_scrypt(monkeypatch):
+    monkeypatch.setattr(password_service, "SCRYPT_N", 2 ** 4)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(users.router)
+    return TestClient(app)
+
+
+async def insert_user(db, password):
+    await db.user.insert_one({
+        "username": "ann",
+        "email": "ann@example.com",
+        "password": password,
+        "is_active": True,
+        "date_joined": datetime.now(),
+    })
+
+
+def scrypt_hash(password, n):
+    salt = b"0" * password_service.SALT_BYTES
+    r, p = password_service.SCRYPT_R, password_service.SCRYPT_P
+    key = password_service._scrypt(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${password_service._b64(salt)}${password_service._b64(key)}"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("stored", [
+    legacy_hash_password("secret"),
+    scrypt_hash("secret", 2 ** 5),
+], ids=["sha512", "scrypt-cost"])
+async def test_login_rehashes_a_weaker_hash_once(db, stored):
+    await insert_user(db, stored)
+    login = user_schema.UserLogin(email="ann@example.com", password="secret")
+
+    await user_service.login(login)
+    rehashed = (await db.user.find_one())["password"]
+    await user_service.login(login)
+
+    assert rehashed.startswith("scrypt$16$")
+    assert password_service.verify_password_sync("secret", rehashed)
+    assert (await db.user.find_one())["password"] == rehashed
+
+
+@pytest.mark.anyio
+async def test_wrong_password_is_refused_and_keeps_the_hash(db):
+    stored = legacy_hash_password("secret")
+    await insert_user(db, stored)
+
+    with pytest.raises(HTTPException) as raised:
+        await user_service.login(user_schema.UserLogin(email="ann@example.com", password="wrong"))
+
+    assert raised.value.status_code == 401
+    assert (await db.user.find_one())["password"] == stored
+
+
+def test_login_takes_the_credentials_in_a_post_body(client):
+    credentials = {"email": "ann@example.com", "password": "wrong"}
+
+    assert client.get("/users/login", params=credentials).status_code == 405
+    assert client.post("/users/login", json=credentials).status_code == 401
\ No newline at end of file
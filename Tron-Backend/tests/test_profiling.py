@@ -0,0 +1,61 @@
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import ProfilingMiddleware
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "SECRET", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path / "profiles"))
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+def test_verify_accepts_a_valid_token():
+    assert profiling.verify(profiling.sign(int(time.time()) + 60))
+
+
+@pytest.mark.parametrize("token", ["\xb2", "\xb2.abc", "1.abc", "", "abc", f"{int(time.time()) - 1}.x"])
+def test_verify_refuses_malformed_tokens(token):
+    assert profiling.verify(token) is False
+
+
+def test_expired_token_is_refused():
+    assert not profiling.verify(profiling.sign(int(time.time()) - 1))
+
+
+def test_malformed_header_is_served_unprofiled(client):
+    response = client.get("/ping", headers={"X-Profile": b"\xb2"})
+    assert response.status_code == 200
+    assert "x-profile-file" not in response.headers
+
+
+def test_profiled_request_writes_its_profile(client):
+    response = client.get("/ping", headers={"X-Profile": profiling.sign(int(time.time()) + 60)})
+    assert response.status_code == 200
+    assert response.headers["x-profile-file"].endswith(".prof")
+    assert os.path.exists(os.path.join(profiling.PROFILE_DIR, response.headers["x-profile-file"]))
+
+
+def test_unwritable_profile_dir_does_not_fail_the_request(client, monkeypatch, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(blocker / "profiles"))
+    response = client.get("/ping", headers={"X-Profile": profiling.sign(int(time.time()) + 60)})
+    assert response.status_code == 200
\ No newline at end of file
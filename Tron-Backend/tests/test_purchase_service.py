@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services import purchase_service
+
+
+async def create_order(db, status="Pending", with_user=True):
+    user_id = (await db.user.insert_one({"username": "a", "games": []})).inserted_id
+    if not with_user:
+        await db.user.delete_one({"_id": user_id})
+    order = {
+        "user_id": str(user_id),
+        "OrderItemCollection": [{"game_id": "g1", "quantity": 1}],
+        "total_quantity": 1,
+        "total_price": 3.0,
+        "status": status,
+        "transaction": None,
+        "created_time": None,
+    }
+    await db.orderitem.insert_one(order)
+    return str(user_id), order["_id"]
+
+
+@pytest.mark.anyio
+async def test_purchase_completes_the_order_and_fills_the_library(db):
+    user_id, order_id = await create_order(db)
+
+    response = await purchase_service.complete_purchase(user_id, str(order_id), "tx1")
+
+    assert response.order_data.status == "Completed"
+    assert (await db.orderitem.find_one({"_id": order_id}))["transaction"] == "tx1"
+    assert (await db.user.find_one())["games"] == ["g1"]
+    assert await db.verifiedpurchase.count_documents({"transaction_id": "tx1"}) == 1
+
+
+@pytest.mark.anyio
+async def test_missing_user_undoes_the_purchase(db):
+    user_id, order_id = await create_order(db, status="Processing", with_user=False)
+
+    with pytest.raises(HTTPException) as error:
+        await purchase_service.complete_purchase(user_id, str(order_id), "tx1")
+
+    assert error.value.status_code == 404
+    order = await db.orderitem.find_one({"_id": order_id})
+    assert (order["status"], order["transaction"]) == ("Processing", None)
+    assert await db.verifiedpurchase.count_documents({}) == 0
+
+
+@pytest.mark.anyio
+async def test_duplicate_transaction_restores_the_order(db):
+    await db.verifiedpurchase.create_index("transaction_id", unique=True)
+    await db.verifiedpurchase.insert_one({"transaction_id": "tx1"})
+    user_id, order_id = await create_order(db)
+
+    with pytest.raises(HTTPException) as error:
+        await purchase_service.complete_purchase(user_id, str(order_id), "tx1")
+
+    assert error.value.status_code == 400
+    assert (await db.orderitem.find_one({"_id": order_id}))["status"] == "Pending"
+    assert (await db.user.find_one())["games"] == []
+
+
+@pytest.mark.anyio
+async def test_revert_leaves_an_order_completed_by_another_transaction(db):
+    user_id, order_id = await create_order(db)
+    previous_order = await db.orderitem.find_one({"_id": order_id})
+    await db.orderitem.update_one({"_id": order_id}, {"$set": {"status": "Completed", "transaction": "tx2"}})
+
+    await purchase_service.revert_order(previous_order, "tx1")
+
+    assert (await db.orderitem.find_one({"_id": order_id}))["status"] == "Completed"
\ No newline at end of file
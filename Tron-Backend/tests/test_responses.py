@@ -0,0 +1,34 @@
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import ORJSONResponse
+from app.main import app
+from app.models import game_model
+from app.schemas import response_schema
+
+
+def test_orjson_is_the_default_response_class():
+    assert app.router.default_response_class is ORJSONResponse
+
+
+def test_envelope_renders_like_the_stdlib_encoder():
+    now = datetime(2026, 1, 2, 3, 4, 5, 678000)
+    game = game_model.serialize_trusted({
+        "_id": ObjectId(),
+        "id": "g1",
+        "title": "Game",
+        "price": 9.5,
+        "nftRewards": [{"name": "Sword", "description": "Sharp"}],
+        "systemRequirements": {"os": "Linux"},
+        "createdAt": now,
+        "updatedAt": now,
+        "reviews": [{"user": "ann", "rating": 5.0}],
+    })
+    envelope = response_schema.ResponseModel(status="success", data=[game], timestamp=now)
+
+    rendered = ORJSONResponse(envelope).body
+
+    assert json.loads(rendered) == jsonable_encoder(envelope)
\ No newline at end of file
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight_service import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await release.wait()
+        return "game"
+
+    callers = [asyncio.ensure_future(flight.do(("game", "a"), load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["game"] * 5
+    assert loads == [1]
+    assert flight.stats() == {"in_flight": 0, "calls": {"game": 5}, "deduplicated": {"game": 4}}
+
+
+@pytest.mark.anyio
+async def test_errors_reach_every_caller_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def fail():
+        raise RuntimeError("node down")
+
+    results = await asyncio.gather(*(flight.do(("game", "a"), fail) for _ in range(2)), return_exceptions=True)
+    assert [str(result) for result in results] == ["node down", "node down"]
+
+    async def load():
+        return "game"
+
+    assert await flight.do(("game", "a"), load) == "game"
+
+
+@pytest.mark.anyio
+async def test_a_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "game"
+
+    first = asyncio.ensure_future(flight.do(("game", "a"), load))
+    second = asyncio.ensure_future(flight.do(("game", "a"), load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "game"
\ No newline at end of file
@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models import user_model
+from app.services import user_service
+
+NFT = {"id": "7", "name": "Sword", "description": "Sharp", "image": "sword.png", "game": "g"}
+
+
+@pytest.fixture
+async def user_id(db):
+    result = await db.user.insert_one({"username": "a", "nfts": [NFT]})
+    return str(result.inserted_id)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("trusted, nft_id", [(True, "7"), (False, 7)])
+async def test_purchased_nfts_are_validated_unless_reads_are_trusted(user_id, monkeypatch, trusted, nft_id):
+    monkeypatch.setattr(user_model, "TRUSTED_READS", trusted)
+
+    page, next_cursor = await user_service.get_purchased_nfts(user_id)
+
+    assert [nft.id for nft in page.nfts] == [nft_id]
+    assert next_cursor is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("cursor", ["\u00b2", "-1", "1.5", ""])
+async def test_purchased_nfts_refuse_a_cursor_that_is_not_an_offset(user_id, cursor):
+    with pytest.raises(HTTPException) as raised:
+        await user_service.get_purchased_nfts(user_id, cursor=cursor)
+    assert raised.value.status_code == 400
\ No newline at end of file
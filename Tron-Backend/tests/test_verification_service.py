@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from tronpy.keys import PrivateKey
+
+from app.core import tron
+from app.services import verification_service
+from app.services.verification_service import PaymentUnknown, VerificationPending
+
+BUYER = PrivateKey(b"\x01" * 32).public_key.to_base58check_address()
+DEVELOPER = PrivateKey(b"\x02" * 32).public_key.to_base58check_address()
+STRANGER = PrivateKey(b"\x03" * 32).public_key.to_base58check_address()
+
+PAYMENT = {"sender": BUYER, "recipient": DEVELOPER, "amount": 3_000_000}
+
+
+def transfer(sender=BUYER, recipient=DEVELOPER, amount=3_000_000, contract_type="TransferContract"):
+    return {"raw_data": {"contract": [{
+        "type": contract_type,
+        "parameter": {"value": {"owner_address": sender, "to_address": recipient, "amount": amount}},
+    }]}}
+
+
+async def create_order(db, wallet_address=BUYER, developer_wallet=DEVELOPER):
+    game = await db.game.insert_one({"title": "A", "price": 3.0, "developerData": {"wallet_address": developer_wallet}})
+    user = await db.user.insert_one({"username": "a", "wallet_address": wallet_address})
+    order = await db.orderitem.insert_one({
+        "user_id": str(user.inserted_id),
+        "OrderItemCollection": [{"game_id": str(game.inserted_id), "quantity": 1}],
+        "total_price": 3.0,
+        "status": "Pending",
+    })
+    return {"user_id": str(user.inserted_id), "order_id": str(order.inserted_id), "transaction_id": "a" * 64}
+
+
+@pytest.mark.anyio
+async def test_expected_payment_pays_the_developer_from_the_buyer_wallet(db):
+    verification = await create_order(db)
+    assert await verification_service.expected_payment(verification) == PAYMENT
+
+
+@pytest.mark.anyio
+async def test_expected_payment_prefers_the_store_wallet(db, monkeypatch):
+    monkeypatch.setattr(verification_service, "STORE_WALLET_ADDRESS", STRANGER)
+    verification = await create_order(db)
+    assert (await verification_service.expected_payment(verification))["recipient"] == STRANGER
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fields", [{"wallet_address": None}, {"developer_wallet": None}])
+async def test_expected_payment_without_wallets(db, fields):
+    verification = await create_order(db, **fields)
+    with pytest.raises(PaymentUnknown):
+        await verification_service.expected_payment(verification)
+
+
+@pytest.mark.anyio
+async def test_expected_payment_of_another_users_order(db):
+    verification = await create_order(db)
+    verification["user_id"] = str(ObjectId())
+    with pytest.raises(PaymentUnknown):
+        await verification_service.expected_payment(verification)
+
+
+@pytest.mark.parametrize("transaction, mismatch", [
+    (transfer(), None),
+    (transfer(amount=4_000_000), None),
+    (transfer(contract_type="TriggerSmartContract"), "not a TRX transfer"),
+    (transfer(recipient=STRANGER), "payee"),
+    (transfer(sender=STRANGER), "buyer's wallet"),
+    (transfer(amount=2_999_999), "the order costs 3000000 sun"),
+    ({}, "not a TRX transfer"),
+])
+def test_payment_mismatch(transaction, mismatch):
+    result = verification_service.payment_mismatch(transaction, PAYMENT)
+    if mismatch is None:
+        assert result is None
+    else:
+        assert mismatch in result
+
+
+def fake_client(monkeypatch, transaction, info, latest_block=200):
+    client = SimpleNamespace(
+        get_transaction=lambda transaction_id: transaction,
+        get_transaction_info=lambda transaction_id: info,
+        get_latest_block_number=lambda: latest_block,
+    )
+    monkeypatch.setattr(tron, "get_client", lambda: client)
+
+
+def test_check_transaction_verifies_a_confirmed_payment(monkeypatch):
+    fake_client(monkeypatch, transfer(), {"blockNumber": 100})
+    assert verification_service.check_transaction("a" * 64, PAYMENT) == {"verified": True, "detail": None}
+
+
+def test_check_transaction_rejects_an_unrelated_transaction(monkeypatch):
+    fake_client(monkeypatch, transfer(recipient=STRANGER), {"blockNumber": 100})
+    assert verification_service.check_transaction("a" * 64, PAYMENT)["verified"] is False
+
+
+def test_check_transaction_waits_for_confirmations(monkeypatch):
+    fake_client(monkeypatch, transfer(), {"blockNumber": 190})
+    with pytest.raises(VerificationPending):
+        verification_service.check_transaction("a" * 64, PAYMENT)
\ No newline at end of file